@@ -0,0 +1,62 @@
+"""
+Measures Logger.log throughput outside of Robot when logging from many page instances:
+    direct: records are written by the calling thread
+    queue: records are handed to the background writer (log_queue=True)
+    filtered: records below the threshold level, which are dropped before formatting
+Usage:
+    python benchmarks/bench_logging.py [pages] [messages per page]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pageobjects import Page, Logger
+
+
+class BenchmarkLoggingPage(Page):
+    uri = "/benchmark"
+
+
+def run(pages, messages, level, log_queue):
+    """
+    Logs from the given number of fresh page instances and returns the messages per second
+    """
+    os.environ["PO_LOG_QUEUE"] = str(log_queue)
+    Logger.shutdown_logging()
+    instances = [BenchmarkLoggingPage() for _ in range(pages)]
+    start = time.time()
+    for index in range(messages):
+        for page in instances:
+            page.log("benchmark message %s from %s", level, False, args=(index, page.name))
+    for handler in instances[0].logger.handlers:
+        handler.flush()
+    return pages * messages / (time.time() - start)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    pages = int(argv[0]) if len(argv) > 0 else 50
+    messages = int(argv[1]) if len(argv) > 1 else 200
+    work_dir = tempfile.mkdtemp(prefix="pageobjects-bench-logging-")
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    results = {}
+    try:
+        for label, level, log_queue in (("direct", "INFO", False),
+                                        ("queue", "INFO", True),
+                                        ("filtered", "DEBUG", False)):
+            results[label] = run(pages, messages, level, log_queue)
+            print "%-10s %12.0f messages per second" % (label, results[label])
+    finally:
+        Logger.shutdown_logging()
+        os.environ.pop("PO_LOG_QUEUE", None)
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    main()
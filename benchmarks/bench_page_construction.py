@@ -0,0 +1,46 @@
+"""
+Measures the cost of constructing pages outside of Robot:
+    eager: Selenium2Library and Logger setup on every construction (the old behaviour, lazy_page_init=False)
+    lazy: Selenium2Library and Logger setup deferred until a browser keyword needs it
+    reused: the per-suite instance from Context.get_page_instance as used by Open/Go To ${pagename}
+Usage:
+    python benchmarks/bench_page_construction.py [iterations]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from pageobjects import Page, Context
+
+
+class BenchmarkConstructionPage(Page):
+    uri = "/benchmark"
+
+
+def construct(lazy):
+    os.environ["PO_LAZY_PAGE_INIT"] = str(lazy)
+    BenchmarkConstructionPage()
+
+
+def reuse():
+    Context.get_page_instance(BenchmarkConstructionPage)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    iterations = int(argv[0]) if argv else 200
+    cases = [("eager (before)", lambda: construct(False)),
+             ("lazy (after)", lambda: construct(True)),
+             ("reused (after)", reuse)]
+    results = {}
+    for label, case in cases:
+        seconds = min(timeit.repeat(case, number=iterations, repeat=3))
+        results[label] = seconds / iterations
+        print "%-16s %10.1f us per page" % (label, results[label] * 1e6)
+    os.environ.pop("PO_LAZY_PAGE_INIT", None)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+This File holds an in-process stand-in for a WebDriver so benchmarks run without a browser
+It answers the calls Selenium2Library and the pages make with canned values and counts them,
+so the cost measured is the cost of the library and not of a browser.
+"""
+import itertools
+
+
+class FakeWebElement(object):
+    """
+    This object stands in for a selenium WebElement
+    """
+    def __init__(self, driver, element_id, tag_name="div", text="", attributes=None, displayed=True):
+        self.parent = driver
+        self.id = element_id
+        self.tag_name = tag_name
+        self.text = text
+        self._attributes = attributes or {}
+        self._displayed = displayed
+
+    def is_displayed(self):
+        self.parent.calls["is_displayed"] += 1
+        return self._displayed
+
+    def is_enabled(self):
+        return True
+
+    def is_selected(self):
+        return False
+
+    def get_attribute(self, name):
+        self.parent.calls["get_attribute"] += 1
+        return self._attributes.get(name, None)
+
+    def click(self):
+        self.parent.calls["click"] += 1
+        self.parent._po_document_generation += 1
+
+    def send_keys(self, *values):
+        self.parent.calls["send_keys"] += 1
+        self.parent._po_document_generation += 1
+
+    def clear(self):
+        pass
+
+    def find_elements_by_xpath(self, xpath):
+        return self.parent.find_elements_by_xpath(xpath)
+
+
+class FakeWebDriver(object):
+    """
+    This object stands in for a selenium WebDriver
+    Every locator finds the same element unless it is listed in missing_locators
+    Commands that may change the document bump _po_document_generation like the monkeypatched RemoteWebDriver
+    Scripts return script_results[script] when set, otherwise the value of their return type guessed from the script
+    Example:
+        driver = FakeWebDriver()
+        page._cache.register(driver, "bench")
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, url="http://localhost/", title="Benchmark Page"):
+        self.session_id = "fake-%s" % next(self._ids)
+        self.capabilities = {"browserName": "fake"}
+        self.current_url = url
+        self.title = title
+        self.page_source = "<html><head><title>%s</title></head><body></body></html>" % title
+        self.window_handles = ["window-1"]
+        self.current_window_handle = "window-1"
+        self._po_document_generation = 0
+        self.missing_locators = set()
+        self.script_results = {}
+        self.calls = dict.fromkeys(["execute", "execute_script", "find_elements", "is_displayed",
+                                    "get_attribute", "click", "send_keys", "get"], 0)
+        self._element = FakeWebElement(self, "element-1", text="benchmark")
+
+    def execute(self, driver_command, params=None):
+        self.calls["execute"] += 1
+        return {"value": None}
+
+    def execute_script(self, script, *args):
+        self.calls["execute_script"] += 1
+        self._po_document_generation += 1
+        if script in self.script_results:
+            return self.script_results[script]
+        if "readyState: document.readyState" in script:
+            # PAGE_PROBE_SCRIPT ##
+            return {"found": True, "visible": True, "readyState": "complete", "location": self.current_url}
+        if "document.readyState" in script:
+            return "complete"
+        if "document.documentElement.contains" in script:
+            # ELEMENT_ATTACHED_SCRIPT ##
+            return True
+        if "document.URL" in script and "window.name" in script:
+            return [None, "", self.title, self.current_url]
+        return None
+
+    def execute_async_script(self, script, *args):
+        return self.execute_script(script, *args)
+
+    def find_elements(self, by=None, value=None):
+        self.calls["find_elements"] += 1
+        if value in self.missing_locators:
+            return []
+        return [self._element]
+
+    def find_element(self, by=None, value=None):
+        return self.find_elements(by, value)[0]
+
+    def __getattr__(self, name):
+        # find_elements_by_id, find_elements_by_xpath, ... all resolve to find_elements ##
+        if name.startswith("find_elements_by_"):
+            return lambda value: self.find_elements(name[len("find_elements_by_"):], value)
+        if name.startswith("find_element_by_"):
+            return lambda value: self.find_element(name[len("find_element_by_"):], value)
+        raise AttributeError("'%s' object has no attribute '%s'" % (self.__class__.__name__, name))
+
+    def get(self, url):
+        self.calls["get"] += 1
+        self.current_url = url
+        self._po_document_generation += 1
+
+    def switch_to_window(self, handle):
+        self.current_window_handle = handle
+
+    def switch_to_default_content(self):
+        pass
+
+    def switch_to_frame(self, frame):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def maximize_window(self):
+        pass
+
+    def close(self):
+        pass
+
+    def quit(self):
+        pass
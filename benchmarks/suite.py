@@ -0,0 +1,377 @@
+"""
+Microbenchmarks for the hot paths of the library, run outside of Robot against a stand-in WebDriver
+Every size runs in its own process on a synthetic hierarchy of that many page classes,
+so the singletons and flyweights start empty like they do at the start of a suite.
+Results are seconds per operation and can be saved as a baseline and compared against later.
+Usage:
+    python benchmarks/suite.py [--sizes 10,100,1000] [--depth 10] [--locators 50] [--only case,...]
+                               [--save baseline.json] [--compare baseline.json] [--tolerance 0.25]
+Example:
+    python benchmarks/suite.py --sizes 10,100,1000,5000 --save baseline.json
+    python benchmarks/suite.py --sizes 10,100,1000,5000 --compare baseline.json
+"""
+import json
+import optparse
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, ".."))
+BASELINE_VERSION = 1
+
+
+def _leaf_page(context):
+    """
+    Returns an instance of the deepest page of the first chain
+    """
+    if "leaf" not in context:
+        context["leaf"] = context["leaves"][0]()
+    return context["leaf"]
+
+
+def _page_with_driver(context, element_cache):
+    """
+    Returns a leaf page with a registered stand-in driver
+    """
+    from fakedriver import FakeWebDriver
+    os.environ["PO_ELEMENT_CACHE"] = str(element_cache)
+    try:
+        page = context["leaves"][0]()
+    finally:
+        os.environ.pop("PO_ELEMENT_CACHE", None)
+    page._cache.register(FakeWebDriver(), "benchmark")
+    return page
+
+
+def bench_page_construction_lazy(context):
+    """
+    Constructs the leaf page of every chain, Selenium2Library and Logger setup deferred (lazy_page_init=True)
+    """
+    leaves = context["leaves"]
+    os.environ["PO_LAZY_PAGE_INIT"] = "True"
+    return lambda: [leaf() for leaf in leaves], len(leaves)
+
+
+def bench_page_construction_eager(context):
+    """
+    Constructs the leaf page of every chain with the Selenium2Library and Logger setup (lazy_page_init=False)
+    """
+    leaves = context["leaves"]
+    os.environ["PO_LAZY_PAGE_INIT"] = "False"
+    return lambda: [leaf() for leaf in leaves], len(leaves)
+
+
+def bench_page_reuse(context):
+    """
+    Gets the per-suite instance of a page as Open/Go To ${pagename} do
+    """
+    from pageobjects import Context
+    leaf = context["leaves"][0]
+    return lambda: Context.get_page_instance(leaf), 1
+
+
+def bench_keyword_dispatch(context):
+    """
+    Runs a keyword defined at the top of a chain through the dynamic library hook
+    """
+    page = _leaf_page(context)
+    name = "Get Value %s" % context["roots"][0].__module__.rsplit("_", 1)[-1]
+    return lambda: page.run_keyword(name, [], {}), 1
+
+
+def bench_keyword_dispatch_embedded(context):
+    """
+    Runs an embedded argument keyword defined at the top of a chain, matched and parsed on every call
+    """
+    page = _leaf_page(context)
+    root = context["roots"][0]
+    name = "Select benchmark item On %s %s" % (page.name, root.__module__.rsplit("_", 1)[-1])
+    return lambda: page.run_keyword(name, [], {}), 1
+
+
+def bench_keyword_names(context):
+    """
+    Lists the keywords of a page as robot does when it imports the library
+    """
+    page = _leaf_page(context)
+    return lambda: page.get_keyword_names(), 1
+
+
+def bench_get_locator(context):
+    """
+    Gets a locator overridden down the chain and a locator group
+    """
+    page = _leaf_page(context)
+    return lambda: (page.get_locator("locator_shared_1"), page._yaml_handler.get_locator_group("group_0")), 2
+
+
+def bench_option_get(context):
+    """
+    Gets an option set on the top of a chain and an option that falls through every layer
+    """
+    from pageobjects import OptionHandler
+    page = _leaf_page(context)
+    option = "synthetic_option_%s" % context["roots"][0].__module__.rsplit("_", 1)[-1]
+    handler = OptionHandler(page)
+    return lambda: (handler.get(option), handler.get("benchmark_missing_option", None)), 2
+
+
+def _logging_page(context, log_queue):
+    """
+    Returns a new leaf page logging through freshly registered handlers, written in the calling thread
+    or handed to the background writer(log_queue=True)
+    """
+    from pageobjects import Logger
+    Logger.shutdown_logging()
+    os.environ["PO_LOG_QUEUE"] = str(log_queue)
+    try:
+        page = context["leaves"][0]()
+        # The handlers are registered with the deferred Logger setup ##
+        page.logger
+    finally:
+        os.environ.pop("PO_LOG_QUEUE", None)
+    return page
+
+
+def bench_logger_log(context):
+    """
+    Logs a message above the threshold level to po_log.txt, written by the calling thread
+    """
+    page = _logging_page(context, False)
+    return lambda: page.log("benchmark message %s", "INFO", False, args=(page.name,)), 1
+
+
+def bench_logger_log_queue(context):
+    """
+    Logs a message above the threshold level to po_log.txt through the bounded queue (log_queue=True)
+    """
+    page = _logging_page(context, True)
+    return lambda: page.log("benchmark message %s", "INFO", False, args=(page.name,)), 1
+
+
+def bench_logger_log_filtered(context):
+    """
+    Logs a message below the threshold level, which is dropped before formatting
+    """
+    page = _leaf_page(context)
+    return lambda: page.log("benchmark message %s", "DEBUG", False, args=(page.name,)), 1
+
+
+def bench_get_child_pages(context):
+    """
+    Walks the subclasses of the top page of every chain
+    """
+    # Only the class of the page is used, so the pages are not constructed ##
+    pages = [root.__new__(root) for root in context["roots"]]
+    return lambda: [page._get_child_pages() for page in pages], len(pages)
+
+
+def bench_get_parent_pages(context):
+    """
+    Walks the parents of the deepest page of a chain
+    """
+    page = _leaf_page(context)
+    return lambda: page._get_parent_pages(top_to_bottom=True), 1
+
+
+def bench_element_find(context):
+    """
+    Finds an element through Selenium2Library on the stand-in driver
+    """
+    page = _page_with_driver(context, False)
+    return lambda: page._element_find("id=benchmark", True, True), 1
+
+
+def bench_element_find_cached(context):
+    """
+    Finds an element with the element cache on, reused as long as the document is unchanged
+    """
+    page = _page_with_driver(context, True)
+    return lambda: page._element_find("id=benchmark", True, True), 1
+
+
+CASES = [(name[len("bench_"):], func) for name, func in sorted(globals().items()) if name.startswith("bench_")]
+
+
+def _time_case(operation, operations_per_call, min_time, repeat):
+    """
+    Times the operation and returns the best seconds per operation of the repeats
+    The number of calls per repeat grows until a repeat takes at least min_time
+    """
+    number = 1
+    while True:
+        start = time.time()
+        for _ in xrange(number):
+            operation()
+        elapsed = time.time() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.time()
+        for _ in xrange(number):
+            operation()
+        best = min(best, time.time() - start)
+    return best / (number * operations_per_call)
+
+
+def run_size(size, depth, locators, only=None, min_time=0.2, repeat=3):
+    """
+    Runs the cases on a synthetic hierarchy of the given size in the current process
+
+    :param size: the number of page classes
+    :type size: int
+    :param depth: the length of each inheritance chain
+    :type depth: int
+    :param locators: the number of locators in each yaml file
+    :type locators: int
+    :param only: the names of the cases to run, None runs all
+    :type only: list of strings
+    :return: dict of case name to seconds per operation
+    :rtype: dict
+    """
+    from synthetic import generate_hierarchy
+    from pageobjects import Logger
+    work_dir = tempfile.mkdtemp(prefix="pageobjects-bench-")
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    # The compiled yaml cache of an earlier run would hide the parse cost ##
+    os.environ["PO_YAML_CACHE_DIR"] = os.path.join(work_dir, "yaml-cache")
+    results = {}
+    try:
+        hierarchy = generate_hierarchy(work_dir, size, depth, locators)
+        start = time.time()
+        page_classes = hierarchy.load()
+        results["import_pages"] = (time.time() - start) / size
+        context = {"hierarchy": hierarchy, "classes": page_classes,
+                   "roots": hierarchy.roots(page_classes), "leaves": hierarchy.leaves(page_classes)}
+        # First construction of every page loads the yaml files and keyword maps ##
+        start = time.time()
+        for leaf in context["leaves"]:
+            leaf()
+        results["first_page_construction"] = (time.time() - start) / len(context["leaves"])
+        for name, func in CASES:
+            if only and name not in only:
+                continue
+            operation, operations_per_call = func(context)
+            try:
+                results[name] = _time_case(operation, operations_per_call, min_time, repeat)
+            finally:
+                os.environ.pop("PO_LAZY_PAGE_INIT", None)
+    finally:
+        Logger.shutdown_logging()
+        os.environ.pop("PO_YAML_CACHE_DIR", None)
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def run(sizes, depth, locators, only=None):
+    """
+    Runs every size in its own process
+
+    :return: the results in baseline form
+    :rtype: dict
+    """
+    results = {}
+    for size in sizes:
+        command = [sys.executable, os.path.abspath(__file__), "--worker", "--sizes", str(size),
+                   "--depth", str(depth), "--locators", str(locators)]
+        if only:
+            command += ["--only", ",".join(only)]
+        output = subprocess.check_output(command, cwd=BENCHMARK_DIR)
+        for case, seconds in json.loads(output.strip().splitlines()[-1]).iteritems():
+            results.setdefault(case, {})[str(size)] = seconds
+    return {"version": BASELINE_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": {"depth": depth, "locators": locators},
+            "results": results}
+
+
+def compare(baseline, current, tolerance):
+    """
+    Compares results against a baseline
+
+    :param tolerance: the allowed slowdown as a fraction ex. 0.25 allows 25% slower
+    :type tolerance: float
+    :return: the report lines and the regressions
+    :rtype: tuple of (list of strings, list of strings)
+    """
+    lines = ["%-32s %8s %12s %12s %8s" % ("case", "size", "baseline us", "current us", "ratio")]
+    regressions = []
+    if baseline.get("settings") != current.get("settings"):
+        lines.append("WARNING: baseline settings %s differ from %s" % (baseline.get("settings"), current.get("settings")))
+    for case in sorted(current["results"]):
+        for size, seconds in sorted(current["results"][case].iteritems(), key=lambda item: int(item[0])):
+            base = baseline["results"].get(case, {}).get(size, None)
+            if not base:
+                lines.append("%-32s %8s %12s %12.2f %8s" % (case, size, "-", seconds * 1e6, "new"))
+                continue
+            ratio = seconds / base
+            flag = ""
+            if ratio > 1 + tolerance:
+                flag = "  REGRESSION"
+                regressions.append("%s at %s pages is %.2fx the baseline" % (case, size, ratio))
+            lines.append("%-32s %8s %12.2f %12.2f %7.2fx%s" % (case, size, base * 1e6, seconds * 1e6, ratio, flag))
+    return lines, regressions
+
+
+def format_results(current):
+    sizes = sorted(set(size for case in current["results"].values() for size in case), key=int)
+    lines = ["%-32s" % "case (us per op)" + "".join("%12s" % size for size in sizes)]
+    for case in sorted(current["results"]):
+        row = current["results"][case]
+        lines.append("%-32s" % case + "".join("%12.2f" % (row[size] * 1e6) if size in row else "%12s" % "-"
+                                              for size in sizes))
+    return lines
+
+
+def main(argv=None):
+    parser = optparse.OptionParser(usage="python benchmarks/suite.py [options]")
+    parser.add_option("--sizes", default="10,100,1000", help="comma separated numbers of page classes")
+    parser.add_option("--depth", type="int", default=10, help="length of each inheritance chain")
+    parser.add_option("--locators", type="int", default=50, help="number of locators in each yaml file")
+    parser.add_option("--only", default="", help="comma separated cases to run, all by default")
+    parser.add_option("--save", help="write the results to this baseline file")
+    parser.add_option("--compare", help="compare the results against this baseline file")
+    parser.add_option("--tolerance", type="float", default=0.25, help="allowed slowdown against the baseline")
+    parser.add_option("--worker", action="store_true", help=optparse.SUPPRESS_HELP)
+    options, _ = parser.parse_args(argv)
+    sizes = [int(size) for size in options.sizes.split(",") if size]
+    only = [case.strip() for case in options.only.split(",") if case.strip()] or None
+
+    if options.worker:
+        sys.path.insert(0, BENCHMARK_DIR)
+        print json.dumps(run_size(sizes[0], options.depth, options.locators, only))
+        return 0
+
+    current = run(sizes, options.depth, options.locators, only)
+    print "\n".join(format_results(current))
+    if options.save:
+        with open(options.save, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print "Saved baseline to %s" % options.save
+    if options.compare:
+        with open(options.compare) as f:
+            baseline = json.load(f)
+        lines, regressions = compare(baseline, current, options.tolerance)
+        print
+        print "\n".join(lines)
+        if regressions:
+            print
+            for regression in regressions:
+                print "FAIL: %s" % regression
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+This File generates synthetic page object hierarchies for the benchmarks
+Every page class gets its own module and yaml file, the same layout a real suite uses,
+so YAMLHandler, OptionHandler and KeywordManager see realistic inheritance and locator files.
+Example:
+    hierarchy = generate_hierarchy(work_dir, classes=1000, depth=20, locators=200)
+    page_classes = hierarchy.load()
+"""
+import importlib
+import os
+import sys
+
+_PAGE_TEMPLATE = '''from robot.api.deco import keyword
+from %(parent_module)s import %(parent_class)s
+
+
+class %(class_name)s(%(parent_class)s):
+    uri = "/synthetic/%(index)s"
+    options = {"synthetic_option_%(index)s": %(index)s}
+
+    def get_value_%(index)s(self, value=None):
+        """
+        Returns the value given or the index of the page
+        """
+        return value if value is not None else %(index)s
+
+    @keyword("Select ${item} On ${pagename} %(index)s")
+    def select_item_%(index)s(self, item, pagename):
+        """
+        Returns the item selected on the page
+        """
+        return item
+'''
+
+
+class SyntheticHierarchy(object):
+    """
+    This object holds a generated hierarchy:
+    package: the name of the package holding the page modules
+    path: the directory the package was generated in
+    classes: the number of page classes
+    depth: the length of each inheritance chain below Page
+    locators: the number of locators in each yaml file
+    """
+    package = None
+    path = None
+    classes = 0
+    depth = 0
+    locators = 0
+
+    def __init__(self, package, path, classes, depth, locators):
+        self.package = package
+        self.path = path
+        self.classes = classes
+        self.depth = depth
+        self.locators = locators
+
+    def class_name(self, index):
+        # Page names must be unique over all the hierarchies loaded in one process ##
+        return "Synthetic%sx%sx%sPage%s" % (self.classes, self.depth, self.locators, index)
+
+    def module_name(self, index):
+        return "%s.page_%s" % (self.package, index)
+
+    def load(self):
+        """
+        Imports every page module of the hierarchy
+
+        :return: the page classes ordered by index
+        :rtype: list of classes
+        """
+        if self.path not in sys.path:
+            sys.path.insert(0, self.path)
+        return [getattr(importlib.import_module(self.module_name(index)), self.class_name(index))
+                for index in range(self.classes)]
+
+    def roots(self, page_classes):
+        """
+        Returns the classes directly under Page, the top of each chain
+        """
+        return page_classes[::self.depth]
+
+    def leaves(self, page_classes):
+        """
+        Returns the deepest class of each chain
+        """
+        return [page_classes[min(index + self.depth, self.classes) - 1] for index in range(0, self.classes, self.depth)]
+
+
+def generate_hierarchy(directory, classes=100, depth=10, locators=50):
+    """
+    Writes a package of page classes built as chains of the given depth, each class inheriting the previous one
+    Every class has an options dict, a plain keyword, an embedded argument keyword and a yaml file
+
+    :param directory: the directory to generate the package in
+    :type directory: str
+    :param classes: the number of page classes (Defaults 100)
+    :type classes: int
+    :param depth: the length of each inheritance chain below Page (Defaults 10)
+    :type depth: int
+    :param locators: the number of locators in each yaml file, a tenth of them in groups (Defaults 50)
+    :type locators: int
+    :return: the generated hierarchy
+    :rtype: SyntheticHierarchy
+    """
+    hierarchy = SyntheticHierarchy("po_synthetic_%s_%s_%s" % (classes, depth, locators),
+                                   os.path.abspath(directory), classes, depth, locators)
+    package_dir = os.path.join(hierarchy.path, hierarchy.package)
+    if not os.path.isdir(package_dir):
+        os.makedirs(package_dir)
+    with open(os.path.join(package_dir, "__init__.py"), "w") as f:
+        f.write("")
+    for index in range(classes):
+        if index % depth == 0:
+            parent_module, parent_class = "pageobjects", "Page"
+        else:
+            parent_module, parent_class = hierarchy.module_name(index - 1), hierarchy.class_name(index - 1)
+        module_path = os.path.join(package_dir, "page_%s" % index)
+        with open(module_path + ".py", "w") as f:
+            f.write(_PAGE_TEMPLATE % {"parent_module": parent_module, "parent_class": parent_class,
+                                      "class_name": hierarchy.class_name(index), "index": index})
+        with open(module_path + ".yaml", "w") as f:
+            f.write(_build_yaml(index, locators))
+    return hierarchy
+
+
+def _build_yaml(index, locators):
+    """
+    Builds the yaml of a page: a master locator, plain locators and groups of locators
+    Half of the plain locators are shared by every page so children override their parents
+    """
+    lines = ['master: "css=#synthetic-%s"' % index]
+    groups = max(locators // 10, 1)
+    for number in range(locators - groups):
+        owner = "shared" if number % 2 else "page_%s" % index
+        lines.append('locator_%s_%s: "id=%s-%s"' % (owner, number, owner, number))
+    for number in range(groups):
+        lines.append("group_%s:" % number)
+        lines.append('    first: "xpath=//div[@id=\'group-%s-%s\']/a"' % (index, number))
+        lines.append('    second: "name=group-%s-%s"' % (index, number))
+    return "\n".join(lines) + "\n"
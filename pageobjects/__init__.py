@@ -1,6 +1,42 @@
-from abstractedlogger import Logger
-from page import Page
-from context import Context
-from optionhandler import OptionHandler
-from yamlhandler import YAMLHandler
-from robothandler import RobotHandler
\ No newline at end of file
+"""
+The public classes are imported on first use so tools needing only part of the package
+do not pay for Selenium2Library, selenium and robot at import time
+"""
+from types import ModuleType
+import importlib
+import sys
+
+# public attribute -> module it lives in ##
+_LAZY_ATTRIBUTES = {
+    "Logger": "abstractedlogger",
+    "Page": "page",
+    "Context": "context",
+    "OptionHandler": "optionhandler",
+    "YAMLHandler": "yamlhandler",
+    "RobotHandler": "robothandler",
+    "PageRegistry": "pageregistry",
+}
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+class _LazyModule(ModuleType):
+    """
+    This module replaces the package in sys.modules and imports the public classes on first access
+    """
+    def __getattr__(self, name):
+        module_name = _LAZY_ATTRIBUTES.get(name, None)
+        if module_name is None:
+            raise AttributeError("module '%s' has no attribute '%s'" % (self.__name__, name))
+        value = getattr(importlib.import_module("%s.%s" % (self.__name__, module_name)), name)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(_LAZY_ATTRIBUTES))
+
+
+_lazy_module = _LazyModule(__name__, __doc__)
+_lazy_module.__dict__.update(sys.modules[__name__].__dict__)
+# Keep the original module alive, its globals are cleared once it is garbage collected ##
+_lazy_module._original_module = sys.modules[__name__]
+sys.modules[__name__] = _lazy_module
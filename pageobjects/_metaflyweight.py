@@ -5,7 +5,7 @@ class MetaFlyWeight(type):
     def __init__(cls, *args, **kargs):
         """
         This enables the decorated class to create a single instance and cache it
-        Stores each cached instance by module name
+        Stores each cached instance by module name, a class can key its instances otherwise with _get_flyweight_key
         cls = MetaFlyWeight
         """
         type.__init__(cls, *args, **kargs)
@@ -35,7 +35,7 @@ class MetaFlyWeight(type):
 
 
         """
-        key = (cls, args[1].__class__.__module__)
+        key = (cls, cls._get_flyweight_key(args[1]))
         instances = cls._MetaFlyWeight__instances
         if key in instances:
             return instances.get(key)
@@ -44,3 +44,14 @@ class MetaFlyWeight(type):
             new_instance._initialized = False
             cls._MetaFlyWeight__instances[key] = new_instance
             return new_instance
+
+    def _get_flyweight_key(cls, obj):
+        """
+        Returns the key the instance for the given object is cached under, the module of its class
+
+        :param obj: the object the instance is created for(ex. a page)
+        :type obj: object
+        :return: the key of the instance
+        :rtype: hashable
+        """
+        return obj.__class__.__module__
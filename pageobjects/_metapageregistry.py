@@ -0,0 +1,17 @@
+""" Add __metaclass__ = MetaPageRegistry to Class to work"""
+from pageregistry import PageRegistry
+
+
+class MetaPageRegistry(type):
+    def __init__(cls, *args, **kargs):
+        """
+        This registers every subclass of the decorated class in the PageRegistry
+        as soon as the subclass is defined or imported
+        The decorated base class itself is not registered
+        cls = MetaPageRegistry
+        """
+        type.__init__(cls, *args, **kargs)
+        for base in cls.__bases__:
+            if isinstance(base, MetaPageRegistry):
+                PageRegistry().register(cls)
+                break
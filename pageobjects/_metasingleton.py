@@ -5,6 +5,7 @@ class MetaSingleton(type):
     def __init__(cls, *args, **kargs):
         """
         This enables the decorated class to create a single instance
+        Parallel workers(ex. pabot) are separate processes so each worker has its own instance
         cls = MetaFlyWeight
         """
         type.__init__(cls, *args, **kargs)
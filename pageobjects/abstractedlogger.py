@@ -1,14 +1,26 @@
+import atexit
 import logging
 import sys
+import threading
+import Queue
 import robot.api.logger
 import robot.output.pyloggingconf as robot_logging_conf
+from robot.utils import is_truthy
 from optionhandler import OptionHandler
 from context import Context
+from parallel import get_worker_path, get_worker_id
 
 
 class Logger(object):
     """Responsible for abstracting Robot logging and logging outside of Robot.
+    Outside of Robot all Logger instances share one python logger per log file("Logger"),
+    whose handlers are registered once, records still propagate to the root logger.
+    With the "log_queue" option set the records are handed to a background writer thread through a bounded queue.
     """
+    # Python loggers with their handlers already registered, by log file ##
+    _python_loggers = {}
+    # Normalized logging levels, by (level, in robot) ##
+    _normalized_levels = {}
 
     def __init__(self):
         self.formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
@@ -18,25 +30,58 @@ class Logger(object):
         if Context.in_robot():
             self.logger = robot.api.logger
         else:
+            self.logger = self._get_python_logger()
+
+    def _get_python_logger(self):
+        """
+        Returns the python logger writing to po_log.txt(per worker), registering its handlers the first time
+        The file handler writes every record, the console handler only records logged with is_console
+
+        :return: the shared python logger
+        :rtype: logging.Logger
+        """
+        log_path = get_worker_path("po_log.txt")
+        logger = self._python_loggers.get(log_path, None)
+        if logger is not None:
+            return logger
+
+        # Keeps the name of the logger of the Logger class, so handlers configured for it still get the records ##
+        # A worker id set inside the process gets its own logger for its own log file ##
+        worker_id = get_worker_id()
+        logger = logging.getLogger("Logger" if worker_id is None else "Logger-worker%s" % worker_id)
+        # Filtering happens in log() against the threshold of each Logger instance ##
+        logger.setLevel(1)
+
+        fh = logging.FileHandler(log_path, "w")
+        fh.setFormatter(self.formatter)
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(self.formatter)
+        stream_handler.addFilter(_ConsoleFilter())
+        handlers = [fh, stream_handler]
+
+        option_handler = OptionHandler(self)
+        if is_truthy(option_handler.get("log_queue", False)):
+            queue_handler = _QueueHandler(handlers,
+                                          int(option_handler.get("log_queue_size", 10000)),
+                                          option_handler.get("log_queue_overflow", "block"))
+            handlers = [queue_handler]
+        for handler in handlers:
+            logger.addHandler(handler)
+        self._python_loggers[log_path] = logger
+        return logger
+
+    @classmethod
+    def shutdown_logging(cls):
+        """
+        Drains the background writers and removes the handlers of every python logger
+        Registered to run at exit, the next Logger outside of Robot registers new handlers
+        """
+        for logger in cls._python_loggers.values():
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                handler.close()
+        cls._python_loggers = {}
 
-            # Stream handler is attached from log() since
-            # that must be decided at run-time, but here we might as well
-            # do the setup to keep log() clean.
-            self.stream_handler = logging.StreamHandler(sys.stdout)
-            self.stream_handler.setFormatter(self.formatter)
-
-            # We have to instantiate a logger to something and this is a global
-            # logger so we name it by this class. Later in this class'
-            # log method, we manipulate the msg string to include the calling
-            # page class name.
-            logger = logging.getLogger(self.__class__.__name__)
-            logger.setLevel(self.threshold_level_as_int)
-            fh = logging.FileHandler("po_log.txt", "w")
-            fh.setLevel(self.threshold_level_as_int)
-            fh.setFormatter(self.formatter)
-            logger.addHandler(fh)
-            self.logger = logger
-            
     def get_threshold_level_as_str(self):
         """
         This method gets threshold level and normalizes it to upper
@@ -64,8 +109,8 @@ class Logger(object):
         except AttributeError:
             return getattr(logging, "INFO")
 
-    @staticmethod
-    def get_normalized_logging_levels(level_as_str):
+    @classmethod
+    def get_normalized_logging_levels(cls, level_as_str):
         """
         Given a log string, returns the translated log level string and the translated
         python logging level integer. This is needed because there are logging level
@@ -77,7 +122,26 @@ class Logger(object):
         :return: log level constant for robot/python
         :rtype: str
         """
+        in_robot = Context.in_robot()
+        try:
+            return cls._normalized_levels[(level_as_str, in_robot)]
+        except KeyError:
+            levels = cls._normalized_levels[(level_as_str, in_robot)] = cls._get_normalized_logging_levels(
+                level_as_str, in_robot)
+            return levels
+
+    @staticmethod
+    def _get_normalized_logging_levels(level_as_str, in_robot):
+        """
+        Translates the log level string, see get_normalized_logging_levels
 
+        :param level_as_str: log_level as string
+        :type level_as_str: str
+        :param in_robot: True if robot is running
+        :type in_robot: bool
+        :return: log level constant for robot/python
+        :rtype: str
+        """
         translation_map = {
             "CRITICAL": "WARN",
             "WARNING": "WARN",
@@ -85,7 +149,7 @@ class Logger(object):
         }
 
         level_as_str_upper = level_as_str.upper()
-        if Context.in_robot():
+        if in_robot:
             robot_levels = robot_logging_conf.LEVELS
 
             # The level passed in is a Robot level, so look up corresponding
@@ -124,9 +188,10 @@ class Logger(object):
                 except AttributeError:
                     raise ValueError("The log level '%s' is invalid" % level_as_str_upper)
 
-    def log(self, msg, level="INFO", is_console=True):
+    def log(self, msg, level="INFO", is_console=True, args=None):
         """
         Logs msg in Robot if possible but will also output to Console
+        Outside of Robot messages below the threshold level are dropped before msg is formatted with args
 
         :param msg: The Message to output
         :type msg: str
@@ -134,16 +199,117 @@ class Logger(object):
         :type level: str
         :param is_console: If "True" then display to both console and robot
         :type is_console: bool
+        :param args: the values to format msg with(msg % args), only formatted if the message is logged
+        :type args: tuple
         """
         level_as_str, level_as_int = self.get_normalized_logging_levels(level)
         if Context.in_robot():
+            if args is not None:
+                msg = msg % args
             self.logger.write(msg, level_as_str)
             if is_console:
                 # Robot's logging only outputs to stdout if it's a warning, so allow
                 # always logging to console, unless caller specifies not to.
                 robot.api.logger.console("%s - %s" % (level, msg))
-        else:
-            if is_console:
-                self.logger.addHandler(self.stream_handler)
+        elif level_as_int >= self.threshold_level_as_int:
+            self.logger.log(level_as_int, msg, *(args if args is not None else ()),
+                            extra={"is_console": is_console})
+
+
+# The queued records are written before the process exits ##
+atexit.register(Logger.shutdown_logging)
+
+
+class _ConsoleFilter(logging.Filter):
+    """
+    Only lets through the records logged with is_console
+    """
+    def filter(self, record):
+        return getattr(record, "is_console", False)
+
+
+class _QueueHandler(logging.Handler):
+    """
+    Hands the records to a background writer thread through a bounded queue
+    When the queue is full the overflow policy decides:
+        block: wait for the writer(Default)
+        drop_new: drop the new record
+        drop_oldest: drop the oldest queued record
+    Dropped records are counted and reported when the handler is closed
+    """
+    OVERFLOW_POLICIES = ("block", "drop_new", "drop_oldest")
+
+    def __init__(self, handlers, maxsize=10000, overflow="block"):
+        logging.Handler.__init__(self)
+        overflow = str(overflow).lower()
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError("The log queue overflow policy '%s' is invalid, use one of %s"
+                             % (overflow, ", ".join(self.OVERFLOW_POLICIES)))
+        self.handlers = handlers
+        self.overflow = overflow
+        self.dropped = 0
+        self.queue = Queue.Queue(maxsize)
+        self._writer = threading.Thread(target=self._write, name="pageobjects-log-writer")
+        self._writer.daemon = True
+        self._writer.start()
+        atexit.register(self.close)
+
+    def emit(self, record):
+        # Formatting here keeps the message as it was when logged ##
+        record.msg = record.getMessage()
+        record.args = None
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except Queue.Full:
+                self.dropped += 1
+                if self.overflow == "drop_new":
+                    return
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                except Queue.Empty:
+                    pass
+
+    def _write(self):
+        """
+        Writes the queued records to the real handlers until the None sentinel is queued
+        """
+        while True:
+            record = self.queue.get()
+            try:
+                if record is None:
+                    return
+                for handler in self.handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+            except Exception:
+                pass
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """
+        Waits until the writer wrote every queued record
+        """
+        if self._writer.is_alive():
+            self.queue.join()
+        for handler in self.handlers:
+            handler.flush()
 
-            self.logger.log(level_as_int, msg)
+    def close(self):
+        if self._writer.is_alive():
+            self.queue.put(None)
+            self._writer.join()
+        for handler in self.handlers:
+            if self.dropped:
+                handler.handle(logging.makeLogRecord({
+                    "msg": "LOGGER WARNING: %s log records were dropped by the full log queue" % self.dropped,
+                    "levelno": logging.WARNING, "levelname": "WARNING", "is_console": True}))
+            handler.close()
+        self.dropped = 0
+        logging.Handler.close(self)
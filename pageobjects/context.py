@@ -1,6 +1,18 @@
-from robot.libraries.BuiltIn import BuiltIn
-from robot.running.context import EXECUTION_CONTEXTS
 from _metasingleton import MetaSingleton
+import sys
+
+
+def _get_current_execution_context():
+    """
+    Returns robot's current execution context without importing robot
+    Robot can only be running if it already imported robot.running.context
+
+    :return: the current execution context or None if robot is not running
+    """
+    robot_context = sys.modules.get("robot.running.context", None)
+    if robot_context is None:
+        return None
+    return robot_context.EXECUTION_CONTEXTS.current
 
 
 class Context(object):
@@ -14,21 +26,55 @@ class Context(object):
     _new_called = 0
     _keywords_exposed = False
     _cache = None
+    # (suite, dict of page class to instance) for the current suite ##
+    _page_instances = None
     _current_page = None
+    _in_robot = False
+    _in_robot_context = None
+    _counters = {"in_robot_checks": 0, "in_robot_evaluations": 0, "variable_copies": 0}
 
-    @staticmethod
-    def in_robot():
+    @classmethod
+    def in_robot(cls):
         """
         This returns True if Robot framework is running
+        The answer is cached per robot execution context, so it changes when robot starts or stops
 
         :return: bool True if robot is running
         :rtype: bool
         """
-        try:
-            BuiltIn().get_variables()
-            return True
-        except:
-            return False
+        cls._counters["in_robot_checks"] += 1
+        current = _get_current_execution_context()
+        if current is not cls._in_robot_context:
+            cls._counters["in_robot_evaluations"] += 1
+            cls._in_robot_context = current
+            cls._in_robot = current is not None and getattr(current, "namespace", None) is not None
+        return cls._in_robot
+
+    @classmethod
+    def get_variables(cls):
+        """
+        Returns a copy of all the robot variables in the current scope
+        This is expensive so every copy is counted(see get_counters)
+
+        :return: all robot variables
+        :rtype: dict
+        """
+        from robot.libraries.BuiltIn import BuiltIn
+        cls._counters["variable_copies"] += 1
+        return BuiltIn().get_variables()
+
+    @classmethod
+    def get_counters(cls):
+        """
+        Returns the counters of the context checks
+            in_robot_checks: number of calls to in_robot
+            in_robot_evaluations: number of times in_robot looked at a new execution context
+            variable_copies: number of copies of the robot variables made by the library
+
+        :return: dict of counter name to count
+        :rtype: dict
+        """
+        return dict(cls._counters)
 
     @staticmethod
     def set_current_page(name):
@@ -38,6 +84,7 @@ class Context(object):
         :param name: The name of the page to set as current context
         :type name: str
         """
+        from robot.libraries.BuiltIn import BuiltIn
         BuiltIn().set_library_search_order(name)
 
     @classmethod
@@ -57,6 +104,27 @@ class Context(object):
         """
         return cls._cache
 
+    @classmethod
+    def get_page_instance(cls, clazz):
+        """
+        Returns the instance of the page class for the current suite, constructing it on first use
+        Instances are forgotten when the suite changes
+
+        :param clazz: the page class
+        :type clazz: class
+        :return: the page instance
+        :rtype: Page
+        """
+        current = _get_current_execution_context()
+        suite = current.suite if current is not None else None
+        if cls._page_instances is None or cls._page_instances[0] is not suite:
+            cls._page_instances = (suite, {})
+        instances = cls._page_instances[1]
+        instance = instances.get(clazz, None)
+        if instance is None:
+            instance = instances[clazz] = clazz()
+        return instance
+
     @staticmethod
     def get_libraries():
         """
@@ -66,4 +134,4 @@ class Context(object):
         :rtype: list of strings
         """
         """ Gets the list of libraries that are imported in robot"""
-        return [lib.name for lib in EXECUTION_CONTEXTS.current.namespace.libraries]
+        return [lib.name for lib in _get_current_execution_context().namespace.libraries]
@@ -36,3 +36,24 @@ class PageLoadError(Exception):
     Raised when a page fails to load
     """
     pass
+
+
+class PageNotFoundError(Exception):
+    """
+    Raised when no page is registered with the requested name
+    """
+    pass
+
+
+class WaitTimeoutError(Exception):
+    """
+    Raised when a waited for condition is not met within the timeout
+    """
+    pass
+
+
+class RoundTripBudgetError(Exception):
+    """
+    Raised when a keyword exceeds its WebDriver round trip budget or repeats the same command too often
+    """
+    pass
@@ -0,0 +1,114 @@
+"""
+This File reports how long importing each module takes so startup regressions can be caught
+Self time is the time spent in the module itself, cumulative time includes the modules it imported.
+Usage:
+    python -m pageobjects.importprofile [module ...] [--top N]
+Example:
+    python -m pageobjects.importprofile pageobjects pageobjects.page --top 20
+"""
+import __builtin__
+import sys
+import time
+
+
+class ImportRecord(object):
+    """
+    This object holds the import cost of a single module:
+    name: the name of the module
+    cumulative: seconds spent importing the module and everything it imported
+    own: seconds spent in the module itself
+    depth: how deep in the import chain the module was first imported
+    """
+    name = None
+    cumulative = 0.0
+    own = 0.0
+    depth = 0
+
+    def __init__(self, name, cumulative, own, depth):
+        self.name = name
+        self.cumulative = cumulative
+        self.own = own
+        self.depth = depth
+
+
+def profile_imports(module_names):
+    """
+    Imports the given modules and records the cost of every module that was newly imported
+    Modules that are already in sys.modules cost nothing and are not reported
+
+    :param module_names: the names of the modules to import
+    :type module_names: list of strings
+    :return: the import records, most expensive first
+    :rtype: list of ImportRecord
+    """
+    records = {}
+    # one entry per import statement being run: [start time, time spent in nested imports] ##
+    stack = []
+    original_import = __builtin__.__import__
+
+    def _timed_import(name, globals=None, locals=None, fromlist=None, level=-1):
+        before = set(sys.modules)
+        frame = [time.time(), 0.0]
+        stack.append(frame)
+        try:
+            return original_import(name, globals, locals, fromlist, level)
+        finally:
+            stack.pop()
+            elapsed = time.time() - frame[0]
+            if stack:
+                stack[-1][1] += elapsed
+            # Only real modules are recorded, py2 leaves None placeholders for failed relative imports ##
+            new_modules = [module for module in set(sys.modules) - before if sys.modules.get(module) is not None]
+            if new_modules:
+                # The statement asked for the module named like the import, relative imports add the package ##
+                requested = [module for module in new_modules if module == name or module.endswith("." + name)]
+                module_name = min(requested or new_modules, key=len)
+                records[module_name] = ImportRecord(module_name, elapsed, elapsed - frame[1], len(stack))
+
+    __builtin__.__import__ = _timed_import
+    try:
+        for module_name in module_names:
+            __import__(module_name)
+            # Touch the lazy package attributes so the real cost of the package is measured ##
+            module = sys.modules[module_name]
+            for attribute in getattr(module, "__all__", []):
+                getattr(module, attribute)
+    finally:
+        __builtin__.__import__ = original_import
+    return sorted(records.values(), key=lambda record: record.cumulative, reverse=True)
+
+
+def format_report(records, top=None):
+    """
+    Formats import records as a table
+
+    :param records: the records from profile_imports
+    :type records: list of ImportRecord
+    :param top: the number of records to show, None shows all
+    :type top: int
+    :return: the report
+    :rtype: str
+    """
+    lines = ["%10s %10s  %s" % ("self ms", "cumul ms", "module")]
+    for record in records[:top]:
+        lines.append("%10.1f %10.1f  %s%s" % (record.own * 1000, record.cumulative * 1000,
+                                             "  " * record.depth, record.name))
+    total = sum(record.own for record in records)
+    lines.append("%10.1f %10s  total of %s modules" % (total * 1000, "", len(records)))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    top = None
+    if "--top" in argv:
+        index = argv.index("--top")
+        top = int(argv[index + 1])
+        argv = argv[:index] + argv[index + 2:]
+    module_names = argv or ["pageobjects"]
+    print format_report(profile_imports(module_names), top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,8 @@
 from _metasingleton import MetaSingleton
+from manifest import get_manifest, get_qualified_name
+import inspect
+import json
+import re
 
 
 class KeywordManager(object):
@@ -11,14 +15,17 @@ class KeywordManager(object):
         KeywordManager().get_meth_from_robot_alias(page,name)
     To get a list of all robot keywords for page:
         KeywordManager().get_robot_keywords(self)
+    To export the arguments and documentation of every keyword of every page:
+        KeywordManager().export_keyword_metadata("keywords.json")
     """
     def __init__(self):
         if not self._initialized:
             # PLACE CRITICAL CODE HERE IN ORDER TO AVOID INIT BEING CALLED TWICE
             self._initialized = True
             self._robot_maps_by_page = {}
-            self._robot_maps_by_name = {}
             self._func_maps_by_page = {}
+            self._dispatch_by_page = {}
+            self._embedded_by_page = {}
 
     def add_page_methods(self, page_inst):
         """
@@ -40,37 +47,95 @@ class KeywordManager(object):
         if robot_page_name not in self._robot_maps_by_page:
             current_page_robot_map = {}
             current_page_func_map = {}
-            for page in pages:
-                # IGNORE ANY METHOD IN LOGGER ##
-                if page.__name__ == 'Logger':
-                    continue
-                # ALL S2L METHODS SHOULD ONLY EXIST IN PAGE AND NOTHING ELSE ##
-                elif page_inst.__class__.__name__ != 'Page' and self.in_s2l(page):
-                    continue
-                for method in page.__dict__.values():
-                    # VALIDATING THAT METHOD IS A FUNCTION OBJECT ##
-                    if hasattr(method, "func_name"):
-                        func_name = method.func_name
-                        # IGNORE ANY METHOD THAT IS PRIVATE TO ROBOT HOOK ##
-                        if func_name.startswith("_") or func_name in ["get_keyword_names", "run_keyword","get_keyword_arguments","get_keyword_documentation"]:
-                            continue
-                        # FUNC NAME AND ALIAS DEFAULT TO NAME ##
-                        func_alias = func_name
-                        robot_name = func_name
-                        # IF ROBOT ALIAS EXIST THEN OVERWRITE ${pagename} with page name ##
-                        if hasattr(method, "robot_name"):
-                            func_alias = method.robot_name
-                            robot_name = func_alias.replace("${pagename}", robot_page_name)
-                        # Adding Entries into Func Map under func alias ##
-                        current_page_func_map[func_alias] = FuncMap(func_alias, func_name, page, method)
-                        # Adding Entries into Robot Map under robot function name##
-                        current_page_robot_map[robot_name] = RobotMap(robot_name, page_inst, func_alias)
+            current_page_dispatch = {}
+            current_page_embedded = []
+            for page, method in self._get_page_methods(page_inst, pages):
+                func_name = method.func_name
+                # FUNC NAME AND ALIAS DEFAULT TO NAME ##
+                func_alias = func_name
+                robot_name = func_name
+                # IF ROBOT ALIAS EXIST THEN OVERWRITE ${pagename} with page name ##
+                if hasattr(method, "robot_name"):
+                    func_alias = method.robot_name
+                    robot_name = func_alias.replace("${pagename}", robot_page_name)
+                # Adding Entries into Func Map under func alias ##
+                func_map = FuncMap(func_alias, func_name, page, method)
+                # S2L KEYWORDS RETURN THE PAGE SO THEY CAN BE CHAINED ##
+                func_map.returns_page = self.in_s2l(page)
+                # COMPILING EMBEDDED ARGUMENTS ONCE SO DISPATCH IS A SINGLE MATCH ##
+                if "${" in func_alias:
+                    func_map.arg_matcher = EmbeddedArgsMatcher(func_alias, robot_page_name)
+                    current_page_embedded.append(func_map)
+                current_page_func_map[func_alias] = func_map
+                # Adding Entries into Robot Map under robot function name##
+                current_page_robot_map[robot_name] = RobotMap(robot_name, page_inst, func_alias)
+                # Adding Entries into Dispatch Table under robot normalized name ##
+                current_page_dispatch[self.normalize(robot_name)] = func_map
                 # Adding Entries into Func Map by page and updating list ##
                 # Must be entered by page as function mapping changes per inheritance per page ##
             self._func_maps_by_page[robot_page_name] = current_page_func_map
             # Adding Entries into Robot Map for the current page and updating list of robot keywords ##
             self._robot_maps_by_page[robot_page_name] = current_page_robot_map
-            self._robot_maps_by_name.update(current_page_robot_map)
+            # Adding Dispatch Table for the current page ##
+            self._dispatch_by_page[robot_page_name] = current_page_dispatch
+            self._embedded_by_page[robot_page_name] = current_page_embedded
+
+    def _get_page_methods(self, page_inst, pages):
+        """
+        Returns the methods of the pages that are keywords, taken from the manifest keyword table when
+        the page is unchanged since the manifest was built, otherwise found by scanning every class
+
+        :param page_inst: The page instance with the methods to add
+        :type page_inst: Page Object
+        :param pages: the classes of the page from top to bottom
+        :type pages: list of classes
+        :return: list of (class, method) in the order they are added
+        :rtype: list of tuples
+        """
+        manifest = get_manifest(page_inst)
+        entry = manifest.get_page(page_inst) if manifest else None
+        if entry is not None:
+            pages_by_name = dict((get_qualified_name(page), page) for page in pages)
+            methods = []
+            for keyword in entry["keywords"]:
+                page = pages_by_name.get(keyword["owner"], None)
+                method = page.__dict__.get(keyword["def_name"], None) if page is not None else None
+                if not hasattr(method, "func_name"):
+                    # Classes outside of the manifest(ex. S2L after an upgrade) changed, scanning instead ##
+                    break
+                methods.append((page, method))
+            else:
+                return methods
+        return self._scan_page_methods(page_inst, pages)
+
+    def _scan_page_methods(self, page_inst, pages):
+        """
+        Returns the methods of the pages that are keywords by scanning the __dict__ of every class
+
+        :param page_inst: The page instance with the methods to add
+        :type page_inst: Page Object
+        :param pages: the classes of the page from top to bottom
+        :type pages: list of classes
+        :return: list of (class, method) in the order they are added
+        :rtype: list of tuples
+        """
+        methods = []
+        for page in pages:
+            # IGNORE ANY METHOD IN LOGGER ##
+            if page.__name__ == 'Logger':
+                continue
+            # ALL S2L METHODS SHOULD ONLY EXIST IN PAGE AND NOTHING ELSE ##
+            elif page_inst.__class__.__name__ != 'Page' and self.in_s2l(page):
+                continue
+            for method in page.__dict__.values():
+                # VALIDATING THAT METHOD IS A FUNCTION OBJECT ##
+                if hasattr(method, "func_name"):
+                    func_name = method.func_name
+                    # IGNORE ANY METHOD THAT IS PRIVATE TO ROBOT HOOK ##
+                    if func_name.startswith("_") or func_name in ["get_keyword_names", "run_keyword","get_keyword_arguments","get_keyword_documentation"]:
+                        continue
+                    methods.append((page, method))
+        return methods
 
     def get_robot_keywords_for_page(self, page):
         """
@@ -90,6 +155,7 @@ class KeywordManager(object):
             func_alias: name
             def_name: defined func name
             func_page: class that holds the function
+        The name is matched the way robot matches keywords(ignoring case, spaces and underscores)
 
         :param page: the current page instance
         :type page: Page
@@ -99,11 +165,116 @@ class KeywordManager(object):
         :rtype: _Func_Map
         """
         try:
-            robot_map = self._robot_maps_by_name[robot_name]
-        except:
+            return self._dispatch_by_page[page.name][self.normalize(robot_name)]
+        except KeyError:
+            # Robot can pass embedded arguments already substituted into the name ##
+            for func_map in self._embedded_by_page.get(page.name, ()):
+                if func_map.arg_matcher.regex.match(robot_name):
+                    return func_map
             raise Exception("Keyword, %s, not found in pages" % robot_name)
-        func_map_for_page = self._func_maps_by_page[page.name]
-        return func_map_for_page[robot_map.func_alias]
+
+    def get_keyword_arguments(self, page, robot_name):
+        """
+        Returns the robot argspec of the keyword for the given page
+        The argspec is built once per page and keyword and then cached on the Func Map
+
+        :param page: the current page instance
+        :type page: Page
+        :param robot_name: the keyword name from robot
+        :type robot_name: str
+        :return: a list of strings describing the argspec
+        :rtype: list of strings
+        """
+        func_map = self.get_meth_mapping_from_robot_alias(page, robot_name)
+        if func_map.argument_spec is None:
+            func_map.argument_spec = self._build_argument_spec(func_map)
+        return list(func_map.argument_spec)
+
+    def get_keyword_documentation(self, page, robot_name):
+        """
+        Returns the documentation of the keyword for the given page
+        The documentation is processed once per page and keyword and then cached on the Func Map
+
+        :param page: the current page instance
+        :type page: Page
+        :param robot_name: the keyword name from robot
+        :type robot_name: str
+        :return: a documentation string for the keyword
+        :rtype: str
+        """
+        func_map = self.get_meth_mapping_from_robot_alias(page, robot_name)
+        if func_map.documentation is None:
+            docstring = func_map.func.__doc__ if func_map.func.__doc__ else ''
+            func_map.documentation = re.sub(r'(wrapper)', r'*\1*', docstring, flags=re.I)
+        return func_map.documentation
+
+    def export_keyword_metadata(self, path=None):
+        """
+        Exports the arguments and documentation of every keyword of every page added so far
+        Example output:
+            {"Login Page": {"Open Login Page": {"args": [], "doc": "..."}}}
+
+        :param path: the file to write the metadata to as json (Defaults to not writing)
+        :type path: str
+        :return: dict of page names to dicts of robot keyword names to their metadata
+        :rtype: dict
+        """
+        metadata = {}
+        for page_name, robot_map in self._robot_maps_by_page.iteritems():
+            page_metadata = metadata[page_name] = {}
+            for robot_name, robot_entry in robot_map.iteritems():
+                page_metadata[robot_name] = {
+                    "args": self.get_keyword_arguments(robot_entry.robot_page, robot_name),
+                    "doc": self.get_keyword_documentation(robot_entry.robot_page, robot_name)
+                }
+        if path:
+            with open(path, "w") as f:
+                json.dump(metadata, f, indent=2, sort_keys=True)
+        return metadata
+
+    def _build_argument_spec(self, func_map):
+        """
+        Builds the robot argspec for the function in the Func Map
+
+        :param func_map: the Func Map of the keyword
+        :type func_map: FuncMap
+        :return: a list of strings describing the argspec
+        :rtype: list of strings
+        """
+        kw = func_map.func
+        if not kw:
+            return ['*args']
+        args, varargs, keywords, defaults = inspect.getargspec(kw)
+        defaults = dict(zip(args[-len(defaults):], defaults)) if defaults else {}
+        arglist = []
+        for arg in args:
+            if arg != 'self':
+                argstring = arg
+                if arg in defaults:
+                    argstring += '=%s' % defaults[arg]
+                arglist.append(argstring)
+        if varargs:
+            arglist.append('*args')
+        if keywords:
+            arglist.append('**keywords')
+        # ${pagename} is substituted into the keyword name, robot passes the other embedded arguments ##
+        if func_map.arg_matcher is not None and "pagename" in func_map.arg_matcher.arg_names:
+            arglist = [arg for arg in arglist if arg.split("=")[0] != "pagename"]
+        return arglist
+
+    @staticmethod
+    def normalize(robot_name):
+        """
+        Normalizes a keyword name the way robot does by:
+            making it lowercase
+            removing spaces and _
+
+        :param robot_name: the keyword name to normalize
+        :type robot_name: str
+        :return: normalized version of the keyword name
+        :rtype: str
+        """
+        return robot_name.lower().replace(" ", "").replace("_", "")
 
     def in_s2l(self, clazz):
         """
@@ -126,11 +297,19 @@ class FuncMap(object):
     def_name: the absolute name of the function
     func_page: the page that the func resides in
     func: the func object for that function
+    arg_matcher: the compiled EmbeddedArgsMatcher if the alias has embedded arguments("${...}")
+    returns_page: True if the page is returned when the function returns None(S2L keywords)
+    argument_spec: the cached robot argspec of the function
+    documentation: the cached robot documentation of the function
     """
     func_alias = None
     def_name = None
     func_page = None
     func = None
+    arg_matcher = None
+    returns_page = False
+    argument_spec = None
+    documentation = None
 
     def __init__(self, alias, name, page, meth):
         self.func_alias = alias
@@ -154,3 +333,58 @@ class RobotMap(object):
         self.robot_name = name
         self.robot_page = page
         self.func_alias = func_alias
+
+
+class EmbeddedArgsMatcher(object):
+    """
+    EmbeddedArgsMatcher is a keyword alias with embedded arguments("${...}") compiled into a regex:
+    alias: the keyword alias ex. "Open ${pagename}"
+    arg_names: the names of the embedded arguments in order ex. ["pagename"]
+    regex: the compiled pattern matching robot keyword names for the alias
+    Any instance of ${pagename} only matches the name of the page it was compiled for
+    """
+    EMBEDDED_ARG = re.compile(r"\$\{([^}]+)\}")
+    alias = None
+    arg_names = None
+    regex = None
+
+    def __init__(self, alias, page_name):
+        self.alias = alias
+        self.arg_names = []
+        pattern = ""
+        position = 0
+        for match in self.EMBEDDED_ARG.finditer(alias):
+            arg_name = match.group(1)
+            pattern += re.escape(alias[position:match.start()])
+            if arg_name == "pagename":
+                pattern += "(%s)" % re.escape(page_name)
+            else:
+                pattern += "(.+?)"
+            self.arg_names.append(arg_name)
+            position = match.end()
+        pattern += re.escape(alias[position:])
+        self.regex = re.compile("^%s$" % pattern, re.IGNORECASE)
+
+    def get_args(self, robot_name, robot_args=()):
+        """
+        Extracts the embedded arguments from the robot keyword name
+        If robot already resolved an argument the name holds the placeholder and the value comes from robot_args
+
+        :param robot_name: the keyword name given by robot
+        :type robot_name: str
+        :param robot_args: the positional args given by robot
+        :type robot_args: list
+        :return: the arguments for the method
+        :rtype: tuple
+        :raise Exception: if the name does not match the alias
+        """
+        match = self.regex.match(robot_name)
+        if match is None:
+            raise Exception("ERROR: No args found for arguments '%s' in method '%s'" % (", ".join(self.arg_names), self.alias))
+        remaining = list(robot_args)
+        args = []
+        for arg_name, value in zip(self.arg_names, match.groups()):
+            if value == "${%s}" % arg_name and remaining:
+                value = remaining.pop(0)
+            args.append(value)
+        return tuple(args + remaining)
@@ -0,0 +1,79 @@
+"""
+This File holds the locator parsing shared by the handlers and the injected javascript probes
+Locators follow the Selenium2Library format "strategy=value", ex. "css=#login" or "xpath=//div"
+"""
+
+# Strategies that the injected javascript can resolve in the browser ##
+SCRIPT_STRATEGIES = frozenset(["identifier", "id", "name", "xpath", "css", "class", "tag", "link", "partial link"])
+
+# Javascript function resolving a parsed locator to a list of elements in the current document ##
+# Returns null when the strategy is not supported so callers can fall back to Selenium2Library ##
+JS_FIND_ELEMENTS = """
+function poFindElements(strategy, value) {
+    var doc = document, found = [], i, nodes;
+    function toArray(list) {
+        var result = [];
+        for (var j = 0; j < list.length; j++) { result.push(list[j]); }
+        return result;
+    }
+    function byLinkText(partial) {
+        var links = doc.getElementsByTagName('a'), result = [];
+        for (var j = 0; j < links.length; j++) {
+            var text = (links[j].textContent || links[j].innerText || '').replace(/^\\s+|\\s+$/g, '');
+            if (partial ? text.indexOf(value) !== -1 : text === value) { result.push(links[j]); }
+        }
+        return result;
+    }
+    switch (strategy) {
+        case 'id':
+            nodes = doc.getElementById(value);
+            return nodes ? [nodes] : [];
+        case 'identifier':
+            nodes = doc.getElementById(value);
+            found = nodes ? [nodes] : [];
+            return found.concat(toArray(doc.getElementsByName(value)));
+        case 'name':
+            return toArray(doc.getElementsByName(value));
+        case 'css':
+            return toArray(doc.querySelectorAll(value));
+        case 'class':
+            return toArray(doc.getElementsByClassName(value));
+        case 'tag':
+            return toArray(doc.getElementsByTagName(value));
+        case 'xpath':
+            nodes = doc.evaluate(value, doc, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (i = 0; i < nodes.snapshotLength; i++) { found.push(nodes.snapshotItem(i)); }
+            return found;
+        case 'link':
+            return byLinkText(false);
+        case 'partial link':
+            return byLinkText(true);
+    }
+    return null;
+}
+function poIsVisible(element) {
+    if (!element.offsetWidth && !element.offsetHeight && !element.getClientRects().length) { return false; }
+    var style = window.getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+"""
+
+
+def parse_locator(locator):
+    """
+    Splits a Selenium2Library locator into its strategy and value
+    Locators starting with "//" are xpath and locators without a prefix use the "identifier" strategy
+
+    :param locator: the locator to split ex. "css=#login"
+    :type locator: str
+    :return: the lower-cased strategy and the value
+    :rtype: tuple of (str, str)
+    """
+    if locator.startswith("//"):
+        return "xpath", locator
+    prefix, separator, value = locator.partition("=")
+    if separator:
+        strategy = prefix.strip().lower()
+        if strategy in SCRIPT_STRATEGIES or strategy in ("dom", "jquery", "sizzle", "sclocator", "default"):
+            return strategy, value.strip()
+    return "identifier", locator
@@ -0,0 +1,364 @@
+"""
+This File builds and loads the page catalog manifest
+The manifest records, for every page class of a package, its name, uri, parent classes, keyword table,
+the .yaml and .robot companion files with their hashes and the parsed locators of the yaml files.
+The companion files looked for but absent at build time are recorded too, so adding one makes the page stale.
+With the "manifest" option(PO_MANIFEST) set the handlers take this from the manifest instead of
+looking it up by reflection, for every page and file that is unchanged since the manifest was built.
+Usage:
+    python -m pageobjects.manifest [package ...] [-o po_manifest.json] [--check]
+Example:
+    python -m pageobjects.manifest mypages -o po_manifest.json
+"""
+from _metasingleton import MetaSingleton
+import hashlib
+import importlib
+import inspect
+import json
+import optparse
+import os
+import pkgutil
+import sys
+import time
+
+MANIFEST_VERSION = 2
+
+
+class Manifest(object):
+    __metaclass__ = MetaSingleton
+    """
+    This singleton class holds the loaded manifest
+    Page entries and files are checked against the disk once per process, by size and mtime first and
+    by hash when those changed, and are ignored once they are stale so the handlers fall back to reflection
+    To get the manifest of a page use:
+        get_manifest(page_inst)
+    """
+    def __init__(self):
+        if not self._initialized:
+            # PLACE CRITICAL CODE HERE IN ORDER TO AVOID INIT BEING CALLED TWICE
+            self._initialized = True
+            self._path = None
+            self._pages = {}
+            self._files = {}
+            self._checked_files = {}
+            self._checked_pages = {}
+            self._stats = {"pages": 0, "stale_pages": 0, "files": 0, "stale_files": 0}
+
+    def load(self, path):
+        """
+        Loads the manifest at the given path, does nothing if it is already loaded
+
+        :param path: the path of the manifest file
+        :type path: str
+        :return: True if the manifest is loaded
+        :rtype: bool
+        """
+        path = os.path.abspath(path)
+        if path == self._path:
+            return True
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            return False
+        # A manifest built with another version of the library has other keywords for the base pages ##
+        if data.get("version", None) != MANIFEST_VERSION or data.get("library", None) != get_library_fingerprint():
+            return False
+        base_dir = os.path.dirname(path)
+        self._path = path
+        self._pages = data.get("pages", {})
+        self._files = dict((os.path.normpath(os.path.join(base_dir, file_path)), entry)
+                           for file_path, entry in data.get("files", {}).iteritems())
+        self._checked_files = {}
+        self._checked_pages = {}
+        return True
+
+    def get_page(self, page_inst):
+        """
+        Returns the manifest entry of a page if the source files of the page and its parents are unchanged
+
+        :param page_inst: the page instance
+        :type page_inst: Page
+        :return: the entry with "name", "uri", "parents", "keywords", "yaml", "robot" and "companions" or None
+        :rtype: dict
+        """
+        clazz = page_inst.__class__
+        try:
+            return self._checked_pages[clazz]
+        except KeyError:
+            pass
+        entry = self._pages.get(get_qualified_name(clazz), None)
+        if entry is not None:
+            parents = page_inst._get_parent_pages(include_self=False, top_to_bottom=True)
+            if [get_qualified_name(parent) for parent in parents] != entry["parents"] or \
+                    any(self.get_file(get_source_file(page)) is None for page in parents + [clazz]) or \
+                    not self._companions_unchanged(entry["companions"]):
+                entry = None
+                self._stats["stale_pages"] += 1
+            else:
+                self._stats["pages"] += 1
+        self._checked_pages[clazz] = entry
+        return entry
+
+    def _companions_unchanged(self, companions):
+        """
+        Checks that the .yaml and .robot files of a page are the ones present at build time
+        A present companion must be unchanged(see get_file) and an absent one must still be absent
+
+        :param companions: dict of companion path to its mtime, or None if it was absent
+        :type companions: dict
+        :return: True if no companion was added, removed or changed
+        :rtype: bool
+        """
+        for companion, mtime in companions.iteritems():
+            path = self.resolve(companion)
+            if mtime is None:
+                if os.path.isfile(path):
+                    return False
+            elif self.get_file(path) is None:
+                return False
+        return True
+
+    def get_file(self, path):
+        """
+        Returns the manifest entry of a file if the file is unchanged
+
+        :param path: the path of the file
+        :type path: str
+        :return: the entry with "hash", "mtime", "size" and for yaml files "values" or None
+        :rtype: dict
+        """
+        if not path:
+            return None
+        path = os.path.normpath(os.path.abspath(path))
+        try:
+            return self._checked_files[path]
+        except KeyError:
+            pass
+        entry = self._files.get(path, None)
+        if entry is not None:
+            try:
+                stat = os.stat(path)
+                if stat.st_size != entry["size"] or stat.st_mtime != entry["mtime"]:
+                    # A fresh checkout changes mtimes but not content ##
+                    if stat.st_size != entry["size"] or hash_file(path) != entry["hash"]:
+                        entry = None
+            except OSError:
+                entry = None
+            self._stats["files" if entry is not None else "stale_files"] += 1
+        self._checked_files[path] = entry
+        return entry
+
+    def get_stats(self):
+        """
+        Returns how many page entries and files were used or found stale
+
+        :return: dict of counter name to count
+        :rtype: dict
+        """
+        return dict(self._stats)
+
+    def resolve(self, path):
+        """
+        Resolves a path stored in the manifest(relative to the manifest file)
+        """
+        return os.path.normpath(os.path.join(os.path.dirname(self._path), path))
+
+
+def get_manifest(page_inst):
+    """
+    Returns the manifest given by the "manifest" option of the page, loading it the first time
+
+    :param page_inst: the page instance
+    :type page_inst: Page
+    :return: the manifest or None if no manifest is set or it can not be loaded
+    :rtype: Manifest
+    """
+    from optionhandler import OptionHandler
+    path = OptionHandler(page_inst).get("manifest", None)
+    if not path:
+        return None
+    manifest = Manifest()
+    return manifest if manifest.load(path) else None
+
+
+def get_qualified_name(clazz):
+    return "%s.%s" % (clazz.__module__, clazz.__name__)
+
+
+def get_source_file(clazz):
+    """
+    Returns the .py file of a class, or the compiled file if there is no source
+    """
+    try:
+        path = inspect.getfile(clazz)
+    except TypeError:
+        return None
+    if path.endswith((".pyc", ".pyo")) and os.path.isfile(path[:-1]):
+        return path[:-1]
+    return path
+
+
+def get_library_fingerprint():
+    """
+    Returns the versions of pageobjects and Selenium2Library the keywords of the base pages come from
+
+    :return: the sha1 of the Page source and the Selenium2Library version
+    :rtype: str
+    """
+    from page import Page
+    from Selenium2Library.version import VERSION
+    return "%s-%s" % (hash_file(get_source_file(Page)), VERSION)
+
+
+def hash_file(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _import_package(package_name):
+    """
+    Imports a package and all its modules
+
+    :return: the modules imported
+    :rtype: list of modules
+    """
+    package = importlib.import_module(package_name)
+    modules = [package]
+    for _, name, _ in pkgutil.walk_packages(getattr(package, "__path__", []), package_name + "."):
+        modules.append(importlib.import_module(name))
+    return modules
+
+
+def build_manifest(package_names, path):
+    """
+    Imports the packages, constructs every page class defined in them and writes the manifest
+
+    :param package_names: the names of the packages holding the pages
+    :type package_names: list of strings
+    :param path: the path of the manifest file to write
+    :type path: str
+    :return: the manifest data
+    :rtype: dict
+    """
+    from page import Page
+    from keywordmanager import KeywordManager
+    # The manifest is built by reflection, never from an older manifest ##
+    os.environ.pop("PO_MANIFEST", None)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    pages = {}
+    files = {}
+
+    def add_file(file_path, values=None):
+        if not file_path or not os.path.isfile(file_path):
+            return None
+        relative = os.path.relpath(os.path.abspath(file_path), base_dir)
+        if relative not in files:
+            stat = os.stat(file_path)
+            files[relative] = {"hash": hash_file(file_path), "mtime": stat.st_mtime, "size": stat.st_size}
+            if values is not None:
+                files[relative]["values"] = values
+        return relative
+
+    classes = []
+    for package_name in package_names:
+        for module in _import_package(package_name):
+            for value in vars(module).values():
+                if inspect.isclass(value) and issubclass(value, Page) and value is not Page \
+                        and value.__module__ == module.__name__:
+                    classes.append(value)
+
+    for clazz in sorted(classes, key=get_qualified_name):
+        page = clazz()
+        yaml_files = []
+        robot_files = []
+        # Every companion looked for, with its mtime or None if it is absent ##
+        companions = {}
+        parents = page._get_parent_pages(include_self=False, top_to_bottom=True)
+        for parent in parents + [clazz]:
+            yaml_path = page._yaml_handler._convert_classpath_to_yaml(parent)
+            if os.path.isfile(yaml_path):
+                yaml_files.append(add_file(yaml_path, _get_json_values(page._yaml_handler._load_yaml(yaml_path))))
+            robot_path = page._robot_handler._convert_classpath_to_robot(parent)
+            if os.path.isfile(robot_path):
+                robot_files.append(add_file(robot_path))
+            for companion in (yaml_path, robot_path):
+                if companion:
+                    relative = add_file(companion) or os.path.relpath(os.path.abspath(companion), base_dir)
+                    companions[relative] = files[relative]["mtime"] if relative in files else None
+            add_file(get_source_file(parent))
+        keywords = [{"alias": func_map.func_alias, "def_name": func_map.def_name,
+                     "owner": get_qualified_name(func_map.func_page)}
+                    for func_map in KeywordManager()._func_maps_by_page[page.name].values()]
+        pages[get_qualified_name(clazz)] = {
+            "name": page.name,
+            "uri": getattr(clazz, "uri", None),
+            "parents": [get_qualified_name(parent) for parent in parents],
+            "source": add_file(get_source_file(clazz)),
+            "yaml": yaml_files,
+            "robot": robot_files,
+            "companions": companions,
+            "keywords": sorted(keywords, key=lambda keyword: keyword["alias"])
+        }
+    data = {"version": MANIFEST_VERSION, "library": get_library_fingerprint(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "packages": list(package_names), "pages": pages, "files": files}
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    return data
+
+
+def _get_json_values(values):
+    """
+    Returns the yaml values if they survive a round trip through JSON unchanged, otherwise None
+    so the file is parsed at runtime(ex. yaml dates or non string keys)
+    """
+    try:
+        return values if json.loads(json.dumps(values)) == values else None
+    except (TypeError, ValueError):
+        return None
+
+
+def check_manifest(path):
+    """
+    Checks every file of a manifest against the disk
+
+    :param path: the path of the manifest file
+    :type path: str
+    :return: the paths of the files that changed or were added since the manifest was built
+    :rtype: list of strings
+    """
+    manifest = Manifest()
+    if not manifest.load(path):
+        return [path]
+    stale = set(file_path for file_path in manifest._files if manifest.get_file(file_path) is None)
+    # Companion files added after the build are not in the manifest, the handlers would not see them ##
+    for entry in manifest._pages.itervalues():
+        for companion, mtime in entry["companions"].iteritems():
+            path = manifest.resolve(companion)
+            if mtime is None and os.path.isfile(path):
+                stale.add(path)
+    return sorted(stale)
+
+
+def main(argv=None):
+    parser = optparse.OptionParser(usage="python -m pageobjects.manifest [package ...] [-o po_manifest.json] [--check]")
+    parser.add_option("-o", "--output", default="po_manifest.json", help="the manifest file to write or check")
+    parser.add_option("--check", action="store_true", help="list the files changed since the manifest was built")
+    options, package_names = parser.parse_args(argv)
+    if options.check:
+        stale = check_manifest(options.output)
+        for file_path in stale:
+            print "STALE: %s" % file_path
+        if not stale:
+            print "OK: %s is up to date" % options.output
+        return 1 if stale else 0
+    if not package_names:
+        parser.error("give the packages holding the pages")
+    sys.path.insert(0, os.getcwd())
+    data = build_manifest(package_names, options.output)
+    print "Wrote %s pages and %s files to %s" % (len(data["pages"]), len(data["files"]), options.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
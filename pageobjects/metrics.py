@@ -0,0 +1,336 @@
+from _metasingleton import MetaSingleton
+from monkeypatches import add_command_listener
+from waiter import Waiter
+import atexit
+import json
+import os
+import time
+
+# Upper bounds of the histogram buckets, the last bucket(+Inf) is implied
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+COMMANDS_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# scope -> the labels its statistics are keyed by
+_SCOPES = (("keyword", ("page", "keyword")), ("page", ("page",)), ("test", ("test",)))
+_NO_TEST = ""
+
+
+class Metrics(object):
+    __metaclass__ = MetaSingleton
+    """
+    This singleton class records the cost of every page keyword run through Page.run_keyword:
+        wall time, time spent waiting, number of WebDriver commands and time spent inside driver calls
+    The results are aggregated into histograms per keyword, page and test and written
+    as JSON and Prometheus textfile format at the end of each suite and at exit
+    It is enabled with the "metrics" option, see Page
+    The same instance is registered as a robot library listener to know the current test
+    To get the aggregated results:
+        Metrics().get_results()
+    """
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self):
+        if not self._initialized:
+            # PLACE CRITICAL CODE HERE IN ORDER TO AVOID INIT BEING CALLED TWICE
+            self._initialized = True
+            self._enabled = False
+            self._json_path = None
+            self._prometheus_path = None
+            self._frames = []
+            self._test = _NO_TEST
+            self._last_suite_written = None
+            self.reset()
+
+    def enable(self, json_path=None, prometheus_path=None):
+        """
+        Starts recording driver commands and sets where the results are written
+
+        :param json_path: the path of the JSON file, None to not write it
+        :type json_path: str
+        :param prometheus_path: the path of the Prometheus textfile, None to not write it
+        :type prometheus_path: str
+        """
+        self._json_path = json_path
+        self._prometheus_path = prometheus_path
+        if not self._enabled:
+            self._enabled = True
+            add_command_listener(self._on_command)
+            atexit.register(self.write)
+
+    def is_enabled(self):
+        return self._enabled
+
+    def start_keyword(self, page_name, keyword):
+        """
+        Starts timing a keyword, driver commands are counted for the innermost running keyword
+
+        :param page_name: the name of the page running the keyword
+        :type page_name: str
+        :param keyword: the alias of the keyword
+        :type keyword: str
+        :return: the frame to pass to end_keyword
+        :rtype: KeywordFrame
+        """
+        frame = KeywordFrame(page_name, keyword, self._test, Waiter().get_total_wait_time())
+        self._frames.append(frame)
+        return frame
+
+    def end_keyword(self, frame, passed=True):
+        """
+        Stops timing a keyword and adds it to the histograms
+
+        :param frame: the frame returned by start_keyword
+        :type frame: KeywordFrame
+        :param passed: False if the keyword failed
+        :type passed: bool
+        """
+        wall = time.time() - frame.start
+        wait = Waiter().get_total_wait_time() - frame.wait_start
+        if frame in self._frames:
+            # Frames above this one belong to keywords that never ended ##
+            del self._frames[self._frames.index(frame):]
+        values = {"page": frame.page, "keyword": frame.keyword, "test": frame.test}
+        for scope, labels in _SCOPES:
+            key = tuple(values[label] for label in labels)
+            stats = self._stats[scope].get(key, None)
+            if stats is None:
+                stats = self._stats[scope][key] = KeywordStats(labels, key)
+            stats.add(wall, wait, frame.driver_seconds, frame.commands, frame.command_counts, passed)
+
+    def _on_command(self, driver, driver_command, params, elapsed, error):
+        """
+        Command listener counting the driver commands of the innermost running keyword
+        """
+        if self._frames:
+            frame = self._frames[-1]
+        else:
+            frame = self._unattributed
+        frame.commands += 1
+        frame.driver_seconds += elapsed
+        frame.command_counts[driver_command] = frame.command_counts.get(driver_command, 0) + 1
+
+    def get_results(self):
+        """
+        Returns the aggregated results
+
+        :return: dict of scope("keyword", "page", "test") to list of statistics dicts,
+            and "unattributed" for the driver commands issued outside of a keyword
+        :rtype: dict
+        """
+        results = {}
+        for scope, labels in _SCOPES:
+            results[scope] = [stats.to_dict() for _, stats in sorted(self._stats[scope].iteritems())]
+        results["unattributed"] = {"commands": self._unattributed.commands,
+                                   "driver_seconds": self._unattributed.driver_seconds,
+                                   "command_counts": dict(self._unattributed.command_counts)}
+        return results
+
+    def format_prometheus(self):
+        """
+        Formats the histograms in the Prometheus textfile format
+
+        :return: the textfile content
+        :rtype: str
+        """
+        lines = []
+        for scope, labels in _SCOPES:
+            for field, buckets, description in (("wall_seconds", SECONDS_BUCKETS, "Wall time"),
+                                                ("wait_seconds", SECONDS_BUCKETS, "Time spent waiting"),
+                                                ("driver_seconds", SECONDS_BUCKETS, "Time spent in WebDriver calls"),
+                                                ("driver_commands", COMMANDS_BUCKETS, "WebDriver commands")):
+                name = "pageobjects_%s_%s" % (scope, field)
+                lines.append("# HELP %s %s per %s" % (name, description, scope))
+                lines.append("# TYPE %s histogram" % name)
+                for _, stats in sorted(self._stats[scope].iteritems()):
+                    histogram = getattr(stats, field)
+                    label_text = ",".join('%s="%s"' % (label, _escape_label(value))
+                                          for label, value in zip(stats.labels, stats.key))
+                    for bound, count in histogram.cumulative():
+                        lines.append('%s_bucket{%s,le="%s"} %s' % (name, label_text, bound, count))
+                    lines.append("%s_sum{%s} %r" % (name, label_text, histogram.sum))
+                    lines.append("%s_count{%s} %s" % (name, label_text, histogram.count))
+        lines.append("# HELP pageobjects_unattributed_driver_commands_total WebDriver commands outside of keywords")
+        lines.append("# TYPE pageobjects_unattributed_driver_commands_total counter")
+        lines.append("pageobjects_unattributed_driver_commands_total %s" % self._unattributed.commands)
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path=None, prometheus_path=None):
+        """
+        Writes the results, by default to the paths given to enable()
+        Files are replaced atomically so readers never see a partial file
+
+        :param json_path: the path of the JSON file
+        :type json_path: str
+        :param prometheus_path: the path of the Prometheus textfile
+        :type prometheus_path: str
+        """
+        json_path = json_path or self._json_path
+        prometheus_path = prometheus_path or self._prometheus_path
+        if json_path:
+            _write_atomic(json_path, json.dumps(self.get_results(), indent=2, sort_keys=True))
+        if prometheus_path:
+            _write_atomic(prometheus_path, self.format_prometheus())
+
+    def reset(self):
+        """
+        Clears all the recorded statistics
+        """
+        self._stats = dict((scope, {}) for scope, _ in _SCOPES)
+        self._unattributed = KeywordFrame(None, None, _NO_TEST, 0.0)
+
+##############################################################################
+# ROBOT LISTENER                                                             #
+##############################################################################
+    def start_test(self, name, attrs):
+        self._test = attrs.get("longname", name)
+
+    def end_test(self, name, attrs):
+        self._test = _NO_TEST
+
+    def end_suite(self, name, attrs):
+        # Every page library registers this listener, so each suite end is seen once per library ##
+        suite_id = (attrs.get("id", None), attrs.get("endtime", None))
+        if suite_id != self._last_suite_written:
+            self._last_suite_written = suite_id
+            self.write()
+
+
+class KeywordFrame(object):
+    """
+    This object holds a running keyword:
+    page: the name of the page
+    keyword: the alias of the keyword
+    test: the long name of the running test or ""
+    start: the time the keyword started
+    wait_start: the total wait time when the keyword started
+    commands: the number of driver commands issued
+    driver_seconds: the time spent in driver calls
+    command_counts: dict of driver command to number of times issued
+    """
+    page = None
+    keyword = None
+    test = None
+    start = None
+    wait_start = 0.0
+    commands = 0
+    driver_seconds = 0.0
+    command_counts = None
+
+    def __init__(self, page, keyword, test, wait_start):
+        self.page = page
+        self.keyword = keyword
+        self.test = test
+        self.start = time.time()
+        self.wait_start = wait_start
+        self.command_counts = {}
+
+
+class KeywordStats(object):
+    """
+    This object aggregates the keywords recorded under one key:
+    labels: the names of the key values ex. ("page", "keyword")
+    key: the key values
+    failures: number of keywords that failed
+    command_counts: dict of driver command to number of times issued
+    and a Histogram for wall_seconds, wait_seconds, driver_seconds and driver_commands
+    """
+    labels = None
+    key = None
+    failures = 0
+
+    def __init__(self, labels, key):
+        self.labels = labels
+        self.key = key
+        self.command_counts = {}
+        self.wall_seconds = Histogram(SECONDS_BUCKETS)
+        self.wait_seconds = Histogram(SECONDS_BUCKETS)
+        self.driver_seconds = Histogram(SECONDS_BUCKETS)
+        self.driver_commands = Histogram(COMMANDS_BUCKETS)
+
+    def add(self, wall, wait, driver_seconds, commands, command_counts, passed):
+        self.wall_seconds.observe(wall)
+        self.wait_seconds.observe(wait)
+        self.driver_seconds.observe(driver_seconds)
+        self.driver_commands.observe(commands)
+        if not passed:
+            self.failures += 1
+        for command, count in command_counts.iteritems():
+            self.command_counts[command] = self.command_counts.get(command, 0) + count
+
+    def to_dict(self):
+        ret = dict(zip(self.labels, self.key))
+        ret.update({"failures": self.failures,
+                    "command_counts": dict(self.command_counts),
+                    "wall_seconds": self.wall_seconds.to_dict(),
+                    "wait_seconds": self.wait_seconds.to_dict(),
+                    "driver_seconds": self.driver_seconds.to_dict(),
+                    "driver_commands": self.driver_commands.to_dict()})
+        return ret
+
+
+class Histogram(object):
+    """
+    This object counts observed values into fixed buckets
+    counts[i] is the number of values <= buckets[i] and > buckets[i - 1], the last count is for +Inf
+    """
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    def observe(self, value):
+        index = 0
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            index = len(self.buckets)
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def cumulative(self):
+        """
+        Returns the cumulative bucket counts as Prometheus expects them
+
+        :return: list of (upper bound, number of values <= bound)
+        :rtype: list of tuples
+        """
+        running = 0
+        ret = []
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            running += count
+            ret.append((bound, running))
+        return ret
+
+    def to_dict(self):
+        return {"count": self.count, "sum": self.sum, "max": self.max,
+                "buckets": [[bound, count] for bound, count in self.cumulative()]}
+
+
+def _escape_label(value):
+    """
+    Escapes a Prometheus label value
+    """
+    if isinstance(value, unicode):
+        value = value.encode("utf-8")
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _write_atomic(path, content):
+    """
+    Writes the content to a temp file next to path and renames it over path
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    temp_path = "%s.%s.tmp" % (path, os.getpid())
+    with open(temp_path, "w") as f:
+        f.write(content)
+    if os.name == "nt" and os.path.exists(path):
+        # Windows can not rename over an existing file ##
+        os.remove(path)
+    os.rename(temp_path, path)
@@ -1,18 +1,108 @@
 from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+from selenium.webdriver.remote.command import Command
+import time
 """
 This File is just so that we are able to override certain functions within Selenium2Library at runtime
 """
 
+# Commands that can not change the document, every other command bumps the document generation
+_READ_ONLY_COMMAND_NAMES = ["STATUS", "GET_CURRENT_WINDOW_HANDLE", "GET_WINDOW_HANDLES", "GET_TITLE",
+                            "GET_CURRENT_URL", "GET_PAGE_SOURCE", "FIND_ELEMENT", "FIND_ELEMENTS",
+                            "FIND_CHILD_ELEMENT", "FIND_CHILD_ELEMENTS", "GET_ELEMENT_TEXT",
+                            "GET_ELEMENT_ATTRIBUTE", "GET_ELEMENT_PROPERTY", "GET_ELEMENT_TAG_NAME",
+                            "GET_ELEMENT_VALUE_OF_CSS_PROPERTY", "IS_ELEMENT_DISPLAYED", "IS_ELEMENT_ENABLED",
+                            "IS_ELEMENT_SELECTED", "GET_ELEMENT_SIZE", "GET_ELEMENT_LOCATION",
+                            "GET_ELEMENT_RECT", "SCREENSHOT", "ELEMENT_SCREENSHOT", "GET_ALL_COOKIES",
+                            "GET_COOKIE", "GET_WINDOW_SIZE", "GET_WINDOW_POSITION", "GET_WINDOW_RECT"]
+READ_ONLY_COMMANDS = frozenset(getattr(Command, name) for name in _READ_ONLY_COMMAND_NAMES
+                               if hasattr(Command, name))
+# Commands that change which window is current without changing any document
+WINDOW_SWITCH_COMMANDS = frozenset([Command.SWITCH_TO_WINDOW])
+
+# Settings for get_current_window_info, changed with configure_window_info()
+_window_info_settings = {"batched": True, "cache_ttl": 0}
+
+# Callables told about every WebDriver command, changed with add/remove_command_listener()
+_command_listeners = []
+
+
+def configure_window_info(batched=True, cache_ttl=0):
+    """
+    Configures how the monkeypatched get_current_window_info talks to the browser
+
+    :param batched: True to fetch id, name, title and url in one script call (Defaults True)
+    :type batched: bool
+    :param cache_ttl: seconds to reuse the window info of an unchanged document, 0 disables the cache (Defaults 0)
+    :type cache_ttl: float
+    """
+    _window_info_settings["batched"] = batched
+    _window_info_settings["cache_ttl"] = cache_ttl
+
+
+def get_document_generation(driver):
+    """
+    Returns the document generation of the given driver
+    The generation is bumped by every command that may have changed the document
+
+    :param driver: the webdriver to check
+    :type driver: WebDriver
+    :return: the current document generation
+    :rtype: int
+    """
+    return getattr(driver, "_po_document_generation", 0)
+
+
+def get_content_generation(driver):
+    """
+    Returns the content generation of the given driver
+    Like the document generation, but not bumped by window switches so per-window caches survive them
+
+    :param driver: the webdriver to check
+    :type driver: WebDriver
+    :return: the current content generation
+    :rtype: int
+    """
+    return getattr(driver, "_po_content_generation", 0)
+
+
+def add_command_listener(listener):
+    """
+    Adds a listener called after every WebDriver command, including the commands of WebElements
+    The listener is called as listener(driver, driver_command, params, elapsed, error)
+    where elapsed is the seconds the command took and error the exception it raised or None
+
+    :param listener: the callable to add
+    :type listener: callable
+    """
+    if listener not in _command_listeners:
+        _command_listeners.append(listener)
+
+
+def remove_command_listener(listener):
+    """
+    Removes a listener added with add_command_listener
+
+    :param listener: the callable to remove
+    :type listener: callable
+    """
+    if listener in _command_listeners:
+        _command_listeners.remove(listener)
+
 
 def do_monkeypatches():
-    def _get_current_window_info(self):
+    """
+    Applies the patches to selenium's RemoteWebDriver, only the first call does anything
+    """
+    if getattr(RemoteWebDriver, "_po_monkeypatched", False):
+        return
+
+    def _get_window_info_separately(self):
         """
-        This is a replacement for the Selenium2Library function that is 
-        
-        This fixes Selenium2Library issue 270 
+        Gets the window info with one script call per value
+
+        This fixes Selenium2Library issue 270
         https://github.com/rtomac/robotframework-selenium2library/issues/270
         """
-
         # it's more efficient to get this data in one call to self.execute_script
         # but we're observing that under some circumstances that doesn't
         # work. Getting the values individually seems to work better.
@@ -23,9 +113,78 @@ def do_monkeypatches():
         name = self.execute_script("return window.name")
         title = self.execute_script("return document.title")
         url = self.execute_script("return document.URL")
+        return id_, name, title, url
+
+    def _get_window_info_batched(self):
+        """
+        Gets the window info in a single script call
+        Falls back to one call per value if the batched call fails
+        """
+        try:
+            values = self.execute_script("return [window.id, window.name, document.title, document.URL];")
+        except:
+            values = None
+        if not isinstance(values, list) or len(values) != 4:
+            return _get_window_info_separately(self)
+        return tuple(values)
+
+    def _get_current_window_info(self):
+        """
+        This is a replacement for the Selenium2Library function that is
+
+        This fixes Selenium2Library issue 270
+        https://github.com/rtomac/robotframework-selenium2library/issues/270
+        """
+        handle = self.current_window_handle
+        cache_ttl = _window_info_settings["cache_ttl"]
+        if cache_ttl:
+            cache = self.__dict__.setdefault("_po_window_info_cache", {})
+            cached = cache.get(handle, None)
+            if cached is not None:
+                generation, expires, info = cached
+                if generation == get_content_generation(self) and time.time() < expires:
+                    return info
+
+        generations = (get_document_generation(self), get_content_generation(self))
+        if _window_info_settings["batched"]:
+            id_, name, title, url = _get_window_info_batched(self)
+        else:
+            id_, name, title, url = _get_window_info_separately(self)
+        # The window info scripts only read, they must not invalidate the cached info of the other windows ##
+        self._po_document_generation, self._po_content_generation = generations
 
 #        id_ = id_ if id_ is not None else 'undefined'
         name, title, url = (att if att else 'undefined' for att in (name, title, url))
-        return self.current_window_handle, id_, name, title, url
-    
+        info = (handle, id_, name, title, url)
+        if cache_ttl:
+            cache[handle] = (get_content_generation(self), time.time() + cache_ttl, info)
+        return info
+
+    def _execute(self, driver_command, params=None):
+        """
+        This wraps the WebDriver execute function to keep track of the document generation
+        and to tell the command listeners about the command
+        """
+        if driver_command not in READ_ONLY_COMMANDS:
+            self._po_document_generation = get_document_generation(self) + 1
+            # S2L switches to every window to read its info, that must not invalidate the window info cache ##
+            if driver_command not in WINDOW_SWITCH_COMMANDS:
+                self._po_content_generation = get_content_generation(self) + 1
+        if not _command_listeners:
+            return _original_execute(self, driver_command, params)
+        error = None
+        start = time.time()
+        try:
+            return _original_execute(self, driver_command, params)
+        except Exception, e:
+            error = e
+            raise
+        finally:
+            elapsed = time.time() - start
+            for listener in list(_command_listeners):
+                listener(self, driver_command, params, elapsed, error)
+
+    _original_execute = RemoteWebDriver.execute
+    RemoteWebDriver.execute = _execute
     RemoteWebDriver.get_current_window_info = _get_current_window_info
+    RemoteWebDriver._po_monkeypatched = True
@@ -1,57 +1,95 @@
 from _metaflyweight import MetaFlyWeight
 from context import Context
 from exceptions import VarFileImportErrorError
-from robot.libraries.BuiltIn import BuiltIn
 import os
 import re
 import imp
 
+# Marks an option that is not set in a layer, since None is a valid option value
+_MISSING = object()
+
 
 class OptionHandler(object):
     """
-    This class is a Flyweight for the options
+    This class is a Flyweight for the options, one per page class so pages of one module keep their own options
+    Options are resolved on demand from the following layers, first match wins:
+        1. the "options" dict of the page class and its parents
+        2. robot variables (looked up live so Set Suite Variable etc. is seen)
+        3. PO_ environment vars in the local machine
+        4. the variable file given by PO_VAR_FILE
     Example:
         OptionHandler(LoginPage)
     To get options use:
         OptionHandler(LoginPage).get("ice cream",None)
     """
-#    from automationpages import Page 
+#    from automationpages import Page
     __metaclass__ = MetaFlyWeight
-    _page_instance = None
-    _opts = {}
-    
+    _NAME_PATTERN = re.compile("\$\{(.+)\}")
+    # Shared by all flyweights as these layers do not depend on the page ##
+    _normalized_names = {}
+    _var_file_opts = None
+    _var_file_path = None
+
     def __init__(self, page_inst):
         if not self._initialized:
-            self._opts = {}
-            self._page_instance = page_inst
-            self._populate_opts()
-        
-    def _populate_opts(self):
+            self._class_opts = self._get_opts_from_inherited_classes(page_inst)
+            self._initialized = True
+
+    @classmethod
+    def _get_flyweight_key(cls, page_inst):
         """
-        Pulls environment from PO_ environment file
+        Options are cached per page class, pages in the same module may set different options
         """
-        self._opts.update(self._get_opts_from_var_file())
-        self._opts.update(self._get_opts_from_env_vars())
-        if Context.in_robot():
-            self._opts.update(self._get_opts_from_robot())
-        self._update_opts_from_inherited_classes()
+        return page_inst.__class__
 
-    def _get_opts_from_robot(self):
+    def _get_opts_from_inherited_classes(self, page_inst):
         """
-        Pulls environment from PO_ environment file
+        Using the given Page object class, we create a cumulative options value based on its parent pages
+        This is done once per page class
         """
-        ret = {}
-        robot_vars = BuiltIn().get_variables()
-        for var, val in robot_vars.iteritems():
-            ret[self._normalize(var)] = val
-        return ret
+        opts = {}
+        get_parent_pages = getattr(page_inst, "_get_parent_pages", None)
+        list_of_classes = get_parent_pages(top_to_bottom=True) if get_parent_pages else []
+        for parent in list_of_classes:
+            if hasattr(parent, "options"):
+                opts.update(self._normalize(parent.options))
+        return opts
+
+    def _get_opt_from_robot(self, name):
+        """
+        Looks up a single robot variable in the current scope
+
+        :param name: the normalized option name
+        :type name: str
+        :return: the value of the variable or _MISSING
+        """
+        from robot.libraries.BuiltIn import BuiltIn
+        try:
+            return BuiltIn().get_variable_value("${%s}" % name, _MISSING)
+        except Exception:
+            return _MISSING
+
+    def _get_opt_from_env_var(self, name):
+        """
+        Looks up a single PO_ environment var in the local machine
+
+        :param name: the normalized option name
+        :type name: str
+        :return: the value of the environment var or _MISSING
+        """
+        value = os.environ.get("PO_%s" % name.upper(), None)
+        return _MISSING if value is None else value
 
-    def _get_opts_from_var_file(self):
+    @classmethod
+    def _get_opts_from_var_file(cls):
         """
         Pulls environment from PO_ environment file
+        The file is imported once per process unless PO_VAR_FILE changes
         """
-        ret = {}
         var_file_path = os.environ.get("PO_VAR_FILE", None)
+        if cls._var_file_opts is not None and cls._var_file_path == var_file_path:
+            return cls._var_file_opts
+        ret = {}
         if var_file_path:
             abs_var_file_path = os.path.abspath(var_file_path)
             try:
@@ -65,43 +103,44 @@ class OptionHandler(object):
             for vars_mod_attr_name in var_file_attrs:
                 if not vars_mod_attr_name.startswith("_"):
                     vars_file_var_value = var_file_attrs[vars_mod_attr_name]
-                    ret[self._normalize(vars_mod_attr_name)] = vars_file_var_value
-        return ret
-
-    def _get_opts_from_env_vars(self):
-        """
-        Pulls environment from PO_ environment vars in the local machine
-        """
-        ret = {}
-        for env_varname in os.environ:
-            if env_varname.startswith("PO_") and env_varname.isupper():
-                varname = env_varname[3:]
-                ret[self._normalize(varname)] = os.environ.get(env_varname)
+                    ret[cls._normalize(vars_mod_attr_name)] = vars_file_var_value
+        cls._var_file_opts = ret
+        cls._var_file_path = var_file_path
         return ret
-    
-    def _update_opts_from_inherited_classes(self):
-        """
-        Using the given Page object class, we create a cumulative options value based on its parent pages
-        """
-        list_of_classes = self._page_instance._get_parent_pages(top_to_bottom=True)
-        self.temp_options = {}
-        for clazz in list_of_classes:
-            if hasattr(clazz, "options"):
-                self.temp_options.update(clazz.options)
-        self._opts.update(self.temp_options)
 
-    def _normalize(self, opts):
+    @classmethod
+    def _normalize(cls, opts):
         """
         Convert an option keyname to lower-cased robot format, or convert
         all the keys in a dictionary to robot format.
         """
         if isinstance(opts, str) or isinstance(opts,unicode):
             name = opts.lower()
-            rmatch = re.search("\$\{(.+)\}", name)
+            rmatch = cls._NAME_PATTERN.search(name)
             return rmatch.group(1) if rmatch else name
         else:
             # We're dealing with a dict
-            return {self._normalize(key): val for (key, val) in opts.iteritems()}
+            return {cls._normalize(key): val for (key, val) in opts.iteritems()}
+
+    def _normalize_name(self, name, in_robot):
+        """
+        Normalizes an option name for lookup, memoizing the result
+        Outside of robot spaces are replaced with _
+
+        :param name: the option name as requested
+        :type name: str
+        :param in_robot: True if robot is running
+        :type in_robot: bool
+        :return: the normalized option name
+        :rtype: str
+        """
+        key = (name, in_robot)
+        try:
+            return self._normalized_names[key]
+        except KeyError:
+            normalized = self._normalize(name if in_robot else name.replace(" ", "_"))
+            self._normalized_names[key] = normalized
+            return normalized
 
     def get(self, name, default=None):
         """
@@ -113,12 +152,13 @@ class OptionHandler(object):
         :type default: any
         :return: the value of the attribute or default if not found
         """
-        ret = default
-        try:
-            if Context.in_robot():
-                ret = self._opts[self._normalize(name)]
-            else:
-                ret = self._opts[self._normalize(name.replace(" ", "_"))]
-        except KeyError:
-            pass
+        in_robot = Context.in_robot()
+        name = self._normalize_name(name, in_robot)
+        ret = self._class_opts.get(name, _MISSING)
+        if ret is _MISSING and in_robot:
+            ret = self._get_opt_from_robot(name)
+        if ret is _MISSING:
+            ret = self._get_opt_from_env_var(name)
+        if ret is _MISSING:
+            ret = self._get_opts_from_var_file().get(name, default)
         return ret
@@ -1,42 +1,249 @@
 from Selenium2Library import Selenium2Library
 from Selenium2Library.keywords import _browsermanagement
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import WebDriverException, StaleElementReferenceException
 from abstractedlogger import Logger
 from context import Context
 from robot.api.deco import keyword
 from optionhandler import OptionHandler
 from robot.libraries.BuiltIn import BuiltIn
-from exceptions import UriResolutionError
+from exceptions import UriResolutionError, RoundTripBudgetError
+from pageregistry import PageRegistry
+from _metapageregistry import MetaPageRegistry
 from yamlhandler import YAMLHandler
 from keywordmanager import KeywordManager
-from robothandler import RobotHandler
-from monkeypatches import do_monkeypatches
+from robothandler import RobotHandler, ResourceImporter
+from monkeypatches import do_monkeypatches, configure_window_info, get_document_generation, get_content_generation
+from waiter import Waiter
+from parallel import detect_worker_id, assign_worker_resource, get_worker_path
+from metrics import Metrics
+from roundtrips import RoundTripRecorder
+from sessionpool import SessionPool
+from locators import SCRIPT_STRATEGIES, JS_FIND_ELEMENTS
 from robot import utils
 from robot.utils import asserts
+from collections import OrderedDict
 import inspect
 import re
-import time
-do_monkeypatches()
+
+
+# Checks master locator visibility, readyState and the top-level location in one round trip ##
+PAGE_PROBE_SCRIPT = JS_FIND_ELEMENTS + """
+var elements = poFindElements(arguments[0], arguments[1]) || [], visible = false, location = null;
+for (var i = 0; i < elements.length && !visible; i++) { visible = poIsVisible(elements[i]); }
+try { location = window.top.location.href; } catch (e) { location = document.location.href; }
+return {found: elements.length > 0, visible: visible, readyState: document.readyState, location: location};
+"""
+
+
+# Checks that cached elements are still attached to the document in one round trip ##
+ELEMENT_ATTACHED_SCRIPT = """
+for (var i = 0; i < arguments.length; i++) {
+    if (!arguments[i] || !document.documentElement.contains(arguments[i])) { return false; }
+}
+return true;
+"""
+
+
+# Reads the state of the first element of every [key, strategy, value] request in one round trip ##
+# Keys whose strategy can not be resolved in the browser come back as {unsupported: true} ##
+BULK_STATE_SCRIPT = JS_FIND_ELEMENTS + """
+function poText(element) {
+    var text = element.innerText !== undefined ? element.innerText : element.textContent;
+    return (text || '').replace(/^\\s+|\\s+$/g, '');
+}
+var requests = arguments[0], attributes = arguments[1] || [], results = {};
+for (var i = 0; i < requests.length; i++) {
+    var key = requests[i][0], elements = null, element, state;
+    try { elements = poFindElements(requests[i][1], requests[i][2]); }
+    catch (e) { results[key] = {found: false, count: 0, error: String(e)}; continue; }
+    if (elements === null) { results[key] = {unsupported: true}; continue; }
+    if (!elements.length) { results[key] = {found: false, count: 0}; continue; }
+    element = elements[0];
+    state = {found: true, count: elements.length, tag: element.tagName.toLowerCase(), text: poText(element),
+             value: element.value === undefined ? null : element.value, visible: poIsVisible(element),
+             enabled: !element.disabled, selected: !!(element.checked || element.selected), attributes: {}};
+    for (var j = 0; j < attributes.length; j++) { state.attributes[attributes[j]] = element.getAttribute(attributes[j]); }
+    results[key] = state;
+}
+return results;
+"""
+
+# Counts in-flight XHR/fetch requests, short timers and running animations, installed once per document ##
+# Returns the counters and how long the page has been idle in milliseconds, in one round trip per poll ##
+QUIESCENCE_SCRIPT = """
+var timerThreshold = arguments[0], state = window.__pageobjects_quiescence;
+function now() { return new Date().getTime(); }
+if (!state) {
+    state = window.__pageobjects_quiescence = {requests: 0, timers: {}, timerCount: 0, lastActivity: now(),
+                                              timerThreshold: timerThreshold};
+    var touch = function () { state.lastActivity = now(); };
+    var requestDone = function () { state.requests = Math.max(state.requests - 1, 0); touch(); };
+    if (window.XMLHttpRequest) {
+        var send = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            state.requests++;
+            touch();
+            var done = false, xhr = this;
+            xhr.addEventListener('loadend', function () { if (!done) { done = true; requestDone(); } });
+            try { return send.apply(xhr, arguments); }
+            catch (e) { if (!done) { done = true; requestDone(); } throw e; }
+        };
+    }
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            var promise;
+            state.requests++;
+            touch();
+            try { promise = fetch.apply(this, arguments); }
+            catch (e) { requestDone(); throw e; }
+            return promise.then(
+                function (response) { requestDone(); return response; },
+                function (error) { requestDone(); throw error; });
+        };
+    }
+    var setTimeoutOriginal = window.setTimeout, clearTimeoutOriginal = window.clearTimeout;
+    window.setTimeout = function (callback, delay) {
+        var args = Array.prototype.slice.call(arguments), id;
+        if (typeof callback !== 'function' || (delay || 0) > state.timerThreshold) {
+            return setTimeoutOriginal.apply(window, args);
+        }
+        args[0] = function () {
+            if (state.timers[id]) { delete state.timers[id]; state.timerCount--; touch(); }
+            return callback.apply(this, arguments);
+        };
+        id = setTimeoutOriginal.apply(window, args);
+        state.timers[id] = true;
+        state.timerCount++;
+        return id;
+    };
+    window.clearTimeout = function (id) {
+        if (state.timers[id]) { delete state.timers[id]; state.timerCount--; touch(); }
+        return clearTimeoutOriginal.apply(window, arguments);
+    };
+}
+state.timerThreshold = timerThreshold;
+var animations = 0;
+if (document.getAnimations) {
+    var running = document.getAnimations();
+    for (var i = 0; i < running.length; i++) {
+        var timing = running[i].effect && running[i].effect.getComputedTiming ? running[i].effect.getComputedTiming() : {};
+        // Endless animations like spinners never finish so they do not count
+        if (running[i].playState === 'running' && timing.iterations !== Infinity) { animations++; }
+    }
+}
+if (animations || state.requests || state.timerCount || document.readyState !== 'complete') {
+    state.lastActivity = now();
+}
+return {requests: state.requests, timers: state.timerCount, animations: animations,
+        readyState: document.readyState, idle: now() - state.lastActivity};
+"""
+
+# Reads the cell texts of every row of a table in one round trip, null if the strategy is not supported ##
+TABLE_DATA_SCRIPT = JS_FIND_ELEMENTS + """
+var elements = poFindElements(arguments[0], arguments[1]), rows = [], table, trs, cells, row;
+if (elements === null) { return null; }
+if (!elements.length) { return {found: false, rows: []}; }
+table = elements[0];
+trs = table.rows || table.getElementsByTagName('tr');
+for (var i = 0; i < trs.length; i++) {
+    cells = trs[i].cells || trs[i].querySelectorAll('th, td');
+    row = [];
+    for (var j = 0; j < cells.length; j++) {
+        row.push(((cells[j].innerText !== undefined ? cells[j].innerText : cells[j].textContent) || '').replace(/^\\s+|\\s+$/g, ''));
+    }
+    rows.push(row);
+}
+return {found: true, rows: rows};
+"""
+
+
+class _PageMetaClass(MetaPageRegistry, type(Selenium2Library)):
+    """
+    Registers the pages while keeping the Selenium2Library keyword metaclass(run on failure)
+    """
+    pass
 
 
 class Page(Selenium2Library, Logger):
+    __metaclass__ = _PageMetaClass
     ROBOT_LIBRARY_SCOPE = 'TEST SUITE'
+    # Read by Selenium2Library's run on failure decorator around every keyword, must not finish the deferred setup ##
+    _already_in_keyword = False
+    # Only set by that decorator once a keyword ended, a failing first keyword would hide its error otherwise ##
+    _has_run_on_failure = False
+
     def __init__(self):
-        for base in Page.__bases__:
-            base.__init__(self)
+        # Worker must be known before any per-worker state is created ##
+        detect_worker_id()
+        # S2L and Logger setup is deferred until one of their attributes is needed(see __getattr__) ##
+        self._bases_initialized = False
         self._robot_handler = RobotHandler(self)
         self._option_handler = OptionHandler(self)
         self._yaml_handler = YAMLHandler(self)
 
-        try:
-            self.name
-        except AttributeError:
+        if getattr(self.__class__, "name", None) is None:
             self.name = self._titleize(self.__class__.__name__)
 
         # Required Attributes in options ##
         self.browser = self._option_handler.get("browser", None)
         self.baseurl = self._option_handler.get("baseurl", None)
 
+        # Patched when the library is created, so drivers from Create Webdriver get the patches too ##
+        do_monkeypatches()
+
+        # Setting Up window info lookups with OptionHandler ##
+        configure_window_info(utils.is_truthy(self._option_handler.get("window_info_batched", True)),
+                              float(self._option_handler.get("window_info_cache_ttl", 0)))
+
+        # Setting Up the opt-in WebElement cache with OptionHandler ##
+        self._element_cache_enabled = utils.is_truthy(self._option_handler.get("element_cache", False))
+        self._element_cache = {}
+        self._element_cache_stats = {"hits": 0, "misses": 0, "stale": 0}
+
+        # Setting Up the opt-in keyword metrics with OptionHandler ##
+        self._metrics = None
+        if utils.is_truthy(self._option_handler.get("metrics", False)):
+            self._metrics = Metrics()
+            self._metrics.enable(get_worker_path(self._option_handler.get("metrics_json", "po_metrics.json")),
+                                 get_worker_path(self._option_handler.get("metrics_prometheus", "po_metrics.prom")))
+            # Robot tells the metrics which test is running ##
+            self.ROBOT_LIBRARY_LISTENER = self._metrics
+
+        # Setting Up the opt-in WebDriver round trip budget with OptionHandler ##
+        self._roundtrip_budget = self._option_handler.get("roundtrip_budget", None)
+        self._roundtrip_repeat_limit = int(self._option_handler.get("roundtrip_repeat_limit", 0) or 0)
+        self._roundtrip_action = str(self._option_handler.get("roundtrip_action", "warn")).lower()
+        self._roundtrips = None
+        if self._roundtrip_budget or self._roundtrip_repeat_limit:
+            self._roundtrips = RoundTripRecorder()
+
+        if not utils.is_truthy(self._option_handler.get("lazy_page_init", True)):
+            self._initialize_bases()
+
+        if Context.in_robot():
+            Context.set_current_page("pageobjects.Page")
+        KeywordManager().add_page_methods(self)
+
+    def __getattr__(self, name):
+        """
+        Finishes the deferred Selenium2Library and Logger setup the first time one of their attributes is needed
+        Only called for attributes that are not found, so initialized pages never get here
+        """
+        if name.startswith("__") or name.startswith("ROBOT_") or self.__dict__.get("_bases_initialized", True):
+            raise AttributeError("'%s' object has no attribute '%s'" % (self.__class__.__name__, name))
+        self._initialize_bases()
+        return getattr(self, name)
+
+    def _initialize_bases(self):
+        """
+        Runs the Selenium2Library and Logger setup and applies the Selenium2Library options
+        """
+        self._bases_initialized = True
+        for base in Page.__bases__:
+            base.__init__(self)
+
         # Setting Up Optional Selenium2Library attributes with OptionHandler ##
         selenium_speed = self._option_handler.get("selenium_speed", 0)
         selenium_implicit_wait = self._option_handler.get("selenium_implicit_wait", 5)
@@ -50,10 +257,6 @@ class Page(Selenium2Library, Logger):
             self._cache = _shared_cache
         Context.set_cache(self._cache)
 
-        if Context.in_robot():
-            Context.set_current_page("pageobjects.Page")
-        KeywordManager().add_page_methods(self)
-
 ##############################################################################
 # ASSERTION METHODS                                                          #
 ##############################################################################
@@ -70,12 +273,16 @@ class Page(Selenium2Library, Logger):
         """
         # Looking for master locator to load
         master_locator = self.get_locator('master')
-        try:
-            self.wait_until_element_is_visible(master_locator, timeout)
-        except Exception, e:
-            raise Exception("PAGE LOAD ERROR: %s" % str(e))
+        strategy, value = self._yaml_handler.get_parsed_locator('master')
+        if strategy in SCRIPT_STRATEGIES:
+            current_location = self._probe_page(master_locator, strategy, value, timeout)
+        else:
+            try:
+                self.wait_until_element_is_visible(master_locator, timeout)
+            except Exception, e:
+                raise Exception("PAGE LOAD ERROR: %s" % str(e))
+            current_location = self._get_page_location()
         # Asserting that we are at the correct URL
-        current_location = self._get_page_location()
         asserts.assert_true(self.uri.lower() in current_location.lower(),
                             "Expected page uri to contain %s but it did not: %s" % (self.uri, current_location))
         return self
@@ -94,31 +301,155 @@ class Page(Selenium2Library, Logger):
         :type state: str
         :param timeout: the time to wait for current page should be(defaults to 30)
         :type timeout: int
-        :param delay: the time to sleep between each loop (defaults to 3)
+        :param delay: the maximum time to sleep between each check (defaults to 3)
         :type delay: int
         :return: current Page
         :rtype: Page
         """
-        ready = False
-        count = 1
-        while not ready:
-            if count > timeout:
-                raise Exception("JAVASCRIPT ERROR: Could not get ready state via javascript")
-            else:
-                try:
-                    # Needed a special case for the edge case of DashboardPage as Dialog Box has no DOM object ##
-                    self.driver.find_element_by_id("ftbSearchName", timeout=1)
-                    ready_state = True
-                except:
-                    try:
-                        ready_state = self.execute_javascript("return document.readyState === '%s';" % state)
-                    except:
-                        ready_state = False
-                if ready_state:
-                    ready = True
-                else:
-                    count += delay
-                    time.sleep(delay)
+        def ready_state_is_set():
+            try:
+                # Needed a special case for the edge case of DashboardPage as Dialog Box has no DOM object ##
+                self.driver.find_element_by_id("ftbSearchName", timeout=1)
+                return True
+            except:
+                return self.execute_javascript("return document.readyState === '%s';" % state)
+
+        self._wait_until(ready_state_is_set, timeout, "ready state '%s'" % state, delay,
+                         "JAVASCRIPT ERROR: Could not get ready state via javascript")
+        return self
+
+    def wait_for_page_quiescence(self, idle_time=None, timeout=30, timer_threshold=None):
+        """
+        Wait until the page has been idle for the given time: document complete, no XHR or fetch request
+        in flight, no pending timer and no running animation
+        The counting script is injected on the first check of every document, so requests started
+        before it was injected are not seen(run Install Quiescence Instrumentation right after navigating)
+        Only timers with a delay up to timer_threshold milliseconds count, longer ones are usually polling
+        idle_time and timer_threshold default to the "quiescence_idle_time"(0.5) and
+        "quiescence_timer_threshold"(1000) options
+        Example:
+        | | | Wait For Page Quiescence | idle_time=0.5 | timeout=20
+
+        :param idle_time: the time the page must stay idle (robot time string or seconds)
+        :type idle_time: str
+        :param timeout: the time to wait for the page (defaults to 30)
+        :type timeout: int
+        :param timer_threshold: the longest timer delay in milliseconds that counts as activity
+        :type timer_threshold: int
+        :return: current Page
+        :rtype: Page
+        """
+        if idle_time is None:
+            idle_time = self._option_handler.get("quiescence_idle_time", 0.5)
+        if timer_threshold is None:
+            timer_threshold = self._option_handler.get("quiescence_timer_threshold", 1000)
+        idle_ms = utils.timestr_to_secs(idle_time) * 1000
+        timer_threshold = int(timer_threshold)
+        status = {}
+
+        def page_is_quiet():
+            status.clear()
+            status.update(self.driver.execute_script(QUIESCENCE_SCRIPT, timer_threshold) or {})
+            return status.get("idle", 0) >= idle_ms
+
+        try:
+            # Polling faster than the idle time can not end the wait sooner ##
+            self._wait_until(page_is_quiet, timeout, "page quiescence '%s'" % self.name,
+                             max(idle_ms / 2000.0, 0.05))
+        except Exception, e:
+            if not status:
+                raise
+            raise Exception("PAGE LOAD ERROR: page was not idle for %s after %s: %s requests, %s timers, "
+                            "%s animations in flight, readyState '%s'"
+                            % (utils.secs_to_timestr(idle_ms / 1000.0), utils.secs_to_timestr(utils.timestr_to_secs(timeout)),
+                               status.get("requests"), status.get("timers"), status.get("animations"),
+                               status.get("readyState")))
+        return self
+
+    def install_quiescence_instrumentation(self, timer_threshold=None):
+        """
+        Injects the script counting requests, timers and animations for Wait For Page Quiescence
+        Run it right after navigating so requests started by the page are counted, running it again does nothing
+        Example:
+        | | | Go To | ${url}
+        | | | Install Quiescence Instrumentation
+
+        :param timer_threshold: the longest timer delay in milliseconds that counts as activity
+        :type timer_threshold: int
+        :return: current Page
+        :rtype: Page
+        """
+        if timer_threshold is None:
+            timer_threshold = self._option_handler.get("quiescence_timer_threshold", 1000)
+        self.driver.execute_script(QUIESCENCE_SCRIPT, int(timer_threshold))
+        return self
+
+    def wait_until_page_condition(self, condition, timeout=30, delay=1):
+        """
+        Wait until the given javascript condition returns a truthy value
+        Polls quickly at first and backs off up to the given delay, returning as soon as the condition holds
+        Example:
+        | | | Wait until page condition | return document.querySelectorAll('.row').length > 3
+
+        :param condition: javascript returning the condition or a python callable
+        :type condition: str
+        :param timeout: the time to wait for the condition (defaults to 30)
+        :type timeout: int
+        :param delay: the maximum time to sleep between each check (defaults to 1)
+        :type delay: int
+        :return: current Page
+        :rtype: Page
+        """
+        if callable(condition):
+            check = condition
+            description = getattr(condition, "__name__", "page condition")
+        else:
+            script = condition if re.search(r"\breturn\b", condition) else "return %s;" % condition
+            description = "page condition '%s'" % condition
+
+            def check():
+                return self.execute_javascript(script)
+        self._wait_until(check, timeout, description, delay)
+        return self
+
+    def log_resource_import_report(self):
+        """
+        Logs, for every suite so far, how long importing the .robot resources of the pages took
+        and how many imports were skipped because the suite already had the resource
+        Example:
+        | | ${report}= | Log resource import report
+
+        :return: the report
+        :rtype: str
+        """
+        report = ResourceImporter().format_report()
+        self.log(report, "INFO", is_console=False)
+        return report
+
+    def get_element_cache_stats(self):
+        """
+        Returns the counters of the WebElement cache (enabled with the "element_cache" option)
+            hits: elements reused from the cache
+            misses: elements found with a new find_element call
+            stale: cached elements found again because the document changed or they were no longer attached
+        Example:
+        | | ${stats}= | Get element cache stats
+
+        :return: dict of counter name to count
+        :rtype: dict
+        """
+        return dict(self._element_cache_stats)
+
+    def clear_element_cache(self):
+        """
+        Forgets all the WebElements cached for this page
+        Example:
+        | | | Clear element cache
+
+        :return: current Page
+        :rtype: Page
+        """
+        self._element_cache.clear()
         return self
 
     def get_locator(self, key):
@@ -135,6 +466,89 @@ class Page(Selenium2Library, Logger):
             raise Exception("LOCATOR ERROR: Found locator with key: '%s' with no value assigned in file '%s.yaml'"%(key,self.__class__.__name__))
         return locator
 
+    def get_texts_for_locators(self, *keys):
+        """
+        Returns the text of the elements of the given locator keys or locator groups, read in one script call
+        Missing locators and elements are reported per key with a warning and a None text instead of failing
+        Example:
+        | | | ${texts}= | Get Texts For Locators | login form | title
+
+        :param keys: the yaml keys of locators or locator groups
+        :type keys: str
+        :return: dict of locator key to text, in the order of the keys
+        :rtype: OrderedDict
+        """
+        texts = OrderedDict()
+        for key, state in self._get_element_states(keys).iteritems():
+            texts[key] = state.get("text", None)
+        return texts
+
+    def get_attributes_for_locators(self, attribute, *keys):
+        """
+        Returns an attribute of the elements of the given locator keys or locator groups, read in one script call
+        Missing locators and elements are reported per key with a warning and a None value instead of failing
+        Example:
+        | | | ${hrefs}= | Get Attributes For Locators | href | menu
+
+        :param attribute: the name of the attribute to read
+        :type attribute: str
+        :param keys: the yaml keys of locators or locator groups
+        :type keys: str
+        :return: dict of locator key to attribute value, in the order of the keys
+        :rtype: OrderedDict
+        """
+        values = OrderedDict()
+        for key, state in self._get_element_states(keys, [attribute]).iteritems():
+            values[key] = state.get("attributes", {}).get(attribute, None)
+        return values
+
+    def get_element_states(self, *keys):
+        """
+        Returns the state of the elements of the given locator keys or locator groups, read in one script call
+        Each state holds: found, count(number of matching elements), tag, text, value, visible, enabled and selected
+        of the first matching element. Missing locators and elements have found set to False and an error
+        Example:
+        | | | ${states}= | Get Element States | login form
+        | | | Should Be True | ${states['login_form.user']['visible']}
+
+        :param keys: the yaml keys of locators or locator groups
+        :type keys: str
+        :return: dict of locator key to state dict, in the order of the keys
+        :rtype: OrderedDict
+        """
+        return self._get_element_states(keys)
+
+    def get_table_data(self, key):
+        """
+        Returns the cell texts of every row of the table of the given locator key, read in one script call
+        Example:
+        | | | ${rows}= | Get Table Data | results table
+        | | | Should Be Equal | ${rows[1][0]} | First Result
+
+        :param key: the yaml key of the table locator
+        :type key: str
+        :return: list of rows, each a list of cell texts
+        :rtype: list of lists
+        :raise Exception: if the table is not found
+        """
+        locator = self.get_locator(key)
+        strategy, value = self._yaml_handler.get_parsed_locator(key)
+        result = None
+        if strategy in SCRIPT_STRATEGIES:
+            result = self.driver.execute_script(TABLE_DATA_SCRIPT, strategy, value)
+        if result is None:
+            # Strategy not supported by the script, read the rows with Selenium2Library ##
+            tables = self._element_find(locator, True, False)
+            if tables is None:
+                result = {"found": False}
+            else:
+                rows = tables.find_elements_by_xpath(".//tr")
+                result = {"found": True, "rows": [[cell.text for cell in row.find_elements_by_xpath("./th|./td")]
+                                                  for row in rows]}
+        if not result.get("found"):
+            raise Exception("LOCATOR ERROR: Table locator '%s' did not match any elements" % locator)
+        return result["rows"]
+
     def select_window_when_visible(self, win_name, timeout=30, delay=5):
         """
         This keyword will try to select a given window based on the
@@ -146,33 +560,122 @@ class Page(Selenium2Library, Logger):
         :type win_name: str
         :param timeout: the time to wait for current page should be(defaults to 30)
         :type timeout: int
-        :param delay: the time to sleep between each loop (defaults to 5)
+        :param delay: the maximum time to sleep between each check (defaults to 5)
         :type delay: int
         :return: current Page
         :rtype: Page
         """
 
-        timeout = utils.timestr_to_secs(timeout)
-        maxtime = time.time() + timeout
-        visible = False
-        while not visible:
-            try:
-                self.register_keyword_to_run_on_failure("Nothing")
-                self.select_window(win_name)
-                visible = True
-            except:
-                if time.time() > maxtime:
-                    self.register_keyword_to_run_on_failure("Capture Page Screenshot")
-                    raise Exception('Window, %s, did not appear' % win_name)
-                else:
-                    time.sleep(delay)
-        self.register_keyword_to_run_on_failure("Capture Page Screenshot")
+        if getattr(self.driver, "_po_window_handle_snapshot", None) is not None:
+            return self.select_new_window(win_name, timeout)
+
+        def window_is_selected():
+            self.select_window(win_name)
+            return True
+
+        self.register_keyword_to_run_on_failure("Nothing")
+        try:
+            self._wait_until(window_is_selected, timeout, "window '%s'" % win_name, delay,
+                             'Window, %s, did not appear' % win_name)
+        finally:
+            self.register_keyword_to_run_on_failure("Capture Page Screenshot")
+        return self
+
+    def snapshot_window_handles(self):
+        """
+        Remembers the open windows of the browser so the window opened by the next action can be found
+        Run it before the action that opens the window, then use Select New Window or Select Window When Visible
+        Example:
+        | | | Snapshot Window Handles
+        | | | Click Link | Help
+        | | | Select New Window | title=Help
+
+        :return: current Page
+        :rtype: Page
+        """
+        self.driver._po_window_handle_snapshot = list(self.driver.window_handles)
+        return self
+
+    def select_new_window(self, win_name=None, timeout=30):
+        """
+        Selects the window opened since Snapshot Window Handles
+        Only the list of window handles is polled, the window is selected as soon as it appears.
+        A single new window is selected without looking at it, win_name is only used to tell several new windows
+        apart and is matched like Select Window: "name=", "title=" or "url=" prefixes or the handle, name or title
+        The original window stays selected while no new window matches.
+        Example:
+        | | | Select New Window | title=Help | timeout=10
+
+        :param win_name: the window to select when several windows were opened (Defaults None)
+        :type win_name: str
+        :param timeout: the time to wait for the window (defaults to 30)
+        :type timeout: int
+        :return: current Page
+        :rtype: Page
+        :raise Exception: if no snapshot was taken or the window does not appear within the timeout
+        """
+        driver = self.driver
+        snapshot = getattr(driver, "_po_window_handle_snapshot", None)
+        if snapshot is None:
+            raise Exception("WINDOW ERROR: Snapshot Window Handles must be run before the window is opened")
+        snapshot = set(snapshot)
+        original_handle = driver.current_window_handle
+
+        def new_window_is_selected():
+            candidates = [handle for handle in driver.window_handles if handle not in snapshot]
+            if not candidates:
+                return False
+            if len(candidates) == 1:
+                if driver.current_window_handle != candidates[0]:
+                    driver.switch_to_window(candidates[0])
+                return True
+            if win_name is None:
+                # Ends the wait, polling longer can not tell the windows apart ##
+                return candidates
+            for handle in candidates:
+                if self._window_matches(handle, win_name):
+                    return True
+            driver.switch_to_window(original_handle)
+            return False
+
+        selected = None
+        try:
+            selected = self._wait_until(new_window_is_selected, timeout, "new window '%s'" % win_name, 0.5,
+                                        "Window, %s, did not appear" % (win_name or "new window"))
+        finally:
+            driver._po_window_handle_snapshot = None
+            # A check that failed half way may have left another window selected ##
+            if selected is not True and driver.current_window_handle != original_handle:
+                driver.switch_to_window(original_handle)
+        if isinstance(selected, list):
+            raise Exception("WINDOW ERROR: %s windows were opened, give the window name to select" % len(selected))
         return self
 
 ##############################################################################
 # PRIVATE PYTHON METHODS                                                     #
 ##############################################################################
-    def _titleize(self, string):
+    def _window_matches(self, handle, win_name):
+        """
+        Switches to the window and checks its handle, name, title or url against win_name like Select Window
+
+        :param handle: the handle of the window
+        :type handle: str
+        :param win_name: the window to match, with an optional "name=", "title=" or "url=" prefix
+        :type win_name: str
+        :return: True if the window matches
+        :rtype: bool
+        """
+        self.driver.switch_to_window(handle)
+        _, _, name, title, url = self.driver.get_current_window_info()
+        strategy, separator, value = win_name.partition("=")
+        strategy = strategy.strip().lower()
+        # Compared like Selenium2Library's WindowManager ##
+        if separator and strategy in ("name", "title", "url"):
+            return {"name": name, "title": title, "url": url}[strategy].strip().lower() == value.strip().lower()
+        return win_name == handle or win_name.lower() in (name.strip().lower(), title.strip().lower())
+
+    @staticmethod
+    def _titleize(string):
         """
         Converts camel case to title case
 
@@ -189,7 +692,7 @@ class Page(Selenium2Library, Logger):
 
         :param timeout: the time duration to wait till failing(Defaults 30)
         :type timeout: int
-        :param delay: the time to wait between each check (Defaults 3)
+        :param delay: the maximum time to wait between each check (Defaults 3)
         :type delay: int
         :return: current url
         :rtype: str
@@ -199,20 +702,148 @@ class Page(Selenium2Library, Logger):
         # 'func' may depend on it not changing. This bit of javascript should
         # give us the URI of the root page
         self.wait_for_ready_state("complete")
-        getlocation = False
-        current_location = None
-        count = 1
-        while not getlocation:
-            if count > timeout:
-                raise Exception("JAVASCRIPT ERROR: Could not get url value via javascript")
+        return self._wait_until(lambda: self.execute_javascript("return document.location.href;"),
+                                timeout, "page location", delay,
+                                "JAVASCRIPT ERROR: Could not get url value via javascript")
+
+    def _probe_page(self, master_locator, strategy, value, timeout=30):
+        """
+        Waits until the master locator is visible, the document is complete and the location is available
+        All three are checked by one injected script per poll
+
+        :param master_locator: the master locator of the page
+        :type master_locator: str
+        :param strategy: the strategy of the master locator
+        :type strategy: str
+        :param value: the value of the master locator
+        :type value: str
+        :param timeout: the time to wait for the page (Defaults 30)
+        :type timeout: int
+        :return: current url of the top-level page
+        :rtype: str
+        :raise Exception: PAGE LOAD ERROR naming the condition that was not met
+        """
+        probe = {}
+
+        def page_is_loaded():
+            probe.clear()
+            probe.update(self.driver.execute_script(PAGE_PROBE_SCRIPT, strategy, value) or {})
+            return probe.get("visible") and probe.get("readyState") == "complete" and probe.get("location")
+
+        try:
+            self._wait_until(page_is_loaded, timeout, "page probe '%s'" % self.name)
+        except Exception, e:
+            if not probe:
+                reason = str(e)
+            elif not probe.get("found"):
+                reason = "Element locator '%s' did not match any elements" % master_locator
+            elif not probe.get("visible"):
+                reason = "Element '%s' was not visible" % master_locator
+            elif probe.get("readyState") != "complete":
+                reason = "Document readyState was '%s' instead of 'complete'" % probe.get("readyState")
             else:
-                current_location = self.execute_javascript("return document.location.href;")
-                if current_location is not None:
-                    getlocation = True
-                else:
-                    count += delay
-                    time.sleep(delay)
-        return current_location
+                reason = "Could not get url value via javascript"
+            raise Exception("PAGE LOAD ERROR: %s after %s" % (reason, utils.secs_to_timestr(utils.timestr_to_secs(timeout))))
+        return probe["location"]
+
+    def _wait_until(self, condition, timeout, description, delay=1, message=None):
+        """
+        Polls the condition with the shared Waiter and logs how long the wait took
+
+        :param condition: callable polled until it returns a truthy value
+        :type condition: callable
+        :param timeout: the time to wait before failing (robot time string or seconds)
+        :type timeout: str
+        :param description: the name the wait is recorded under
+        :type description: str
+        :param delay: the maximum time to sleep between polls (robot time string or seconds)
+        :type delay: str
+        :param message: the error message if the wait times out
+        :type message: str
+        :return: the truthy value returned by the condition
+        :raise WaitTimeoutError: if the condition is not met within the timeout
+        """
+        waiter = Waiter()
+        record = None
+        last_record = waiter.get_last_record()
+        try:
+            return waiter.wait_until(condition, utils.timestr_to_secs(timeout), description, message,
+                                     max_delay=utils.timestr_to_secs(delay))
+        finally:
+            # No new record if the wait failed before polling(ex. a bad timeout) ##
+            if waiter.get_last_record() is not last_record:
+                record = waiter.get_last_record()
+            if record is not None:
+                self.log("WAIT: %s took %.3f seconds over %d polls", "DEBUG", is_console=False,
+                         args=(description, record.elapsed, record.polls))
+
+    def _get_element_states(self, keys, attributes=()):
+        """
+        Reads the state of the elements of the given locator keys or locator groups
+        Every locator the injected script can resolve is read in one round trip,
+        other strategies(ex. dom, jquery) are read with Selenium2Library
+
+        :param keys: the yaml keys of locators or locator groups, groups are expanded to their locators
+        :type keys: list of strings
+        :param attributes: the attributes to read from each element
+        :type attributes: list of strings
+        :return: dict of locator key to state dict, in the order of the keys
+        :rtype: OrderedDict
+        """
+        states = OrderedDict()
+        requests = []
+        for key in keys:
+            if self._yaml_handler.is_locator_group(key):
+                names = sorted(self._yaml_handler.get_locator_group(key))
+            else:
+                names = [key]
+            for name in names:
+                try:
+                    strategy, value = self._yaml_handler.get_parsed_locator(name)
+                except Exception, e:
+                    states[name] = {"found": False, "count": 0, "error": str(e)}
+                    continue
+                states[name] = None
+                requests.append([name, strategy, value])
+
+        script_requests = [request for request in requests if request[1] in SCRIPT_STRATEGIES]
+        results = {}
+        if script_requests:
+            results = self.driver.execute_script(BULK_STATE_SCRIPT, script_requests, list(attributes)) or {}
+        for name, strategy, value in requests:
+            state = results.get(name, None)
+            if state is None or state.get("unsupported"):
+                state = self._get_element_state(self._yaml_handler.get_locator(name), attributes)
+            states[name] = state
+
+        for name, state in states.iteritems():
+            if not state.get("found"):
+                reason = state.get("error", None) or "Element locator did not match any elements"
+                self.log("LOCATOR WARNING: locator key '%s': %s" % (name, reason), "WARN")
+        return states
+
+    def _get_element_state(self, locator, attributes=()):
+        """
+        Reads the state of the element of a locator with Selenium2Library, one round trip per value
+
+        :param locator: the locator of the element
+        :type locator: str
+        :param attributes: the attributes to read from the element
+        :type attributes: list of strings
+        :return: the state dict(see get_element_states)
+        :rtype: dict
+        """
+        try:
+            elements = self._element_find(locator, False, False)
+        except Exception, e:
+            return {"found": False, "count": 0, "error": str(e)}
+        if not elements:
+            return {"found": False, "count": 0}
+        element = elements[0]
+        return {"found": True, "count": len(elements), "tag": element.tag_name, "text": element.text,
+                "value": element.get_attribute("value"), "visible": element.is_displayed(),
+                "enabled": element.is_enabled(), "selected": element.is_selected(),
+                "attributes": dict((attribute, element.get_attribute(attribute)) for attribute in attributes)}
 
     def _has_locator(self, name):
         """
@@ -223,11 +854,7 @@ class Page(Selenium2Library, Logger):
         :return: True if exist
         :rtype: bool
         """
-        try:
-            self.get_locator(name)
-            return True
-        except Exception:
-            return False
+        return self._yaml_handler.has_locator(name)
 
     def _element_is_visible(self, locator_type, locator):
         """
@@ -244,6 +871,58 @@ class Page(Selenium2Library, Logger):
         webelement = self.driver.find_element(locator_type, locator)
         return webelement.is_displayed()
 
+    def _element_find(self, locator, first_only, required, tag=None):
+        """
+        Override Selenium2Library's _element_find to reuse WebElements when the "element_cache" option is set
+        Cached elements are reused while the document generation of the driver is unchanged(every command that
+        may change the document, ex. clicks, typing, scripts or navigation, makes them stale) and one script call
+        confirms they are still attached, so elements the page removed on its own are found again
+        Presence checks and waits(required=False) are never answered from the cache
+        """
+        if not self._element_cache_enabled or not required or not isinstance(locator, basestring):
+            return super(Page, self)._element_find(locator, first_only, required, tag)
+        driver = self.driver
+        key = (locator, first_only, tag)
+        cached = self._element_cache.get(key, None)
+        if cached is not None:
+            cached_driver, cached_generation, elements = cached
+            if cached_driver is driver and cached_generation == get_document_generation(driver) \
+                    and self._elements_are_attached(driver, elements):
+                self._element_cache_stats["hits"] += 1
+                return elements
+            self._element_cache_stats["stale"] += 1
+            # The document may have changed so every cached element is stale ##
+            self._element_cache.clear()
+        else:
+            self._element_cache_stats["misses"] += 1
+        elements = super(Page, self)._element_find(locator, first_only, required, tag)
+        if elements:
+            # Finding elements is read only so the generation is still the one the elements belong to ##
+            self._element_cache[key] = (driver, get_document_generation(driver), elements)
+        return elements
+
+    @staticmethod
+    def _elements_are_attached(driver, elements):
+        """
+        Checks that the cached elements are still attached to the document, in one script call
+
+        :param driver: the webdriver the elements were found with
+        :type driver: WebDriver
+        :param elements: the element or list of elements from the cache
+        :type elements: WebElement or list of WebElements
+        :return: True if every element is still attached
+        :rtype: bool
+        """
+        generations = (get_document_generation(driver), get_content_generation(driver))
+        try:
+            return driver.execute_script(ELEMENT_ATTACHED_SCRIPT,
+                                         *(elements if isinstance(elements, list) else [elements])) is True
+        except StaleElementReferenceException:
+            return False
+        finally:
+            # The check only reads, it must not make the other cached elements stale ##
+            driver._po_document_generation, driver._po_content_generation = generations
+
     def _get_parent_pages(self, include_self=True, top_to_bottom=False, include_top=False):
         """
         This method gets the page hierarchy of all parent pages
@@ -337,14 +1016,29 @@ class Page(Selenium2Library, Logger):
 
         func_mapping = KeywordManager().get_meth_mapping_from_robot_alias(self, name)
         meth = func_mapping.func
+        # Keywords are recorded under their alias so embedded arguments do not split them ##
+        metrics_frame = self._metrics.start_keyword(self.name, func_mapping.func_alias) if self._metrics else None
+        roundtrip_record = self._roundtrips.start_keyword(self.name, func_mapping.func_alias) if self._roundtrips else None
+        passed = False
         try:
-            if "${" in func_mapping.func_alias:
-                args = self._parse_embedded_args(name, func_mapping.func_alias)
-            ret = meth(self, *args, **kwargs)
+            try:
+                if func_mapping.arg_matcher is not None:
+                    args = func_mapping.arg_matcher.get_args(name, args)
+                ret = meth(self, *args, **kwargs)
+            finally:
+                if roundtrip_record is not None:
+                    self._roundtrips.end_keyword(roundtrip_record)
+            # Checked once the keyword ended, a failed check fails the keyword ##
+            if roundtrip_record is not None:
+                self._check_round_trips(roundtrip_record)
+            passed = True
         except Exception, e:
             Context.set_current_page("automationpages.Page")
             # Pass up the stack, so we see complete stack trace in Robot trace logs
             BuiltIn().fail(str(e))
+        finally:
+            if metrics_frame is not None:
+                self._metrics.end_keyword(metrics_frame, passed)
 
         if isinstance(ret, Page):
             libnames = Context.get_libraries()
@@ -354,18 +1048,54 @@ class Page(Selenium2Library, Logger):
                 if names.split(".")[-1:][0] == classname:
                     Context.set_current_page(names)
 
-        if ret is None:
-            func = meth.__name__
-            if func in Selenium2Library.__dict__.values():
-                ret = self
-            else:
-                for base in Selenium2Library.__bases__:
-                    if func in base.__dict__.values():
-                        ret = self
-                        break
+        if ret is None and func_mapping.returns_page:
+            ret = self
 
         return ret
     
+    def _get_round_trip_budget(self, keyword):
+        """
+        Returns the round trip budget of a keyword from the "roundtrip_budget" option
+        The option is a number for all the keywords of the page or a dict of keyword alias to number,
+        where the "default" key applies to the keywords not listed
+
+        :param keyword: the alias of the keyword
+        :type keyword: str
+        :return: the maximum number of round trips or None for no budget
+        :rtype: int
+        """
+        budget = self._roundtrip_budget
+        if isinstance(budget, dict):
+            normalized = KeywordManager.normalize(keyword)
+            budget = next((value for key, value in budget.iteritems() if KeywordManager.normalize(key) == normalized),
+                          budget.get("default", None))
+        return int(budget) if budget else None
+
+    def _check_round_trips(self, record):
+        """
+        Warns or fails(the "roundtrip_action" option, Defaults "warn") when the keyword of the record
+        made more round trips than its budget or repeated the same command more than "roundtrip_repeat_limit" times
+
+        :param record: the round trips of the keyword
+        :type record: RoundTripRecord
+        :raise RoundTripBudgetError: if the action is "fail" and a check failed
+        """
+        problems = []
+        budget = self._get_round_trip_budget(record.keyword)
+        if budget and record.count > budget:
+            problems.append("ROUND TRIP ERROR: keyword '%s' on page '%s' made %s WebDriver round trips, the budget is %s"
+                            % (record.keyword, record.page, record.count, budget))
+        if self._roundtrip_repeat_limit:
+            for (command, params), count in record.get_repeats(self._roundtrip_repeat_limit):
+                problems.append("ROUND TRIP ERROR: keyword '%s' on page '%s' repeated '%s' %s times with params %s"
+                                % (record.keyword, record.page, command, count, params[:200]))
+        if not problems:
+            return
+        if self._roundtrip_action == "fail":
+            raise RoundTripBudgetError("\n".join(problems))
+        for problem in problems:
+            self.log(problem, "WARN")
+
     def get_keyword_documentation(self, kwname):
         """
         RF Dynamic API hook implementation that exposes keyword documentation to the libdoc tool
@@ -385,11 +1115,7 @@ class Page(Selenium2Library, Logger):
             All keywords listed in the Selenium2Library documentation are stored within class Page
             """
             return docstring + s2l_link
-        func_mapping = KeywordManager().get_meth_mapping_from_robot_alias(self, kwname)
-        kw = func_mapping.func
-        docstring = kw.__doc__ if kw.__doc__ else ''
-        docstring = re.sub(r'(wrapper)', r'*\1*', docstring, flags=re.I)
-        return docstring
+        return KeywordManager().get_keyword_documentation(self, kwname)
 
     def get_keyword_arguments(self, kwname):
         """
@@ -398,63 +1124,7 @@ class Page(Selenium2Library, Logger):
         :param kwname: a keyword name
         :return: a list of strings describing the argspec
         """
-        func_mapping = KeywordManager().get_meth_mapping_from_robot_alias(self, kwname)
-        kw = func_mapping.func
-        if kw:
-            args, varargs, keywords, defaults = inspect.getargspec(kw)
-            defaults = dict(zip(args[-len(defaults):], defaults)) if defaults else {}
-            arglist = []
-            for arg in args:
-                if arg != 'self':
-                    argstring = arg
-                    if arg in defaults:
-                        argstring += '=%s' % defaults[arg]
-                    arglist.append(argstring)
-            if varargs:
-                arglist.append('*args')
-            if keywords:
-                arglist.append('**keywords')
-            if "${" in func_mapping.func_alias:
-                arglist.remove('pagename')
-            return arglist
-        else:
-            return ['*args']
-
-    def _parse_embedded_args(self, robot_input, func):
-        """
-        This method parses the given input for embedded arguments("${...}") using the base function
-        Currently replaces any instance of ${pagename} with the name of the given page(page().name)
-
-        :param robot_input: the method given by robot
-        :type robot_input: str
-        :param func: the name of the function alias
-        :type func: str
-        :return: list of arguments
-        :rtype: list of values
-        """
-        args = []
-        if "${" not in func:
-            return args
-        input_split = robot_input.split(" ")
-        func_split = func.split(" ")
-        input_index = 0
-        func_index = 0
-        for func_part in func_split:
-            if "${" in func_part:
-                temp_args = ""
-                term_word = ""
-                if func_index+1 < len(func_split):
-                    term_word = func_split[func_index+1]
-                while input_index < len(input_split) and input_split[input_index] != term_word:
-                    temp_args = "%s %s" % (temp_args, input_split[input_index])
-                    input_index += 1
-                if temp_args == "":
-                    raise Exception("ERROR: No args found for argument '%s' in method '%s'" % (func_part, func))
-                args.append(temp_args.strip())
-            else:
-                input_index += 1
-            func_index += 1
-        return args
+        return KeywordManager().get_keyword_arguments(self, kwname)
 
     def _generic_make_browser(self, webdriver_type, desired_cap_type, remote_url, desired_caps):
         """
@@ -471,13 +1141,25 @@ class Page(Selenium2Library, Logger):
     def _make_browser(self, browser_name, desired_capabilities=None, profile_dir=None, remote=None):
         """
         Overrides make browser in Selenium2Library
+        When running in parallel each worker gets its own remote url from the "worker_remote_urls" option
+        With the "session_pool" option set browsers are reused from the SessionPool instead of started
         """
+        if not remote:
+            remote = assign_worker_resource(self._option_handler.get("worker_remote_urls", None))
         creation_func = self._get_browser_creation_function(browser_name)
 
         if not creation_func:
             raise ValueError(browser_name + " is not a supported browser.")
 
-        browser = creation_func(remote, desired_capabilities, profile_dir)
+        if utils.is_truthy(self._option_handler.get("session_pool", False)):
+            pool = SessionPool()
+            pool.configure(self._option_handler.get("session_pool_max_age", None),
+                           self._option_handler.get("session_pool_max_uses", None),
+                           self._option_handler.get("session_pool_max_idle", None))
+            browser = pool.acquire(SessionPool.make_key(browser_name, desired_capabilities, profile_dir, remote),
+                                   lambda: creation_func(remote, desired_capabilities, profile_dir))
+        else:
+            browser = creation_func(remote, desired_capabilities, profile_dir)
         browser.set_speed(self._speed_in_secs)
         browser.set_script_timeout(self._timeout_in_secs)
         browser.implicitly_wait(self._implicit_wait_in_secs)
@@ -493,23 +1175,12 @@ class Page(Selenium2Library, Logger):
         :type pagename: str
         :return: the Page object for that page
         :rtype: Page
-        :raises Exception: IF url of page is not resolvable
+        :raises PageNotFoundError: IF no page is registered with the given name
+        :raises UriResolutionError: IF url of page is not resolvable
         """
         self.log("OPENING BROWSER TO %s" % pagename, is_console=False)
-        resolved_url = ""
-        pages = Page()._get_child_pages(include_self=False)
-        new_page = None
-        for page in pages:
-            if hasattr(page, "name"):
-                page_name = page.name
-                if page_name == pagename:
-                    new_page = page()
-                    resolved_url = new_page._resolve_url()
-                    break
-                else:
-                    continue
-        if resolved_url == "":
-            raise Exception("RESOLVED URL NOT FOUND")
+        new_page = Context.get_page_instance(PageRegistry().get_page_class(pagename))
+        resolved_url = new_page._resolve_url()
 
         self.open_browser(resolved_url, self.browser)
         self.maximize_browser_window()
@@ -527,23 +1198,12 @@ class Page(Selenium2Library, Logger):
         :type pagename: str
         :return: the Page object for that page
         :rtype: Page
-        :raises Exception: IF url of page is not resolvable
+        :raises PageNotFoundError: IF no page is registered with the given name
+        :raises UriResolutionError: IF url of page is not resolvable
         """
         self.log("GOING TO %s" % pagename, is_console=False)
-        resolved_url = ""
-        pages = Page()._get_child_pages(include_self=False)
-        new_page = None
-        for page in pages:
-            if hasattr(page, "name"):
-                page_name = page.name
-                if page_name == pagename:
-                    new_page = page()
-                    resolved_url = new_page._resolve_url()
-                    break
-                else:
-                    continue
-        if resolved_url == "":
-            raise Exception("RESOLVED URL NOT FOUND")
+        new_page = Context.get_page_instance(PageRegistry().get_page_class(pagename))
+        resolved_url = new_page._resolve_url()
         try:
             self.go_to(resolved_url)
         except:
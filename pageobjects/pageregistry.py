@@ -0,0 +1,68 @@
+from _metasingleton import MetaSingleton
+from exceptions import PageNotFoundError
+import difflib
+
+
+class PageRegistry(object):
+    __metaclass__ = MetaSingleton
+    """
+    This singleton class maps robot page names to page classes
+    Pages are registered automatically by MetaPageRegistry when they are defined
+    To get a page class by name use:
+        PageRegistry().get_page_class("Login Page")
+    To get a list of all registered page names:
+        PageRegistry().get_page_names()
+    """
+    def __init__(self):
+        if not self._initialized:
+            # PLACE CRITICAL CODE HERE IN ORDER TO AVOID INIT BEING CALLED TWICE
+            self._initialized = True
+            self._pages_by_name = {}
+
+    def register(self, clazz):
+        """
+        Adds the given page class to the registry under its robot page name
+        The name is the "name" attribute of the class, otherwise the titleized class name
+        If the name is already taken the first registered page wins (parents are defined before children)
+        unless it is a redefinition of the same class (ex. module reload)
+
+        :param clazz: the page class to register
+        :type clazz: class
+        :return: the name the page was registered under
+        :rtype: str
+        """
+        name = getattr(clazz, "name", None)
+        if not isinstance(name, basestring):
+            name = clazz._titleize(clazz.__name__)
+        existing = self._pages_by_name.get(name, None)
+        if existing is None or (existing.__module__ == clazz.__module__ and existing.__name__ == clazz.__name__):
+            self._pages_by_name[name] = clazz
+        return name
+
+    def get_page_class(self, name):
+        """
+        Returns the page class registered under the given robot page name
+
+        :param name: the name of the page ex. "Login Page"
+        :type name: str
+        :return: the page class
+        :rtype: class
+        :raise PageNotFoundError: if no page is registered with that name
+        """
+        try:
+            return self._pages_by_name[name]
+        except KeyError:
+            near_misses = difflib.get_close_matches(name, self._pages_by_name.keys(), n=3, cutoff=0.6)
+            message = "PAGE ERROR: No page found with name '%s'." % name
+            if near_misses:
+                message += " Did you mean: %s?" % ", ".join("'%s'" % miss for miss in near_misses)
+            raise PageNotFoundError(message)
+
+    def get_page_names(self):
+        """
+        Returns all registered page names
+
+        :return: list of page names
+        :rtype: list of strings
+        """
+        return self._pages_by_name.keys()
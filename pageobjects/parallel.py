@@ -0,0 +1,105 @@
+"""
+This File holds the helpers for running page objects in parallel worker processes (ex. pabot)
+A worker is identified by the PO_WORKER_ID environment var, by pabot's ${PABOTEXECUTIONPOOLID}
+robot variable or by calling set_worker_id(). Without a worker id everything runs as before.
+Every worker is its own process, so only the outputs the workers share on disk are made per worker.
+"""
+import os
+
+_worker_state = {"id": None, "detected": False}
+
+
+def set_worker_id(worker_id):
+    """
+    Sets the id of the current worker
+
+    :param worker_id: the id of the worker or None to run as a single process
+    :type worker_id: str
+    """
+    _worker_state["id"] = None if worker_id is None else str(worker_id)
+    _worker_state["detected"] = True
+
+
+def get_worker_id():
+    """
+    Returns the id of the current worker
+    PO_WORKER_ID takes priority over the id set by set_worker_id() or detect_worker_id()
+
+    :return: the worker id or None if not running in parallel
+    :rtype: str
+    """
+    return os.environ.get("PO_WORKER_ID", None) or _worker_state["id"]
+
+
+def detect_worker_id():
+    """
+    Looks up pabot's ${PABOTEXECUTIONPOOLID} robot variable once per process and uses it as the worker id
+    WILL NOT RUN IF NOT IN ROBOT
+
+    :return: the worker id or None if not running in parallel
+    :rtype: str
+    """
+    if not _worker_state["detected"] and not os.environ.get("PO_WORKER_ID", None):
+        from context import Context
+        if Context.in_robot():
+            from robot.libraries.BuiltIn import BuiltIn
+            set_worker_id(BuiltIn().get_variable_value("${PABOTEXECUTIONPOOLID}", None))
+    return get_worker_id()
+
+
+def get_worker_path(path):
+    """
+    Makes a file path unique to the current worker by adding the worker id before the extension
+    Example:
+        po_log.txt -> po_log.worker2.txt
+
+    :param path: the file path shared by all workers
+    :type path: str
+    :return: the path for the current worker
+    :rtype: str
+    """
+    worker_id = get_worker_id()
+    if worker_id is None:
+        return path
+    root, ext = os.path.splitext(path)
+    return "%s.worker%s%s" % (root, worker_id, ext)
+
+
+def get_worker_dir(path):
+    """
+    Makes a directory unique to the current worker by adding a worker subdirectory
+    Example:
+        /tmp/cache -> /tmp/cache/worker2
+
+    :param path: the directory shared by all workers
+    :type path: str
+    :return: the directory for the current worker
+    :rtype: str
+    """
+    worker_id = get_worker_id()
+    if worker_id is None:
+        return path
+    return os.path.join(path, "worker%s" % worker_id)
+
+
+def assign_worker_resource(resources):
+    """
+    Picks the resource for the current worker out of a list, ex. one selenium grid url per worker
+    Workers are spread round robin over the resources by their id
+
+    :param resources: the resources to choose from, a list or a comma separated string
+    :type resources: list
+    :return: the resource of the current worker or None if there are no resources
+    """
+    if isinstance(resources, basestring):
+        resources = [resource.strip() for resource in resources.split(",") if resource.strip()]
+    if not resources:
+        return None
+    worker_id = get_worker_id()
+    if worker_id is None:
+        return resources[0]
+    try:
+        index = int(worker_id)
+    except ValueError:
+        index = sum(ord(char) for char in worker_id)
+    return resources[index % len(resources)]
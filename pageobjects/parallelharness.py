@@ -0,0 +1,185 @@
+"""
+This File is a local multi-process harness proving that parallel workers do not interfere
+Each worker runs in its own process like a pabot worker, sharing the working directory,
+and the parent checks that logs, caches and browser resources stay separate.
+Robot is also run in two processes with pabot's ${PABOTEXECUTIONPOOLID} set, checking that pages
+registered before the worker id is known are still found and that each worker writes its own outputs.
+Usage:
+    python -m pageobjects.parallelharness [number of workers] [messages per worker]
+"""
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+_HARNESS_PAGE = '''import json
+from pageobjects import Page, PageRegistry
+from pageobjects.parallel import get_worker_id, get_worker_path
+
+
+class HarnessPage(Page):
+    uri = "/harness"
+
+    def write_worker_report(self, path):
+        """
+        Writes the worker id and the page registered as "Harness Page" to the worker's copy of path
+        """
+        with open(get_worker_path(path), "w") as f:
+            json.dump({"worker": get_worker_id(), "page": PageRegistry().get_page_class("Harness Page").__name__}, f)
+'''
+
+_HARNESS_SUITE = '''*** Settings ***
+Library    harness_pages.HarnessPage
+
+*** Test Cases ***
+Worker Finds Pages Registered Before Its Id Was Known
+    Write Worker Report    worker_report.json
+'''
+
+
+def _run_worker(worker_id, work_dir, messages, remote_urls, results):
+    """
+    Runs one worker: logs messages and resolves its cache dir and remote url
+
+    :param worker_id: the id of the worker
+    :type worker_id: int
+    :param work_dir: the working directory shared by all workers
+    :type work_dir: str
+    :param messages: the number of messages to log
+    :type messages: int
+    :param remote_urls: the remote urls to spread over the workers
+    :type remote_urls: list of strings
+    :param results: the queue to put the worker results on
+    :type results: multiprocessing.Queue
+    """
+    from pageobjects.abstractedlogger import Logger
+    from pageobjects import parallel
+    os.chdir(work_dir)
+    os.environ["PO_WORKER_ID"] = str(worker_id)
+
+    logger = Logger()
+    for index in range(messages):
+        logger.log("worker %s message %s" % (worker_id, index), is_console=False)
+    for handler in logger.logger.handlers:
+        handler.flush()
+
+    results.put({
+        "worker": worker_id,
+        "log_path": os.path.abspath(parallel.get_worker_path("po_log.txt")),
+        "cache_dir": parallel.get_worker_dir(os.path.join(work_dir, "yaml-cache")),
+        "remote": parallel.assign_worker_resource(remote_urls)
+    })
+
+
+def run(workers=4, messages=200):
+    """
+    Runs the workers in separate processes and checks that they did not interfere
+
+    :param workers: the number of worker processes (Defaults 4)
+    :type workers: int
+    :param messages: the number of messages each worker logs (Defaults 200)
+    :type messages: int
+    :return: list of problems found, empty if the workers did not interfere
+    :rtype: list of strings
+    """
+    work_dir = tempfile.mkdtemp(prefix="pageobjects-harness-")
+    remote_urls = ["http://grid-%s:4444/wd/hub" % index for index in range(workers)]
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_run_worker, args=(worker_id, work_dir, messages, remote_urls, results))
+                 for worker_id in range(workers)]
+    try:
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        problems = ["worker process exited with code %s" % process.exitcode
+                    for process in processes if process.exitcode != 0]
+        worker_results = []
+        while not results.empty():
+            worker_results.append(results.get())
+        if len(worker_results) != workers:
+            problems.append("expected %s worker results but got %s" % (workers, len(worker_results)))
+
+        for key in ("log_path", "cache_dir", "remote"):
+            values = [result[key] for result in worker_results]
+            if len(set(values)) != len(values):
+                problems.append("workers share a %s: %s" % (key, values))
+        for result in worker_results:
+            with open(result["log_path"]) as f:
+                lines = f.read().splitlines()
+            foreign = [line for line in lines if "worker %s message" % result["worker"] not in line]
+            if foreign or len(lines) != messages:
+                problems.append("log of worker %s has %s lines, %s from other workers"
+                                % (result["worker"], len(lines), len(foreign)))
+        problems.extend(run_robot_workers(work_dir))
+        return problems
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def run_robot_workers(work_dir, workers=2):
+    """
+    Runs a robot suite in separate processes the way pabot does, each with its own ${PABOTEXECUTIONPOOLID}
+    The worker id is only known once the first page is constructed, after the pages were registered
+
+    :param work_dir: the working directory shared by all workers
+    :type work_dir: str
+    :param workers: the number of robot processes (Defaults 2)
+    :type workers: int
+    :return: list of problems found, empty if every worker found its pages and wrote its own report
+    :rtype: list of strings
+    """
+    package_dir = os.path.join(work_dir, "harness_pages")
+    if not os.path.isdir(package_dir):
+        os.makedirs(package_dir)
+    with open(os.path.join(package_dir, "__init__.py"), "w") as f:
+        f.write("from harness_pages.harnesspage import HarnessPage\n")
+    with open(os.path.join(package_dir, "harnesspage.py"), "w") as f:
+        f.write(_HARNESS_PAGE)
+    suite_path = os.path.join(work_dir, "harness.robot")
+    with open(suite_path, "w") as f:
+        f.write(_HARNESS_SUITE)
+    repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env.pop("PO_WORKER_ID", None)
+    processes = []
+    for worker_id in range(workers):
+        command = [sys.executable, "-m", "robot", "--pythonpath", repo_dir, "--pythonpath", work_dir,
+                   "--variable", "PABOTEXECUTIONPOOLID:%s" % worker_id,
+                   "--outputdir", os.path.join(work_dir, "robot-worker%s" % worker_id), suite_path]
+        processes.append(subprocess.Popen(command, cwd=work_dir, env=env,
+                                          stdout=subprocess.PIPE, stderr=subprocess.STDOUT))
+    problems = []
+    for worker_id, process in enumerate(processes):
+        output = process.communicate()[0]
+        if process.returncode != 0:
+            problems.append("robot worker %s failed:\n%s" % (worker_id, output))
+            continue
+        report_path = os.path.join(work_dir, "worker_report.worker%s.json" % worker_id)
+        if not os.path.isfile(report_path):
+            problems.append("robot worker %s did not write %s" % (worker_id, report_path))
+            continue
+        with open(report_path) as f:
+            report = json.load(f)
+        if report["worker"] != str(worker_id) or report["page"] != "HarnessPage":
+            problems.append("robot worker %s reported %s" % (worker_id, report))
+    return problems
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    workers = int(argv[0]) if len(argv) > 0 else 4
+    messages = int(argv[1]) if len(argv) > 1 else 200
+    problems = run(workers, messages)
+    for problem in problems:
+        print "FAIL: %s" % problem
+    if not problems:
+        print "OK: %s workers ran without interfering" % workers
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,45 +1,75 @@
 from _metaflyweight import MetaFlyWeight
-from context import Context
-from robot.libraries.BuiltIn import BuiltIn
+from _metasingleton import MetaSingleton
+from context import Context, _get_current_execution_context
 from abstractedlogger import Logger
+from manifest import get_manifest
 import os
 import inspect
+import itertools
+import time
+import weakref
 
 
 class RobotHandler(object):
     """
     This class is a Flyweight for the robot file
     It imports the associated .robot file if it exist
+    The .robot paths are looked up once per page class and imported through ResourceImporter
+    every time a page is constructed, so each suite gets the resources once
     Example:
         RobotHandler(LoginPage)
     """
     __metaclass__ = MetaFlyWeight
     _page_instance = None
+    _robot_paths = None
     
     def __init__(self, page_inst):
         if not self._initialized:
             self._page_instance = page_inst
-            if Context.in_robot():
-                self._load_robot_resources()
-            else:
-                Logger().log("Robot Framework is currently not available", "INFO")
+            self._robot_paths = {}
             self._initialized = True
+        if Context.in_robot():
+            self._load_robot_resources(page_inst)
+        elif page_inst is self._page_instance:
+            Logger().log("Robot Framework is currently not available", "INFO")
         
-    def _load_robot_resources(self):
+    def _load_robot_resources(self, page_inst=None):
         """
         This method runs through the list of parent classes including self
         Imports the Resource directly into robot if a .robot file with the same class name exist
+        With a manifest the .robot paths are taken from the manifest
         WILL NOT RUN IF NOT IN ROBOT
+
+        :param page_inst: the page being constructed (Defaults to the page the flyweight was created for)
+        :type page_inst: Page
+        """
+        page_inst = page_inst or self._page_instance
+        robot_paths = self._robot_paths.get(page_inst.__class__, None)
+        if robot_paths is None:
+            robot_paths = self._robot_paths[page_inst.__class__] = self._get_robot_paths(page_inst)
+        importer = ResourceImporter()
+        for robot_path in robot_paths:
+            importer.import_resource(robot_path)
+
+    def _get_robot_paths(self, page_inst):
         """
+        Returns the .robot files of the page and its parents that exist, from parent classes to children
+
+        :param page_inst: the page instance
+        :type page_inst: Page
+        :return: the absolute paths of the .robot files
+        :rtype: list of strings
+        """
+        manifest = get_manifest(page_inst)
+        entry = manifest.get_page(page_inst) if manifest else None
+        if entry is not None:
+            robot_paths = [manifest.resolve(robot_path) for robot_path in entry["robot"]]
+        else:
+            list_of_classes = page_inst._get_parent_pages(top_to_bottom=True)
+            robot_paths = [self._convert_classpath_to_robot(clazz) for clazz in list_of_classes]
+        return [os.path.normpath(os.path.abspath(robot_path)) for robot_path in robot_paths
+                if os.path.isfile(robot_path)]
 
-        self._locators = {}
-        list_of_classes = self._page_instance._get_parent_pages(top_to_bottom=True)
-        for clazz in list_of_classes:
-            robot_path = self._convert_classpath_to_robot(clazz)
-            if os.path.isfile(robot_path):
-                test_path = robot_path.replace("\\", "\\\\")
-                BuiltIn().import_resource(test_path)
-                
     def _convert_classpath_to_robot(self, clazz):
         """
         Converts the class filepath to a robot path at the current place
@@ -59,3 +89,108 @@ class RobotHandler(object):
         else:
             path = clazzfile.replace(".py", ".robot")
         return path
+
+
+class ResourceImporter(object):
+    __metaclass__ = MetaSingleton
+    """
+    This singleton class imports .robot resources into the running suite
+    Each resource is imported at most once per suite namespace, while BuiltIn().import_resource
+    rebuilds the resource keywords and variables on every call
+    Robot caches parsed resources by path for the whole run, a resource changed on disk since it was parsed
+    is parsed again
+    To get the resource import time per suite:
+        ResourceImporter().get_report()
+    """
+    def __init__(self):
+        if not self._initialized:
+            # PLACE CRITICAL CODE HERE IN ORDER TO AVOID INIT BEING CALLED TWICE
+            self._initialized = True
+            # namespace -> {path: mtime imported}, forgotten with the namespace at the end of its suite ##
+            self._imported = weakref.WeakKeyDictionary()
+            # path -> mtime of the resource in robot's parse cache ##
+            self._parsed = {}
+            self._report = {}
+
+    def import_resource(self, path):
+        """
+        Imports the resource into the current suite unless it is already imported there
+
+        :param path: the absolute path of the .robot file
+        :type path: str
+        :return: True if the resource was imported, False if the suite already has it
+        :rtype: bool
+        """
+        from robot.libraries.BuiltIn import BuiltIn
+        context = _get_current_execution_context()
+        namespace = context.namespace
+        suite = context.suite.longname
+        stats = self._report.get(suite, None)
+        if stats is None:
+            stats = self._report[suite] = ResourceImportStats(suite)
+        imported = self._imported.get(namespace, None)
+        if imported is None:
+            imported = self._imported[namespace] = {}
+        if path in imported:
+            stats.skipped += 1
+            return False
+        start = time.time()
+        mtime = os.path.getmtime(path)
+        if self._parsed.get(path, mtime) != mtime:
+            self._reparse_resource(path)
+        self._parsed[path] = mtime
+        BuiltIn().import_resource(path.replace("\\", "\\\\"))
+        imported[path] = mtime
+        stats.imported += 1
+        stats.seconds += time.time() - start
+        return True
+
+    def _reparse_resource(self, path):
+        """
+        Parses the resource again and replaces it in robot's parse cache
+        """
+        from robot.running.builder import ResourceFileBuilder
+        from robot.running.namespace import IMPORTER
+        IMPORTER._resource_cache[path] = ResourceFileBuilder().build(path)
+
+    def get_report(self):
+        """
+        Returns the resource imports of every suite so far
+
+        :return: the statistics of each suite in the order the suites ran
+        :rtype: list of ResourceImportStats
+        """
+        return sorted(self._report.values(), key=lambda stats: stats.order)
+
+    def format_report(self):
+        """
+        Formats the resource imports of every suite as a table
+
+        :return: the report
+        :rtype: str
+        """
+        lines = ["%10s %8s %8s  %s" % ("seconds", "imported", "skipped", "suite")]
+        for stats in self.get_report():
+            lines.append("%10.4f %8d %8d  %s" % (stats.seconds, stats.imported, stats.skipped, stats.suite))
+        return "\n".join(lines)
+
+
+class ResourceImportStats(object):
+    """
+    This object holds the resource imports of a suite:
+    suite: the long name of the suite
+    imported: number of resources imported
+    skipped: number of imports skipped because the suite already had the resource
+    seconds: time spent importing
+    order: the order the suite first imported a resource in
+    """
+    _count = itertools.count()
+    suite = None
+    imported = 0
+    skipped = 0
+    seconds = 0.0
+    order = 0
+
+    def __init__(self, suite):
+        self.suite = suite
+        self.order = next(self._count)
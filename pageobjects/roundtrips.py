@@ -0,0 +1,127 @@
+from _metasingleton import MetaSingleton
+from monkeypatches import add_command_listener
+from collections import deque
+
+
+class RoundTripRecorder(object):
+    __metaclass__ = MetaSingleton
+    """
+    This singleton class records the WebDriver commands(round trips) issued while page keywords run
+    Commands count for every running keyword, so a keyword's count includes the keywords it calls
+    Identical commands(same command and parameters) are counted to find N+1 patterns,
+    ex. the same find_element issued in a loop
+    It is used by Page.run_keyword when the "roundtrip_budget" or "roundtrip_repeat_limit" option is set
+    To see the round trips of the last keyword:
+        RoundTripRecorder().get_last_record()
+    """
+    MAX_RECORDS = 100
+
+    def __init__(self):
+        if not self._initialized:
+            # PLACE CRITICAL CODE HERE IN ORDER TO AVOID INIT BEING CALLED TWICE
+            self._initialized = True
+            self._running = []
+            self._records = deque(maxlen=self.MAX_RECORDS)
+            add_command_listener(self._on_command)
+
+    def start_keyword(self, page_name, keyword):
+        """
+        Starts recording the round trips of a keyword
+
+        :param page_name: the name of the page running the keyword
+        :type page_name: str
+        :param keyword: the alias of the keyword
+        :type keyword: str
+        :return: the record to pass to end_keyword
+        :rtype: RoundTripRecord
+        """
+        record = RoundTripRecord(page_name, keyword)
+        self._running.append(record)
+        return record
+
+    def end_keyword(self, record):
+        """
+        Stops recording the round trips of a keyword, calling it again for the same record does nothing
+
+        :param record: the record returned by start_keyword
+        :type record: RoundTripRecord
+        """
+        if record in self._running:
+            # Records above this one belong to keywords that never ended ##
+            del self._running[self._running.index(record):]
+            self._records.append(record)
+
+    def get_last_record(self):
+        """
+        Returns the record of the most recently ended keyword
+
+        :return: the last record or None if no keyword ended yet
+        :rtype: RoundTripRecord
+        """
+        return self._records[-1] if self._records else None
+
+    def get_records(self):
+        """
+        Returns the records of the most recently ended keywords (up to MAX_RECORDS)
+
+        :return: list of records oldest first
+        :rtype: list of RoundTripRecord
+        """
+        return list(self._records)
+
+    def _on_command(self, driver, driver_command, params, elapsed, error):
+        """
+        Command listener adding the command to every running keyword
+        """
+        if self._running:
+            signature = _get_signature(driver_command, params)
+            for record in self._running:
+                record.add(signature, elapsed)
+
+
+class RoundTripRecord(object):
+    """
+    This object holds the round trips of a single keyword:
+    page: the name of the page
+    keyword: the alias of the keyword
+    count: number of WebDriver commands issued
+    elapsed: time in seconds spent in the commands
+    signatures: dict of (command, parameters) to number of times issued
+    """
+    page = None
+    keyword = None
+    count = 0
+    elapsed = 0.0
+    signatures = None
+
+    def __init__(self, page, keyword):
+        self.page = page
+        self.keyword = keyword
+        self.signatures = {}
+
+    def add(self, signature, elapsed):
+        self.count += 1
+        self.elapsed += elapsed
+        self.signatures[signature] = self.signatures.get(signature, 0) + 1
+
+    def get_repeats(self, limit):
+        """
+        Returns the identical commands issued more than limit times
+
+        :param limit: the number of times a command may be repeated
+        :type limit: int
+        :return: list of ((command, parameters), count), most repeated first
+        :rtype: list of tuples
+        """
+        repeats = [(signature, count) for signature, count in self.signatures.iteritems() if count > limit]
+        return sorted(repeats, key=lambda repeat: repeat[1], reverse=True)
+
+
+def _get_signature(driver_command, params):
+    """
+    Builds a hashable signature of a command, the session id is left out as it never changes
+    """
+    if not params:
+        return driver_command, ""
+    items = sorted((key, value) for key, value in params.iteritems() if key != "sessionId")
+    return driver_command, repr(items)
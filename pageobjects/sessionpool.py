@@ -0,0 +1,242 @@
+from _metasingleton import MetaSingleton
+from monkeypatches import add_command_listener
+from selenium.webdriver.remote.command import Command
+import atexit
+import time
+import urlparse
+
+
+class SessionPool(object):
+    __metaclass__ = MetaSingleton
+    """
+    This singleton class keeps released WebDriver sessions warm so new browsers do not have to be started
+    Sessions are pooled by browser name, remote url, profile and capabilities
+    Released sessions are reset(extra windows closed, cookies and storage cleared, about:blank)
+    instead of quit, and are quit once they are older than max_age, used max_uses times or fail a health check
+    Cookies and storage can only be cleared for the origin that is loaded, so sessions that visited more than one
+    origin are quit instead of reset. Origins are seen from Go To/Open Browser urls and the urls of the open windows,
+    an origin only reached by clicking a link and left again before the release is not seen
+    Every acquire hands out a new WebDriver object for the session, so Selenium2Library's BrowserCache sees a new
+    browser and the object handed out before is left closed and can no longer quit the session
+    To get a browser use:
+        SessionPool().acquire(SessionPool.make_key("firefox"), create_browser)
+    Calling quit() on a pooled browser releases it back to the pool
+    Any object with the WebDriver methods can be pooled so a local stand-in driver works for testing
+    """
+    def __init__(self):
+        if not self._initialized:
+            # PLACE CRITICAL CODE HERE IN ORDER TO AVOID INIT BEING CALLED TWICE
+            self._initialized = True
+            self._idle = {}
+            self._sessions = {}
+            self.max_age = 1800
+            self.max_uses = 50
+            self.max_idle = 4
+            add_command_listener(self._on_command)
+            atexit.register(self.shutdown)
+
+    def configure(self, max_age=None, max_uses=None, max_idle=None):
+        """
+        Sets the limits of the pool
+
+        :param max_age: seconds a session may live before it is quit (Defaults 1800)
+        :type max_age: float
+        :param max_uses: number of times a session may be acquired before it is quit (Defaults 50)
+        :type max_uses: int
+        :param max_idle: number of idle sessions kept per key (Defaults 4)
+        :type max_idle: int
+        """
+        if max_age is not None:
+            self.max_age = float(max_age)
+        if max_uses is not None:
+            self.max_uses = int(max_uses)
+        if max_idle is not None:
+            self.max_idle = int(max_idle)
+
+    @staticmethod
+    def make_key(browser_name, desired_capabilities=None, profile_dir=None, remote=None):
+        """
+        Builds the pool key of a browser
+
+        :param browser_name: the name of the browser ex. "firefox"
+        :type browser_name: str
+        :param desired_capabilities: the capabilities of the browser
+        :type desired_capabilities: dict
+        :param profile_dir: the firefox profile dir
+        :type profile_dir: str
+        :param remote: the remote url of the browser
+        :type remote: str
+        :return: the key sessions are pooled under
+        :rtype: tuple
+        """
+        if isinstance(desired_capabilities, dict):
+            desired_capabilities = repr(sorted(desired_capabilities.items()))
+        return browser_name.lower().strip(), remote or None, profile_dir or None, desired_capabilities or None
+
+    def acquire(self, key, factory):
+        """
+        Returns a warm idle session for the key or creates a new one with the factory
+
+        :param key: the key of the session from make_key
+        :type key: tuple
+        :param factory: callable creating a new browser
+        :type factory: callable
+        :return: the browser
+        :rtype: WebDriver
+        """
+        idle = self._idle.get(key, [])
+        while idle:
+            session = idle.pop()
+            if not self._is_expired(session) and self._is_healthy(session):
+                session.uses += 1
+                previous = session.browser
+                # The BrowserCache keeps the closed object as closed, the session gets a new one ##
+                browser = object.__new__(type(previous))
+                browser.__dict__.update(previous.__dict__)
+                previous.quit = lambda: None
+                return self._hand_out(session, browser)
+            self._quit(session)
+        return self._hand_out(PooledSession(key, None), factory())
+
+    def _hand_out(self, session, browser):
+        """
+        Makes the browser the object of the session, quitting it releases the session to the pool
+        """
+        self._sessions.pop(id(session.browser), None)
+        session.browser = browser
+        self._sessions[id(browser)] = session
+        browser.quit = lambda: self.release(browser)
+        return browser
+
+    def release(self, browser):
+        """
+        Resets the browser and returns it to the pool, or quits it if it can not be reused
+
+        :param browser: the browser to release
+        :type browser: WebDriver
+        """
+        session = self._sessions.get(id(browser), None)
+        if session is None or session.browser is not browser:
+            type(browser).quit(browser)
+            return
+        idle = self._idle.setdefault(session.key, [])
+        # Already released(ex. quit twice by the test code) ##
+        if session in idle:
+            return
+        if self._is_expired(session) or len(idle) >= self.max_idle or not self._reset(session):
+            self._quit(session)
+        else:
+            session.released = time.time()
+            idle.append(session)
+
+    def shutdown(self):
+        """
+        Quits every session of the pool, the idle ones and the ones still in use
+        """
+        for idle in self._idle.values():
+            del idle[:]
+        for session in self._sessions.values():
+            self._quit(session)
+
+    def get_stats(self):
+        """
+        Returns the number of sessions per state
+            idle: sessions waiting in the pool
+            total: sessions created by the pool that are still alive
+
+        :return: dict of state to number of sessions
+        :rtype: dict
+        """
+        return {"idle": sum(len(idle) for idle in self._idle.values()), "total": len(self._sessions)}
+
+    def _on_command(self, driver, driver_command, params, elapsed, error):
+        """
+        Records the origins the pooled browsers navigate to
+        """
+        if driver_command == Command.GET and params:
+            session = self._sessions.get(id(driver), None)
+            if session is not None and session.browser is driver:
+                session.add_origin(params.get("url", None))
+
+    def _is_expired(self, session):
+        return time.time() - session.created > self.max_age or session.uses >= self.max_uses
+
+    def _is_healthy(self, session):
+        """
+        Checks that the session still responds
+        """
+        try:
+            session.browser.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, session):
+        """
+        Brings the browser back to a clean state: one window, no cookies or storage, on about:blank
+        Only the loaded origin can be cleared, so a session that visited more than one origin is not reset
+
+        :return: True if the reset succeeded
+        :rtype: bool
+        """
+        browser = session.browser
+        try:
+            handles = browser.window_handles
+            for handle in handles[1:]:
+                browser.switch_to_window(handle)
+                session.add_origin(browser.current_url)
+                browser.close()
+            browser.switch_to_window(handles[0])
+            session.add_origin(browser.current_url)
+            if len(session.origins) > 1:
+                return False
+            browser.switch_to_default_content()
+            browser.delete_all_cookies()
+            browser.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+            browser.get("about:blank")
+            session.origins = set()
+            return True
+        except Exception:
+            return False
+
+    def _quit(self, session):
+        """
+        Really quits the browser of the session
+        """
+        self._sessions.pop(id(session.browser), None)
+        try:
+            type(session.browser).quit(session.browser)
+        except Exception:
+            pass
+
+
+class PooledSession(object):
+    """
+    This object holds the attribute of a pooled browser:
+    key: the key the session is pooled under
+    browser: the WebDriver of the session
+    created: the time the session was created
+    released: the time the session was last released
+    uses: the number of times the session was acquired
+    origins: the origins(scheme://host:port) visited since the session was last reset
+    """
+    key = None
+    browser = None
+    created = None
+    released = None
+    uses = 1
+    origins = None
+
+    def __init__(self, key, browser):
+        self.key = key
+        self.browser = browser
+        self.created = time.time()
+        self.origins = set()
+
+    def add_origin(self, url):
+        """
+        Adds the origin of the url, urls without a host(ex. about:blank, data:) have no origin
+        """
+        parts = urlparse.urlsplit(url or "")
+        if parts.scheme in ("http", "https") and parts.netloc:
+            self.origins.add("%s://%s" % (parts.scheme, parts.netloc.lower()))
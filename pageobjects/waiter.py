@@ -0,0 +1,218 @@
+from _metasingleton import MetaSingleton
+from exceptions import WaitTimeoutError
+from collections import deque
+import sys
+import time
+
+
+def _without_backward_steps(clock):
+    """
+    Wraps a wall clock so a step back counts as no time passing, it can not make an elapsed time negative
+    or stretch a wait. A step forward still counts as time passing
+    """
+    state = {"last": clock(), "offset": 0.0}
+
+    def now():
+        current = clock()
+        if current < state["last"]:
+            state["offset"] += state["last"] - current
+        state["last"] = current
+        return current + state["offset"]
+    return now
+
+
+# Python 2 has no monotonic clock: the monotonic package is used when it is installed,
+# time.clock is the performance counter on windows, otherwise the wall clock without its backward steps
+try:
+    monotonic = time.monotonic
+except AttributeError:
+    try:
+        from monotonic import monotonic
+    except (ImportError, RuntimeError):
+        if sys.platform == "win32":
+            monotonic = time.clock
+        else:
+            monotonic = _without_backward_steps(time.time)
+
+
+class Waiter(object):
+    __metaclass__ = MetaSingleton
+    """
+    This singleton class is the polling engine for all the waits in the library
+    It polls with short initial delays and backs off exponentially up to a cap,
+    returning as soon as the condition holds
+    To wait for a condition use:
+        Waiter().wait_until(lambda: page.execute_javascript("return window.ready;"), timeout=10)
+    To see where time was spent waiting:
+        Waiter().get_wait_totals()
+    """
+    MAX_RECORDS = 1000
+
+    def __init__(self):
+        if not self._initialized:
+            # PLACE CRITICAL CODE HERE IN ORDER TO AVOID INIT BEING CALLED TWICE
+            self._initialized = True
+            self._records = deque(maxlen=self.MAX_RECORDS)
+            self._totals = {}
+            self._total_elapsed = 0.0
+
+    def wait_until(self, condition, timeout=30, description="condition", message=None,
+                   initial_delay=0.05, max_delay=1, backoff=2):
+        """
+        Polls the given condition until it returns a truthy value or the timeout expires
+        Exceptions raised by the condition count as a failed poll
+
+        :param condition: callable polled with no arguments
+        :type condition: callable
+        :param timeout: the time in seconds to wait before failing (Defaults 30)
+        :type timeout: float
+        :param description: the name the wait is recorded under
+        :type description: str
+        :param message: the error message if the wait times out
+        :type message: str
+        :param initial_delay: the time in seconds to sleep after the first failed poll (Defaults 0.05)
+        :type initial_delay: float
+        :param max_delay: the maximum time in seconds to sleep between polls (Defaults 1)
+        :type max_delay: float
+        :param backoff: the multiplier applied to the delay after each failed poll (Defaults 2)
+        :type backoff: float
+        :return: the truthy value returned by the condition
+        :raise WaitTimeoutError: if the condition does not hold within the timeout
+        """
+        start = monotonic()
+        deadline = start + timeout
+        delay = min(initial_delay, max_delay)
+        polls = 0
+        last_error = None
+        while True:
+            polls += 1
+            try:
+                result = condition()
+            except Exception, e:
+                result = None
+                last_error = e
+            now = monotonic()
+            if result:
+                self._record(description, now - start, polls, True)
+                return result
+            remaining = deadline - now
+            if remaining <= 0:
+                self._record(description, now - start, polls, False)
+                if message is None:
+                    message = "WAIT ERROR: %s was not met within %s seconds" % (description, timeout)
+                if last_error is not None:
+                    message = "%s (last error: %s)" % (message, last_error)
+                raise WaitTimeoutError(message)
+            time.sleep(min(delay, remaining))
+            delay = min(delay * backoff, max_delay)
+
+    def _record(self, description, elapsed, polls, success):
+        """
+        Stores the outcome of a wait and adds it to the totals for its description
+
+        :param description: the name the wait is recorded under
+        :type description: str
+        :param elapsed: the time in seconds the wait took
+        :type elapsed: float
+        :param polls: the number of times the condition was polled
+        :type polls: int
+        :param success: True if the condition was met
+        :type success: bool
+        """
+        record = WaitRecord(description, elapsed, polls, success)
+        self._records.append(record)
+        self._total_elapsed += elapsed
+        total = self._totals.get(description, None)
+        if total is None:
+            total = self._totals[description] = WaitTotal(description)
+        total.add(record)
+
+    def get_last_record(self):
+        """
+        Returns the record of the most recent wait
+
+        :return: the last wait record or None if nothing waited yet
+        :rtype: WaitRecord
+        """
+        return self._records[-1] if self._records else None
+
+    def get_wait_records(self):
+        """
+        Returns the records of the most recent waits (up to MAX_RECORDS)
+
+        :return: list of wait records oldest first
+        :rtype: list of WaitRecord
+        """
+        return list(self._records)
+
+    def get_wait_totals(self):
+        """
+        Returns the accumulated wait time per description
+
+        :return: dict of description to WaitTotal
+        :rtype: dict
+        """
+        return dict(self._totals)
+
+    def get_total_wait_time(self):
+        """
+        Returns the time spent in all the waits since the last reset
+
+        :return: time in seconds
+        :rtype: float
+        """
+        return self._total_elapsed
+
+    def reset(self):
+        """
+        Clears all the recorded waits
+        """
+        self._records.clear()
+        self._totals = {}
+        self._total_elapsed = 0.0
+
+
+class WaitRecord(object):
+    """
+    This object holds the outcome of a single wait:
+    description: the name of the wait
+    elapsed: time in seconds spent waiting
+    polls: number of times the condition was polled
+    success: True if the condition was met before the timeout
+    """
+    description = None
+    elapsed = None
+    polls = None
+    success = None
+
+    def __init__(self, description, elapsed, polls, success):
+        self.description = description
+        self.elapsed = elapsed
+        self.polls = polls
+        self.success = success
+
+
+class WaitTotal(object):
+    """
+    This object accumulates the waits recorded under one description:
+    description: the name of the wait
+    count: number of waits
+    timeouts: number of waits that timed out
+    elapsed: total time in seconds spent waiting
+    max_elapsed: the longest single wait in seconds
+    """
+    description = None
+    count = 0
+    timeouts = 0
+    elapsed = 0.0
+    max_elapsed = 0.0
+
+    def __init__(self, description):
+        self.description = description
+
+    def add(self, record):
+        self.count += 1
+        if not record.success:
+            self.timeouts += 1
+        self.elapsed += record.elapsed
+        self.max_elapsed = max(self.max_elapsed, record.elapsed)
@@ -1,8 +1,21 @@
 from _metaflyweight import MetaFlyWeight
+from optionhandler import OptionHandler
+from locators import parse_locator
+from manifest import get_manifest
+from parallel import get_worker_dir
 #import YamlVariables
 import yaml
 import os
 import inspect
+import hashlib
+import marshal
+import tempfile
+import time
+# Use the C accelerated safe loader when libyaml is available ##
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 
 class YAMLHandler(object):
@@ -14,10 +27,22 @@ class YAMLHandler(object):
         YAMLHandler(LoginPage).get_locators()
     To get options use:
         YAMLHandler(LoginPage).get_locator("ice cream")
+    To get all locators under a group:
+        YAMLHandler(LoginPage).get_locator_group("login form")
+    The merged locators are flattened once at load into an index of normalized dotted keys(ex. "login_form.user")
+    To get the compiled locator cache statistics:
+        YAMLHandler.get_cache_stats()
+    Parsed yaml files are cached on disk in a compiled form keyed by path, mtime and size
+    The cache is stored per worker in the "yaml_cache_dir" option and can be turned off with the "yaml_cache" option
     """
     __metaclass__ = MetaFlyWeight
     _page_instance = None
     _locators = None
+    _index = None
+    _parsed = None
+    _groups = None
+    _CACHE_VERSION = 1
+    _cache_stats = {"hits": 0, "misses": 0, "parse_time": 0.0}
 
     def __init__(self, page_inst):
         if not self._initialized:
@@ -29,18 +54,146 @@ class YAMLHandler(object):
         """ 
         Populates the _locators value with all the yaml files of self to parents
         Lower Level Classes Take Priority
+        With a manifest the yaml paths and unchanged locators are taken from the manifest
         """
         self._locators = {}
-        list_of_classes = self._page_instance._get_parent_pages(top_to_bottom=True)
-        for clazz in list_of_classes:
-            yaml_path = self._convert_classpath_to_yaml(clazz)
-            if os.path.isfile(yaml_path):
-                with open(yaml_path, "r") as f:
-                    values = yaml.load(f)
-                if(values is None):
-                    self.log("YAMLHANDLER WARNING: Empty yaml file found at location '%s'. Please delete file if not needed. "%yaml_path,"WARN")
-                    values ={}
-                self._locators.update(values)
+        manifest = get_manifest(self._page_instance)
+        entry = manifest.get_page(self._page_instance) if manifest else None
+        if entry is not None:
+            yaml_paths = [manifest.resolve(yaml_path) for yaml_path in entry["yaml"]]
+        else:
+            list_of_classes = self._page_instance._get_parent_pages(top_to_bottom=True)
+            yaml_paths = [self._convert_classpath_to_yaml(clazz) for clazz in list_of_classes]
+        for yaml_path in yaml_paths:
+            file_entry = manifest.get_file(yaml_path) if manifest else None
+            if file_entry is not None and "values" in file_entry:
+                values = file_entry["values"]
+            elif os.path.isfile(yaml_path):
+                values = self._load_yaml(yaml_path)
+            else:
+                continue
+            if(values is None):
+                self._page_instance.log("YAMLHANDLER WARNING: Empty yaml file found at location '%s'. Please delete file if not needed. "%yaml_path,"WARN")
+                values ={}
+            self._locators.update(values)
+        self._index = {}
+        self._parsed = {}
+        self._groups = {}
+        self._index_locators(self._locators)
+
+    def _index_locators(self, locators, prefix=""):
+        """
+        Flattens the locator tree into the index under normalized dotted keys
+        String locators are also stored split into strategy and value
+        Each group(dict) stores the keys of all the locators under it
+
+        :param locators: the locator tree to flatten
+        :type locators: dict
+        :param prefix: the dotted key of the tree with a trailing "."
+        :type prefix: str
+        :return: the keys of all the locators(leaves) in the tree
+        :rtype: list of strings
+        """
+        leaves = []
+        for key, value in locators.iteritems():
+            name = prefix + self._normalize(unicode(key))
+            self._index[name] = value
+            if isinstance(value, dict):
+                group = self._groups[name] = self._index_locators(value, name + ".")
+                leaves.extend(group)
+            else:
+                if isinstance(value, basestring):
+                    self._parsed[name] = parse_locator(value)
+                leaves.append(name)
+        return leaves
+
+    def _load_yaml(self, yaml_path):
+        """
+        Loads the yaml file from the compiled cache if it is unchanged, otherwise parses it with the safe loader
+        and stores the result in the cache
+
+        :param yaml_path: the path of the yaml file
+        :type yaml_path: str
+        :return: the values in the yaml file
+        """
+        stat = os.stat(yaml_path)
+        cache_path = self._get_cache_path(yaml_path)
+        if cache_path and os.path.isfile(cache_path):
+            try:
+                with open(cache_path, "rb") as f:
+                    version, mtime, size, values = marshal.load(f)
+                if version == self._CACHE_VERSION and mtime == stat.st_mtime and size == stat.st_size:
+                    self._cache_stats["hits"] += 1
+                    return values
+            except (IOError, EOFError, ValueError, TypeError):
+                pass
+        self._cache_stats["misses"] += 1
+        start = time.time()
+        with open(yaml_path, "r") as f:
+            values = yaml.load(f, Loader=SafeLoader)
+        self._cache_stats["parse_time"] += time.time() - start
+        if cache_path:
+            self._write_cache(cache_path, (self._CACHE_VERSION, stat.st_mtime, stat.st_size, values))
+        return values
+
+    def _get_cache_path(self, yaml_path):
+        """
+        Returns the path of the compiled cache file for the yaml file
+
+        :param yaml_path: the path of the yaml file
+        :type yaml_path: str
+        :return: the path of the cache file or None if the cache is turned off
+        :rtype: str
+        """
+        from robot.utils import is_truthy
+        option_handler = OptionHandler(self._page_instance)
+        if not is_truthy(option_handler.get("yaml_cache", True)):
+            return None
+        cache_dir = option_handler.get("yaml_cache_dir", None) or os.path.join(tempfile.gettempdir(),
+                                                                             "pageobjects-yaml-cache")
+        cache_dir = get_worker_dir(cache_dir)
+        key = hashlib.sha1(os.path.abspath(yaml_path)).hexdigest()
+        return os.path.join(cache_dir, key + ".marshal")
+
+    def _write_cache(self, cache_path, entry):
+        """
+        Writes the cache entry, replacing the cache file in one step so readers never see a partial file
+        Values that can not be compiled (ex. yaml dates) and unwritable cache dirs are skipped
+
+        :param cache_path: the path of the cache file
+        :type cache_path: str
+        :param entry: the tuple of (version, mtime, size, values) to store
+        :type entry: tuple
+        """
+        temp_path = None
+        try:
+            data = marshal.dumps(entry)
+            cache_dir = os.path.dirname(cache_path)
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            fd, temp_path = tempfile.mkstemp(dir=cache_dir)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            # Windows can not rename over an existing file ##
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            os.rename(temp_path, cache_path)
+        except (ValueError, IOError, OSError):
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @classmethod
+    def get_cache_stats(cls):
+        """
+        Returns the statistics of the compiled locator cache
+            hits: number of yaml files loaded from the cache
+            misses: number of yaml files parsed
+            parse_time: total time in seconds spent parsing yaml
+
+        :return: dict of statistic name to value
+        :rtype: dict
+        """
+        return dict(cls._cache_stats)
 
     def get_locator(self, key):
         """ 
@@ -53,15 +206,65 @@ class YAMLHandler(object):
         :raise Exception: IF KEY IS NOT FOUND
         """
         name = self._normalize(key)
-        path = name.split(".")
         try:
-            locatorlist = self._locators
-            for part in path:
-                locatorlist = locatorlist[part]
-            return locatorlist
-        except:
+            return self._index[name]
+        except KeyError:
             raise Exception("LOCATOR ERROR: no locator found with name %s" % name)
-        
+
+    def has_locator(self, key):
+        """
+        Checks if a locator with a value exist for the given key
+
+        :param key: The key of the locator
+        :type key: str
+        :return: True if the locator exist and has a value
+        :rtype: bool
+        """
+        return self._index.get(self._normalize(key), None) is not None
+
+    def get_parsed_locator(self, key):
+        """
+        Gets the locator with the given key split into strategy and value
+
+        :param key: The key of the locator
+        :type key: str
+        :return: the strategy and value of the locator ex. ("css", "#login")
+        :rtype: tuple of (str, str)
+        :raise Exception: IF KEY IS NOT FOUND OR IS A GROUP
+        """
+        name = self._normalize(key)
+        try:
+            return self._parsed[name]
+        except KeyError:
+            raise Exception("LOCATOR ERROR: no locator found with name %s" % name)
+
+    def get_locator_group(self, key):
+        """
+        Gets all the locators under the given group key
+
+        :param key: The key of the group ex. "login_form"
+        :type key: str
+        :return: dict of dotted keys to locators ex. {"login_form.user": "id=user"}
+        :rtype: dict
+        :raise Exception: IF KEY IS NOT A GROUP
+        """
+        name = self._normalize(key)
+        try:
+            return dict((leaf, self._index[leaf]) for leaf in self._groups[name])
+        except KeyError:
+            raise Exception("LOCATOR ERROR: no locator group found with name %s" % name)
+
+    def is_locator_group(self, key):
+        """
+        Checks if the given key is a group of locators
+
+        :param key: The key to check
+        :type key: str
+        :return: True if the key holds a group of locators
+        :rtype: bool
+        """
+        return self._normalize(key) in self._groups
+
     def get_locators(self):
         """ 
         Gets the list of all locators
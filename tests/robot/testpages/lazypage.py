@@ -0,0 +1,23 @@
+from robot.api.deco import keyword
+from pageobjects import Page
+
+
+class LazyPage(Page):
+    uri = "/lazy"
+
+    @keyword("Selenium2Library Should Not Be Set Up On ${pagename}")
+    def bases_should_not_be_initialized(self, pagename):
+        """
+        Fails if importing the page or running this keyword finished the deferred Selenium2Library setup
+        """
+        if self._bases_initialized:
+            raise AssertionError("Selenium2Library and Logger were set up for %s" % pagename)
+
+    @keyword("WebDriver Should Be Patched By ${pagename}")
+    def webdriver_should_be_patched(self, pagename):
+        """
+        Fails if importing the page did not patch selenium's RemoteWebDriver(ex. for Create Webdriver)
+        """
+        from selenium.webdriver.remote.webdriver import WebDriver
+        if not getattr(WebDriver, "_po_monkeypatched", False):
+            raise AssertionError("RemoteWebDriver was not patched by %s" % pagename)
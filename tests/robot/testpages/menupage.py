@@ -0,0 +1,20 @@
+from robot.api.deco import keyword
+from pageobjects import Page
+
+
+class MenuPage(Page):
+    uri = "/menu"
+
+    @keyword("Select ${item} From ${pagename} Menu")
+    def select_item_from_menu(self, item, pagename):
+        """
+        Returns the item selected
+        """
+        return item
+
+    @keyword("Order ${count} Of ${item} On ${pagename}")
+    def order_items(self, count, item, pagename, note="none"):
+        """
+        Returns the order as a string
+        """
+        return "%s x %s (%s)" % (count, item, note)
@@ -0,0 +1,5 @@
+from pageobjects import Page
+
+
+class ResourcePage(Page):
+    uri = "/resource"
@@ -0,0 +1,136 @@
+"""
+This File holds the helpers shared by the tests
+FakeCommandExecutor answers the WebDriver wire protocol in process, so a real selenium RemoteWebDriver
+(and everything monkeypatched onto it) runs without a browser.
+"""
+import atexit
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+# The library writes po_log.txt and other outputs to the working directory ##
+WORK_DIR = tempfile.mkdtemp(prefix="pageobjects-tests-")
+os.chdir(WORK_DIR)
+atexit.register(shutil.rmtree, WORK_DIR, True)
+
+
+class FakeCommandExecutor(object):
+    """
+    This object stands in for selenium's RemoteConnection
+    windows: dict of window handle to {"name": ..., "title": ..., "url": ...}
+    commands: list of (command, params) in the order they were executed
+    missing_locators: the locator values no element is found for
+    stale_elements: the ids of the elements no longer attached, scripts given them fail as stale
+    probe: the result of the page probe script, by default the master locator is visible on a complete document
+    element_states: dict of locator value to the state read by the bulk state script, other values are not found
+    quiescence: the results of the quiescence script in the order they are read, the last one repeats
+    """
+    def __init__(self, windows=None):
+        self.windows = windows or {"window-1": {"name": "main", "title": "Main Page", "url": "http://localhost/"}}
+        self.handles = sorted(self.windows)
+        self.current = self.handles[0]
+        self.commands = []
+        self.missing_locators = set()
+        self.stale_elements = set()
+        self.probe = None
+        self.element_states = {}
+        self.quiescence = [{"requests": 0, "timers": 0, "animations": 0, "readyState": "complete", "idle": 60000}]
+        self.quit = 0
+
+    def count(self, command):
+        return len([name for name, _ in self.commands if name == command])
+
+    def execute(self, command, params):
+        self.commands.append((command, params))
+        value = None
+        window = self.windows.get(self.current, {})
+        if command == "newSession":
+            return {"status": 0, "sessionId": "fake-session", "value": {"browserName": "fake"}}
+        elif command == "getWindowHandles":
+            value = list(self.handles)
+        elif command == "getCurrentWindowHandle":
+            value = self.current
+        elif command == "switchToWindow":
+            self.current = params.get("name", params.get("handle"))
+        elif command == "getTitle":
+            value = window.get("title")
+        elif command == "getCurrentUrl":
+            value = window.get("url")
+        elif command == "get":
+            window["url"] = params["url"]
+        elif command == "quit":
+            self.quit += 1
+        elif command in ("executeScript", "executeAsyncScript"):
+            if any(isinstance(arg, dict) and arg.get("ELEMENT") in self.stale_elements for arg in params.get("args", [])):
+                return {"status": 10, "value": {"message": "stale element reference"}}
+            value = self.execute_script(params["script"], params.get("args", []))
+        elif command == "findElements":
+            value = [] if params.get("value") in self.missing_locators else [{"ELEMENT": "element-1"}]
+        elif command == "findElement":
+            value = {"ELEMENT": "element-1"}
+        return {"status": 0, "sessionId": "fake-session", "value": value}
+
+    def execute_script(self, script, args):
+        window = self.windows.get(self.current, {})
+        if "window.__pageobjects_quiescence" in script:
+            return self.quiescence.pop(0) if len(self.quiescence) > 1 else self.quiescence[0]
+        if "readyState: document.readyState" in script:
+            if self.probe is not None:
+                return self.probe
+            return {"found": True, "visible": True, "readyState": "complete", "location": window.get("url")}
+        if "window.name, document.title, document.URL" in script:
+            return [None, window.get("name"), window.get("title"), window.get("url")]
+        if "document.readyState" in script:
+            return "complete"
+        if "document.documentElement.contains" in script:
+            return True
+        if "var requests = arguments[0]" in script:
+            return dict((key, self.element_states.get(value, {"found": False, "count": 0}))
+                        for key, strategy, value in args[0])
+        return None
+
+
+def make_driver(windows=None):
+    """
+    Returns a selenium RemoteWebDriver talking to a FakeCommandExecutor
+
+    :param windows: the windows of the fake browser, see FakeCommandExecutor
+    :type windows: dict
+    :return: the driver, its executor is driver.command_executor
+    :rtype: WebDriver
+    """
+    from selenium.webdriver.remote.webdriver import WebDriver
+    return WebDriver(command_executor=FakeCommandExecutor(windows), desired_capabilities={})
+
+
+def run_robot(*suites, **options):
+    """
+    Runs robot on the given suites in a new process, with the repo and tests/robot on the python path
+    Every run gets its own working directory
+
+    :param suites: the paths of the suites, relative to tests/robot
+    :type suites: strings
+    :param options: extra robot options(ex. variable="NAME:value")
+    :return: the return code and the console output
+    :rtype: tuple of (int, str)
+    """
+    robot_dir = os.path.join(TESTS_DIR, "robot")
+    command = [sys.executable, "-m", "robot", "--output", "NONE", "--report", "NONE", "--log", "NONE",
+               "--pythonpath", REPO_DIR, "--pythonpath", robot_dir, "--console", "verbose"]
+    for name, value in sorted(options.items()):
+        command.extend(["--%s" % name, value])
+    command.extend(os.path.join(robot_dir, suite) for suite in suites)
+    env = dict(os.environ)
+    env.pop("PABOTEXECUTIONPOOLID", None)
+    env.pop("PO_WORKER_ID", None)
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env,
+                               cwd=tempfile.mkdtemp(dir=WORK_DIR))
+    output = process.communicate()[0]
+    return process.returncode, output
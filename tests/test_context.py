@@ -0,0 +1,51 @@
+import unittest
+
+import support
+from pageobjects.context import Context
+from robot.running.context import EXECUTION_CONTEXTS
+
+
+class FakeExecutionContext(object):
+    """
+    Stands in for robot's _ExecutionContext, only the namespace is looked at
+    """
+    namespace = object()
+
+
+class InRobotTest(unittest.TestCase):
+    def tearDown(self):
+        del EXECUTION_CONTEXTS._contexts[:]
+        Context.in_robot()
+
+    def _counters_after(self, func, *args):
+        before = Context.get_counters()
+        func(*args)
+        after = Context.get_counters()
+        return dict((name, after[name] - before[name]) for name in after)
+
+    def _check(self, times):
+        for _ in range(times):
+            Context.in_robot()
+
+    def test_not_in_robot_without_an_execution_context(self):
+        self.assertFalse(Context.in_robot())
+
+    def test_answer_is_cached_per_execution_context(self):
+        Context.in_robot()
+        self.assertEqual(self._counters_after(self._check, 5),
+                         {"in_robot_checks": 5, "in_robot_evaluations": 0, "variable_copies": 0})
+
+    def test_new_execution_context_is_evaluated_once(self):
+        EXECUTION_CONTEXTS._contexts.append(FakeExecutionContext())
+        self.assertEqual(self._counters_after(self._check, 3)["in_robot_evaluations"], 1)
+        self.assertTrue(Context.in_robot())
+
+    def test_answer_changes_when_robot_stops_the_context(self):
+        EXECUTION_CONTEXTS._contexts.append(FakeExecutionContext())
+        self.assertTrue(Context.in_robot())
+        EXECUTION_CONTEXTS._contexts.pop()
+        self.assertFalse(Context.in_robot())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import support
+from pageobjects import Page
+
+
+class ElementStatesTestPage(Page):
+    uri = "/element-states"
+
+
+class ElementStatesTest(unittest.TestCase):
+    def setUp(self):
+        self.page = ElementStatesTestPage()
+        self.driver = support.make_driver()
+        self.executor = self.driver.command_executor
+        self.executor.element_states = {
+            "h1": {"found": True, "count": 1, "text": "Welcome", "attributes": {"class": "banner"}},
+            "user": {"found": True, "count": 2, "text": "", "attributes": {"class": None}},
+        }
+        self.page._cache.register(self.driver, "element-states")
+        del self.executor.commands[:]
+
+    def _bulk_scripts(self):
+        return [params for command, params in self.executor.commands
+                if command == "executeScript" and "var requests = arguments[0]" in params["script"]]
+
+    def _script_requests(self):
+        return [params["args"][0] for params in self._bulk_scripts()]
+
+    def test_locators_the_script_resolves_are_read_in_one_call(self):
+        states = self.page.get_element_states("title", "missing", "login_form.user")
+        self.assertEqual(self._script_requests(), [[["title", "css", "h1"], ["missing", "id", "missing"],
+                                                    ["login_form.user", "id", "user"]]])
+        self.assertEqual(states.keys(), ["title", "missing", "login_form.user"])
+        self.assertEqual(states["login_form.user"]["count"], 2)
+        self.assertFalse(states["missing"]["found"])
+        self.assertEqual(self.executor.count("findElements"), 0)
+
+    def test_groups_are_expanded_and_other_strategies_are_read_with_s2l(self):
+        states = self.page.get_element_states("login form")
+        self.assertEqual(states.keys(), ["login_form.remember", "login_form.user"])
+        self.assertEqual(self._script_requests(), [[["login_form.user", "id", "user"]]])
+        # Selenium2Library resolves the dom locator with its own script ##
+        self.assertEqual(self.executor.count("executeScript"), 2)
+        self.assertFalse(states["login_form.remember"]["found"])
+        self.assertEqual(states["login_form.user"]["count"], 2)
+
+    def test_texts_and_attributes_are_reported_per_key(self):
+        self.assertEqual(self.page.get_texts_for_locators("title", "missing").items(),
+                         [("title", "Welcome"), ("missing", None)])
+        self.assertEqual(self.page.get_attributes_for_locators("class", "title").items(), [("title", "banner")])
+        self.assertEqual([params["args"][1] for params in self._bulk_scripts()], [[], ["class"]])
+
+    def test_unknown_key_is_reported_instead_of_failing(self):
+        states = self.page.get_element_states("no such key", "title")
+        self.assertFalse(states["no such key"]["found"])
+        self.assertIn("LOCATOR ERROR", states["no such key"]["error"])
+        self.assertTrue(states["title"]["found"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+import unittest
+
+import support
+from pageobjects import Page
+from pageobjects.keywordmanager import KeywordManager
+from robot.api.deco import keyword
+
+
+class DispatchTestPage(Page):
+    uri = "/dispatch"
+
+    def open_dispatch_menu(self):
+        return "menu"
+
+    @keyword("Select ${item} On ${pagename}")
+    def select_item(self, item, pagename="Dispatch Test Page"):
+        return item
+
+    def returns_nothing(self):
+        return None
+
+    def fill_dispatch_form(self, name, count=1, *values, **options):
+        """
+        Fills the form, this keyword is not a wrapper of S2L
+        """
+
+
+class NormalizedDispatchTest(unittest.TestCase):
+    def setUp(self):
+        self.page = DispatchTestPage()
+
+    def _def_name(self, robot_name):
+        return KeywordManager().get_meth_mapping_from_robot_alias(self.page, robot_name).def_name
+
+    def test_names_are_matched_ignoring_case_spaces_and_underscores(self):
+        for robot_name in ("Open Dispatch Menu", "open_dispatch_menu", "OPENDISPATCHMENU", "open dispatch_Menu"):
+            self.assertEqual(self._def_name(robot_name), "open_dispatch_menu")
+
+    def test_pagename_is_substituted_into_the_keyword_name(self):
+        self.assertIn("Select ${item} On Dispatch Test Page", self.page.get_keyword_names())
+
+    def test_embedded_arguments_fall_back_to_the_compiled_matcher(self):
+        self.assertEqual(self._def_name("Select Reports On Dispatch Test Page"), "select_item")
+        self.assertEqual(self.page.run_keyword("Select Reports On Dispatch Test Page", [], {}), "Reports")
+
+    def test_unknown_keyword_is_reported(self):
+        with self.assertRaises(Exception) as raised:
+            self._def_name("Close Dispatch Menu")
+        self.assertEqual(str(raised.exception), "Keyword, Close Dispatch Menu, not found in pages")
+
+
+class KeywordMetadataTest(unittest.TestCase):
+    def setUp(self):
+        self.page = DispatchTestPage()
+        self.manager = KeywordManager()
+
+    def test_argspec_is_built_once_and_handed_out_as_a_copy(self):
+        func_map = self.manager.get_meth_mapping_from_robot_alias(self.page, "Fill Dispatch Form")
+        arguments = self.page.get_keyword_arguments("Fill Dispatch Form")
+        self.assertEqual(arguments, ["name", "count=1", "*args", "**keywords"])
+        self.assertEqual(func_map.argument_spec, arguments)
+        arguments.append("changed")
+        self.assertEqual(self.page.get_keyword_arguments("fill_dispatch_form"), ["name", "count=1", "*args", "**keywords"])
+
+    def test_pagename_is_not_an_argument_of_the_keyword(self):
+        self.assertEqual(self.page.get_keyword_arguments("Select ${item} On Dispatch Test Page"), ["item"])
+
+    def test_documentation_is_processed_once(self):
+        documentation = self.page.get_keyword_documentation("Fill Dispatch Form")
+        self.assertIn("not a *wrapper* of S2L", documentation)
+        func_map = self.manager.get_meth_mapping_from_robot_alias(self.page, "Fill Dispatch Form")
+        self.assertEqual(func_map.documentation, documentation)
+        self.assertEqual(self.page.get_keyword_documentation("Open Dispatch Menu"), "")
+
+    def test_metadata_of_every_page_is_exported_as_json(self):
+        path = os.path.join(tempfile.mkdtemp(dir=support.WORK_DIR), "keywords.json")
+        metadata = self.manager.export_keyword_metadata(path)
+        with open(path) as f:
+            self.assertEqual(json.load(f), json.loads(json.dumps(metadata)))
+        page_metadata = metadata["Dispatch Test Page"]
+        self.assertEqual(page_metadata["fill_dispatch_form"]["args"], ["name", "count=1", "*args", "**keywords"])
+        self.assertEqual(page_metadata["Select ${item} On Dispatch Test Page"]["args"], ["item"])
+        self.assertEqual(page_metadata["open_dispatch_menu"], {"args": [], "doc": ""})
+
+
+class ReturnsPageTest(unittest.TestCase):
+    def setUp(self):
+        self.page = Page()
+        self.page._cache.register(support.make_driver(), "returns-page")
+
+    def test_s2l_keyword_returning_none_returns_the_page(self):
+        self.assertIs(self.page.run_keyword("Go Back", [], {}), self.page)
+
+    def test_s2l_keyword_returning_a_value_keeps_it(self):
+        self.assertEqual(self.page.run_keyword("Get Title", [], {}), "Main Page")
+
+    def test_page_keyword_returning_none_still_returns_none(self):
+        self.assertIsNone(DispatchTestPage().run_keyword("Returns Nothing", [], {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+import support
+from pageobjects import Page
+
+
+class LocatorIndexTestPage(Page):
+    uri = "/locator-index"
+
+
+class LocatorIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.page = LocatorIndexTestPage()
+        self.handler = self.page._yaml_handler
+
+    def test_nested_locators_are_found_by_dotted_key(self):
+        self.assertEqual(self.page.get_locator("login_form.user"), "id=user")
+        self.assertEqual(self.page.get_locator("login_form.buttons.submit"), "//button[@type='submit']")
+
+    def test_dotted_keys_are_normalized_like_top_level_keys(self):
+        self.assertEqual(self.page.get_locator("Login Form.Pass Word"), "css= form .password")
+        self.assertEqual(self.page.get_locator("SEARCH"), "id=search")
+
+    def test_groups_are_found_by_their_key(self):
+        self.assertEqual(self.page.get_locator("login_form.buttons"), {"submit": "//button[@type='submit']"})
+
+    def test_locators_are_parsed_once_into_strategy_and_value(self):
+        self.assertEqual(self.handler.get_parsed_locator("login form.pass word"), ("css", "form .password"))
+        self.assertEqual(self.handler.get_parsed_locator("login_form.buttons.submit"),
+                         ("xpath", "//button[@type='submit']"))
+        self.assertEqual(self.handler.get_parsed_locator("search"), ("id", "search"))
+
+    def test_group_holds_every_locator_under_it(self):
+        self.assertTrue(self.handler.is_locator_group("login form"))
+        self.assertFalse(self.handler.is_locator_group("search"))
+        self.assertEqual(self.handler.get_locator_group("login form"), {
+            "login_form.user": "id=user",
+            "login_form.pass_word": "css= form .password",
+            "login_form.buttons.submit": "//button[@type='submit']",
+        })
+
+    def test_missing_and_empty_locators_are_reported(self):
+        with self.assertRaises(Exception) as raised:
+            self.page.get_locator("login_form.remember_me")
+        self.assertEqual(str(raised.exception), "LOCATOR ERROR: no locator found with name login_form.remember_me")
+        self.assertFalse(self.handler.has_locator("empty"))
+        with self.assertRaises(Exception) as raised:
+            self.page.get_locator("empty")
+        self.assertIn("with no value assigned", str(raised.exception))
+        with self.assertRaises(Exception):
+            self.handler.get_parsed_locator("login_form")
+        with self.assertRaises(Exception):
+            self.handler.get_locator_group("search")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import logging
+import os
+import unittest
+
+import support
+from pageobjects import Logger
+
+
+class LoggerTest(unittest.TestCase):
+    def tearDown(self):
+        Logger.shutdown_logging()
+        os.environ.pop("PO_LOG_QUEUE", None)
+
+    def _read_log(self):
+        with open("po_log.txt") as f:
+            return f.read()
+
+    def test_records_go_to_the_logger_logger_and_propagate(self):
+        Logger.shutdown_logging()
+        records = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        logging.getLogger().addHandler(handler)
+        try:
+            Logger().log("propagated %s", "INFO", False, args=("message",))
+        finally:
+            logging.getLogger().removeHandler(handler)
+        self.assertEqual([(record.name, record.getMessage()) for record in records], [("Logger", "propagated message")])
+
+    def test_shutdown_writes_the_queued_records(self):
+        Logger.shutdown_logging()
+        os.environ["PO_LOG_QUEUE"] = "True"
+        logger = Logger()
+        for index in range(100):
+            logger.log("queued message %s", "INFO", False, args=(index,))
+        Logger.shutdown_logging()
+        self.assertIn("queued message 99", self._read_log())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+import support
+from pageobjects.manifest import Manifest, build_manifest, check_manifest
+
+PAGE_SOURCE = """from pageobjects import Page
+
+
+class %(name)s(Page):
+    uri = "/%(module)s"
+"""
+
+
+class ManifestCompanionTest(unittest.TestCase):
+    def setUp(self):
+        self.package_dir = tempfile.mkdtemp(dir=support.WORK_DIR)
+        self.package = "manifestpages%s" % os.path.basename(self.package_dir).replace("-", "").replace("_", "")
+        os.mkdir(os.path.join(self.package_dir, self.package))
+        with open(os.path.join(self.package_dir, self.package, "__init__.py"), "w"):
+            pass
+        self.module_path = os.path.join(self.package_dir, self.package, "homepage.py")
+        with open(self.module_path, "w") as f:
+            f.write(PAGE_SOURCE % {"name": "ManifestHomePage", "module": "home"})
+        with open(self._companion(".yaml"), "w") as f:
+            f.write("search: id=search\n")
+        sys.path.insert(0, self.package_dir)
+        self.manifest_path = os.path.join(self.package_dir, "po_manifest.json")
+        self.data = build_manifest([self.package], self.manifest_path)
+        self.page_class = sys.modules[self.package + ".homepage"].ManifestHomePage
+
+    def tearDown(self):
+        sys.path.remove(self.package_dir)
+
+    def _companion(self, extension):
+        return os.path.splitext(self.module_path)[0] + extension
+
+    def _get_entry(self):
+        manifest = Manifest()
+        # A new manifest load, like the next process would do ##
+        manifest._path = None
+        self.assertTrue(manifest.load(self.manifest_path))
+        return manifest.get_page(self.page_class.__new__(self.page_class))
+
+    def test_present_and_absent_companions_are_recorded(self):
+        companions = self.data["pages"]["%s.homepage.ManifestHomePage" % self.package]["companions"]
+        self.assertIsNotNone(companions[os.path.join(self.package, "homepage.yaml")])
+        self.assertIsNone(companions[os.path.join(self.package, "homepage.robot")])
+        self.assertIsNotNone(self._get_entry())
+
+    def test_added_companion_makes_the_page_stale(self):
+        with open(self._companion(".robot"), "w") as f:
+            f.write("*** Keywords ***\n")
+        self.assertIsNone(self._get_entry())
+        self.assertEqual(check_manifest(self.manifest_path), [self._companion(".robot")])
+
+    def test_removed_companion_makes_the_page_stale(self):
+        os.remove(self._companion(".yaml"))
+        self.assertIsNone(self._get_entry())
+
+    def test_changed_companion_makes_the_page_stale(self):
+        with open(self._companion(".yaml"), "w") as f:
+            f.write("search: id=query\n")
+        later = time.time() + 10
+        os.utime(self._companion(".yaml"), (later, later))
+        self.assertIsNone(self._get_entry())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+import unittest
+
+import support
+from pageobjects import Page
+from pageobjects.metrics import Histogram, Metrics
+from pageobjects.monkeypatches import do_monkeypatches
+from robot.api.deco import keyword
+
+
+class MetricsTestPage(Page):
+    name = "Metrics \"Test\" Page"
+    uri = "/metrics"
+
+    @keyword("Read Title ${times} Times")
+    def read_title(self, times):
+        for _ in range(int(times)):
+            self._current_browser().title
+
+    def fail_after_reading_url(self):
+        self._current_browser().current_url
+        raise ValueError("keyword failed")
+
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self):
+        do_monkeypatches()
+        self.output_dir = tempfile.mkdtemp(dir=support.WORK_DIR)
+        self.json_path = os.path.join(self.output_dir, "metrics.json")
+        self.prometheus_path = os.path.join(self.output_dir, "metrics.prom")
+        os.environ.update({"PO_METRICS": "True", "PO_METRICS_JSON": self.json_path,
+                           "PO_METRICS_PROMETHEUS": self.prometheus_path})
+        try:
+            self.page = MetricsTestPage()
+        finally:
+            for name in ("PO_METRICS", "PO_METRICS_JSON", "PO_METRICS_PROMETHEUS"):
+                os.environ.pop(name, None)
+        self.driver = support.make_driver()
+        self.page._cache.register(self.driver, "metrics")
+        self.metrics = Metrics()
+        self.metrics.reset()
+
+    def _keyword_results(self):
+        return dict((result["keyword"], result) for result in self.metrics.get_results()["keyword"])
+
+    def test_driver_commands_are_counted_per_keyword(self):
+        self.page.run_keyword("Read Title 2 Times", [], {})
+        self.page.run_keyword("Read Title 3 Times", [], {})
+        result = self._keyword_results()["Read Title ${times} Times"]
+        self.assertEqual(result["page"], self.page.name)
+        self.assertEqual(result["command_counts"], {"getTitle": 5})
+        self.assertEqual(result["driver_commands"]["count"], 2)
+        self.assertEqual(result["driver_commands"]["sum"], 5)
+        self.assertEqual(result["failures"], 0)
+
+    def test_failing_keyword_is_recorded_as_a_failure(self):
+        # Outside of robot failing the keyword raises RobotNotRunningError ##
+        with self.assertRaises(Exception):
+            self.page.run_keyword("Fail After Reading Url", [], {})
+        result = self._keyword_results()["fail_after_reading_url"]
+        self.assertEqual(result["failures"], 1)
+        self.assertEqual(result["command_counts"], {"getCurrentUrl": 1})
+        self.assertEqual(self.metrics._frames, [])
+
+    def test_commands_outside_of_keywords_are_unattributed(self):
+        self.driver.title
+        self.assertEqual(self.metrics.get_results()["unattributed"]["command_counts"], {"getTitle": 1})
+
+    def test_keywords_are_aggregated_per_test(self):
+        self.metrics.start_test("Login", {"longname": "Suite.Login"})
+        self.page.run_keyword("Read Title 1 Times", [], {})
+        self.metrics.end_test("Login", {})
+        self.page.run_keyword("Read Title 1 Times", [], {})
+        tests = [(result["test"], result["driver_commands"]["sum"]) for result in self.metrics.get_results()["test"]]
+        self.assertEqual(tests, [("", 1), ("Suite.Login", 1)])
+
+    def test_results_are_written_at_the_end_of_each_suite(self):
+        self.page.run_keyword("Read Title 1 Times", [], {})
+        self.metrics.end_suite("Suite", {"id": "s1", "endtime": "20261018 10:00:00.000"})
+        with open(self.json_path) as f:
+            self.assertEqual(json.load(f), json.loads(json.dumps(self.metrics.get_results())))
+        with open(self.prometheus_path) as f:
+            prometheus = f.read()
+        self.assertIn('pageobjects_keyword_driver_commands_bucket{page="Metrics \\"Test\\" Page",'
+                      'keyword="Read Title ${times} Times",le="1"} 1', prometheus)
+        self.assertIn("pageobjects_unattributed_driver_commands_total 0", prometheus)
+        os.remove(self.json_path)
+        # Every page library is a listener, the same suite end is written once ##
+        self.metrics.end_suite("Suite", {"id": "s1", "endtime": "20261018 10:00:00.000"})
+        self.assertFalse(os.path.exists(self.json_path))
+
+    def test_pages_without_the_option_are_not_timed(self):
+        self.assertIsNone(Page()._metrics)
+
+
+class HistogramTest(unittest.TestCase):
+    def test_values_are_counted_into_cumulative_buckets(self):
+        histogram = Histogram((1, 5))
+        for value in (0, 1, 3, 9):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [(1, 2), (5, 3), ("+Inf", 4)])
+        self.assertEqual((histogram.count, histogram.sum, histogram.max), (4, 13, 9))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import support
+from Selenium2Library.locators.windowmanager import WindowManager
+from pageobjects.monkeypatches import do_monkeypatches, configure_window_info, get_document_generation
+
+WINDOWS = {"window-1": {"name": "main", "title": "Main Page", "url": "http://localhost/main"},
+           "window-2": {"name": "popup", "title": "Popup Page", "url": "http://localhost/popup"}}
+
+
+class WindowInfoCacheTest(unittest.TestCase):
+    def setUp(self):
+        do_monkeypatches()
+        self.driver = support.make_driver(dict((handle, dict(info)) for handle, info in WINDOWS.items()))
+        self.executor = self.driver.command_executor
+
+    def tearDown(self):
+        configure_window_info(True, 0)
+
+    def _select_back_and_forth(self, times):
+        manager = WindowManager()
+        for _ in range(times):
+            manager.select(self.driver, "title=Popup Page")
+            manager.select(self.driver, "title=Main Page")
+
+    def test_window_switches_do_not_invalidate_the_cache(self):
+        configure_window_info(True, 60)
+        self._select_back_and_forth(3)
+        # One info script per window, every later select is answered from the cache ##
+        self.assertEqual(self.executor.count("executeScript"), 2)
+
+    def test_without_cache_every_select_reads_the_window_info(self):
+        configure_window_info(True, 0)
+        self._select_back_and_forth(3)
+        self.assertEqual(self.executor.count("executeScript"), 9)
+
+    def test_commands_that_may_change_the_document_invalidate_the_cache(self):
+        configure_window_info(True, 60)
+        self._select_back_and_forth(1)
+        self.driver.execute_script("document.title = 'Changed';")
+        self.executor.windows["window-2"]["title"] = "Changed"
+        WindowManager().select(self.driver, "title=Changed")
+        self.assertEqual(self.driver.current_window_handle, "window-2")
+
+    def test_window_info_scripts_do_not_bump_the_document_generation(self):
+        configure_window_info(True, 60)
+        generation = get_document_generation(self.driver)
+        self.driver.get_current_window_info()
+        self.assertEqual(get_document_generation(self.driver), generation)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import unittest
+
+import support
+from pageobjects import Page, OptionHandler
+
+
+class FirstOptionsPage(Page):
+    uri = "/first"
+    options = {"baseurl": "http://a", "selenium_speed": 1}
+
+
+class SecondOptionsPage(Page):
+    uri = "/second"
+    options = {"baseurl": "http://b", "selenium_speed": 2}
+
+
+class ChildOptionsPage(FirstOptionsPage):
+    options = {"selenium_speed": 3}
+
+
+class OptionHandlerTest(unittest.TestCase):
+    def test_pages_of_one_module_keep_their_own_options(self):
+        first = FirstOptionsPage()
+        second = SecondOptionsPage()
+        self.assertEqual(first._option_handler.get("baseurl"), "http://a")
+        self.assertEqual(first._option_handler.get("selenium_speed"), 1)
+        self.assertEqual(second._option_handler.get("baseurl"), "http://b")
+        self.assertEqual(OptionHandler(first).get("selenium_speed"), 1)
+
+    def test_child_options_override_the_parent_options(self):
+        handler = OptionHandler(ChildOptionsPage())
+        self.assertEqual(handler.get("selenium_speed"), 3)
+        self.assertEqual(handler.get("baseurl"), "http://a")
+
+    def test_layers_are_resolved_in_order(self):
+        os.environ.update({"PO_BASEURL": "http://env", "PO_OPTION_HANDLER_TEST": "env"})
+        try:
+            handler = OptionHandler(FirstOptionsPage())
+            self.assertEqual(handler.get("baseurl"), "http://a")
+            self.assertEqual(handler.get("option handler test"), "env")
+            self.assertEqual(handler.get("option_handler_missing", "default"), "default")
+        finally:
+            for name in ("PO_BASEURL", "PO_OPTION_HANDLER_TEST"):
+                os.environ.pop(name, None)
+
+
+if __name__ == "__main__":
+    unittest.main()
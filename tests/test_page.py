@@ -0,0 +1,159 @@
+import os
+import unittest
+
+import support
+from pageobjects import Page
+from pageobjects.monkeypatches import do_monkeypatches
+from pageobjects.roundtrips import RoundTripRecorder
+from robot.api.deco import keyword
+
+
+class ElementCacheTestPage(Page):
+    uri = "/element-cache"
+
+
+class ElementCacheTest(unittest.TestCase):
+    def setUp(self):
+        do_monkeypatches()
+        os.environ["PO_ELEMENT_CACHE"] = "True"
+        try:
+            self.page = ElementCacheTestPage()
+        finally:
+            os.environ.pop("PO_ELEMENT_CACHE", None)
+        self.driver = support.make_driver()
+        self.executor = self.driver.command_executor
+        self.page._cache.register(self.driver, "element-cache")
+        del self.executor.commands[:]
+
+    def test_hit_costs_one_attachment_check(self):
+        first = self.page._element_find("id=login", True, True)
+        second = self.page._element_find("id=login", True, True)
+        self.assertIs(first, second)
+        self.assertEqual(self.executor.count("findElements"), 1)
+        self.assertEqual(self.executor.count("executeScript"), 1)
+        self.assertEqual(self.page.get_element_cache_stats(), {"hits": 1, "misses": 1, "stale": 0})
+
+    def test_elements_removed_by_the_page_are_found_again(self):
+        first = self.page._element_find("id=login", True, True)
+        # Removed by the page itself, no command of this client changed the document ##
+        self.executor.stale_elements.add(first.id)
+        second = self.page._element_find("id=login", True, True)
+        self.assertIsNot(first, second)
+        self.assertEqual(self.executor.count("findElements"), 2)
+        self.assertEqual(self.page.get_element_cache_stats(), {"hits": 0, "misses": 1, "stale": 1})
+
+    def test_presence_checks_and_waits_skip_the_cache(self):
+        self.page._element_find("id=spinner", True, True)
+        self.executor.missing_locators.add("spinner")
+        self.page.wait_until_page_does_not_contain_element("id=spinner", 1)
+        self.assertEqual(self.page.get_element_cache_stats(), {"hits": 0, "misses": 1, "stale": 0})
+
+    def test_commands_that_may_change_the_document_make_elements_stale(self):
+        self.page._element_find("id=login", True, True)
+        self.driver.execute_script("document.body.innerHTML = '';")
+        self.page._element_find("id=login", True, True)
+        self.assertEqual(self.executor.count("findElements"), 2)
+        self.assertEqual(self.page.get_element_cache_stats()["stale"], 1)
+
+    def test_read_only_commands_keep_elements(self):
+        self.page._element_find("id=login", True, True)
+        self.driver.title
+        self.driver.current_url
+        self.page._element_find("id=login", True, True)
+        self.assertEqual(self.executor.count("findElements"), 1)
+
+
+class RoundTripTestPage(Page):
+    uri = "/round-trips"
+
+    @keyword("Read Title ${times} Times")
+    def read_title(self, times):
+        for _ in range(int(times)):
+            self._current_browser().title
+
+
+class RoundTripBudgetTest(unittest.TestCase):
+    def setUp(self):
+        os.environ.update({"PO_ROUNDTRIP_BUDGET": "2", "PO_ROUNDTRIP_ACTION": "fail"})
+        try:
+            self.page = RoundTripTestPage()
+        finally:
+            for name in ("PO_ROUNDTRIP_BUDGET", "PO_ROUNDTRIP_ACTION"):
+                os.environ.pop(name, None)
+        self.page._cache.register(support.make_driver(), "round-trips")
+        self.recorder = RoundTripRecorder()
+
+    def test_keyword_within_budget_is_recorded_once(self):
+        records = len(self.recorder._records)
+        self.page.run_keyword("Read Title 2 Times", [], {})
+        self.assertEqual(len(self.recorder._records), records + 1)
+        self.assertEqual(self.recorder.get_last_record().count, 2)
+        self.assertEqual(self.recorder._running, [])
+
+    def test_keyword_over_budget_fails_after_it_ended(self):
+        records = len(self.recorder._records)
+        # Outside of robot failing the keyword raises RobotNotRunningError ##
+        with self.assertRaises(Exception):
+            self.page.run_keyword("Read Title 3 Times", [], {})
+        self.assertEqual(len(self.recorder._records), records + 1)
+        self.assertEqual(self.recorder.get_last_record().count, 3)
+        self.assertEqual(self.recorder._running, [])
+
+    def test_keyword_with_bad_arguments_ends_its_record(self):
+        with self.assertRaises(Exception):
+            self.page.run_keyword("Read Title many Times", [], {})
+        self.assertEqual(self.recorder._running, [])
+
+
+class NewWindowTestPage(Page):
+    uri = "/new-window"
+
+
+class SelectNewWindowTest(unittest.TestCase):
+    def setUp(self):
+        self.page = NewWindowTestPage()
+        self.driver = support.make_driver()
+        self.executor = self.driver.command_executor
+        self.page._cache.register(self.driver, "new-window")
+        self.page.snapshot_window_handles()
+
+    def _open_window(self, handle, name, title):
+        self.executor.windows[handle] = {"name": name, "title": title, "url": "http://localhost/%s" % name}
+        self.executor.handles.append(handle)
+
+    def test_single_new_window_is_selected_without_reading_its_info(self):
+        self._open_window("window-2", "help", "Help Page")
+        self.page.select_new_window("title=Other Page", timeout=1)
+        self.assertEqual(self.executor.current, "window-2")
+        self.assertEqual(self.executor.count("executeScript"), 0)
+
+    def test_several_new_windows_are_matched_like_select_window(self):
+        self._open_window("window-2", "help", "Help Page")
+        self._open_window("window-3", "about", "About Page")
+        self.page.select_new_window("title=  about page ", timeout=1)
+        self.assertEqual(self.executor.current, "window-3")
+
+    def test_original_window_stays_selected_when_no_window_matches(self):
+        self._open_window("window-2", "help", "Help Page")
+        self._open_window("window-3", "about", "About Page")
+        with self.assertRaises(Exception):
+            self.page.select_new_window("Other Page", timeout=1)
+        self.assertEqual(self.executor.current, "window-1")
+
+
+class FailingKeywordTestPage(Page):
+    uri = "/failing"
+
+    def fail_with_value_error(self):
+        raise ValueError("keyword failed")
+
+
+class FailingKeywordTest(unittest.TestCase):
+    def test_first_failing_keyword_keeps_its_error(self):
+        page = FailingKeywordTestPage()
+        with self.assertRaises(ValueError):
+            page.fail_with_value_error()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+import support
+from pageobjects import Page
+
+
+class ProbeTestPage(Page):
+    uri = "/dashboard"
+
+
+class PageProbeTest(unittest.TestCase):
+    def setUp(self):
+        self.page = ProbeTestPage()
+        self.driver = support.make_driver({"window-1": {"name": "main", "title": "Dashboard",
+                                                        "url": "http://localhost/dashboard"}})
+        self.executor = self.driver.command_executor
+        self.page._cache.register(self.driver, "probe")
+        del self.executor.commands[:]
+
+    def _page_load_error(self):
+        with self.assertRaises(Exception) as raised:
+            self.page.current_page_should_be(timeout=0.1)
+        return str(raised.exception)
+
+    def test_loaded_page_is_checked_in_one_round_trip(self):
+        self.assertIs(self.page.current_page_should_be(timeout=1), self.page)
+        self.assertEqual(self.executor.count("executeScript"), 1)
+        self.assertEqual(self.executor.count("findElements"), 0)
+
+    def test_missing_master_locator_is_reported(self):
+        self.executor.probe = {"found": False, "visible": False, "readyState": "complete", "location": None}
+        self.assertEqual(self._page_load_error(),
+                         "PAGE LOAD ERROR: Element locator 'id=main' did not match any elements after 100 milliseconds")
+
+    def test_hidden_master_locator_is_reported(self):
+        self.executor.probe = {"found": True, "visible": False, "readyState": "complete", "location": None}
+        self.assertIn("Element 'id=main' was not visible", self._page_load_error())
+
+    def test_incomplete_document_is_reported(self):
+        self.executor.probe = {"found": True, "visible": True, "readyState": "loading", "location": None}
+        self.assertIn("Document readyState was 'loading' instead of 'complete'", self._page_load_error())
+
+    def test_wrong_location_fails_the_uri_assertion(self):
+        self.executor.probe = {"found": True, "visible": True, "readyState": "complete",
+                               "location": "http://localhost/login"}
+        self.assertIn("Expected page uri to contain /dashboard", self._page_load_error())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+import support
+from pageobjects import Page, PageRegistry
+from pageobjects.exceptions import PageNotFoundError
+
+
+class RegistryHomePage(Page):
+    uri = "/home"
+
+
+class RegistryNamedPage(Page):
+    name = "Registry Landing"
+    uri = "/landing"
+
+
+class RegistryDuplicatePage(Page):
+    name = "Registry Landing"
+    uri = "/duplicate"
+
+
+class PageRegistryTest(unittest.TestCase):
+    def test_pages_register_when_they_are_defined(self):
+        self.assertIs(PageRegistry().get_page_class("Registry Home Page"), RegistryHomePage)
+        self.assertIs(PageRegistry().get_page_class("Registry Landing"), RegistryNamedPage)
+
+    def test_page_class_itself_is_not_registered(self):
+        self.assertNotIn("Page", PageRegistry().get_page_names())
+
+    def test_first_page_registered_under_a_name_wins(self):
+        self.assertIs(PageRegistry().get_page_class("Registry Landing"), RegistryNamedPage)
+
+    def test_unknown_page_lists_near_misses(self):
+        with self.assertRaises(PageNotFoundError) as raised:
+            PageRegistry().get_page_class("Registry Home Pgae")
+        self.assertEqual(str(raised.exception), "PAGE ERROR: No page found with name 'Registry Home Pgae'. "
+                                                "Did you mean: 'Registry Home Page'?")
+
+    def test_unknown_page_without_near_misses(self):
+        with self.assertRaises(PageNotFoundError) as raised:
+            PageRegistry().get_page_class("Something Else Entirely")
+        self.assertNotIn("Did you mean", str(raised.exception))
+
+    def test_go_to_unknown_page_fails_before_using_the_browser(self):
+        with self.assertRaises(PageNotFoundError):
+            RegistryHomePage().go_to_page("Registry Home Pgae")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,14 @@
+import unittest
+
+import support
+from pageobjects import parallelharness
+
+
+class ParallelHarnessTest(unittest.TestCase):
+    def test_workers_do_not_interfere(self):
+        problems = parallelharness.run(workers=2, messages=20)
+        self.assertEqual(problems, [], "\n".join(problems))
+
+
+if __name__ == "__main__":
+    unittest.main()
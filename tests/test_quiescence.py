@@ -0,0 +1,145 @@
+import json
+import os
+import subprocess
+import unittest
+from distutils.spawn import find_executable
+
+import support
+from pageobjects import Page
+from pageobjects.page import QUIESCENCE_SCRIPT
+
+NODE = find_executable("node")
+
+# Runs the quiescence script against a stub window, firing its timers and finishing its requests by hand ##
+NODE_HARNESS = """
+var vm = require('vm');
+var timers = [], xhrs = [], fetches = [], clock = 1000;
+function XMLHttpRequest() { this.listeners = {}; }
+XMLHttpRequest.prototype.addEventListener = function (name, listener) { this.listeners[name] = listener; };
+XMLHttpRequest.prototype.send = function (body) {
+    if (body === 'throw') { throw new Error('send failed'); }
+    xhrs.push(this);
+};
+function FakeDate() { this.getTime = function () { return clock; }; }
+var window = {
+    XMLHttpRequest: XMLHttpRequest,
+    fetch: function (url) {
+        if (url === 'throw') { throw new TypeError('bad url'); }
+        return new Promise(function (resolve) { fetches.push(resolve); });
+    },
+    setTimeout: function (callback, delay) { timers.push(callback); return timers.length; },
+    clearTimeout: function () {},
+    document: {readyState: 'complete'},
+    Date: FakeDate, Math: Math, Array: Array, Promise: Promise
+};
+window.window = window;
+var context = vm.createContext(window);
+var check = vm.runInContext('(function () {' + %(script)s + '})', context);
+var results = {};
+function run(name) { results[name] = check(1000); }
+
+run('installed');
+var shortTimer = window.setTimeout(function () {}, 10);
+window.setTimeout(function () {}, 5000);
+run('short_timer_pending');
+timers[shortTimer - 1]();
+run('short_timer_fired');
+var xhr = new window.XMLHttpRequest();
+xhr.send();
+run('xhr_in_flight');
+xhr.listeners.loadend();
+try { new window.XMLHttpRequest().send('throw'); } catch (e) {}
+run('xhr_done');
+try { window.fetch('throw'); } catch (e) {}
+run('fetch_thrown');
+window.fetch('http://localhost/api');
+run('fetch_in_flight');
+clock += 700;
+run('busy_page_is_not_idle');
+fetches[0]({});
+setImmediate(function () {
+    clock += 300;
+    run('fetch_done');
+    console.log(JSON.stringify(results));
+});
+"""
+
+
+class QuiescenceTestPage(Page):
+    uri = "/quiescence"
+
+
+class WaitForPageQuiescenceTest(unittest.TestCase):
+    def setUp(self):
+        self.page = QuiescenceTestPage()
+        self.driver = support.make_driver()
+        self.executor = self.driver.command_executor
+        self.page._cache.register(self.driver, "quiescence")
+        del self.executor.commands[:]
+
+    def _state(self, idle, requests=0, timers=0, animations=0, ready_state="complete"):
+        return {"requests": requests, "timers": timers, "animations": animations, "readyState": ready_state,
+                "idle": idle}
+
+    def test_waits_until_the_page_stayed_idle_long_enough(self):
+        self.executor.quiescence = [self._state(0, requests=1), self._state(20), self._state(120)]
+        self.assertIs(self.page.wait_for_page_quiescence(idle_time=0.1, timeout=2, timer_threshold="250"), self.page)
+        self.assertEqual(self.executor.count("executeScript"), 3)
+        self.assertEqual(self.executor.commands[0][1]["args"], [250])
+
+    def test_busy_page_is_reported_with_its_counters(self):
+        self.executor.quiescence = [self._state(0, requests=2, timers=1, ready_state="interactive")]
+        with self.assertRaises(Exception) as raised:
+            self.page.wait_for_page_quiescence(idle_time=0.1, timeout=0.3)
+        self.assertEqual(str(raised.exception),
+                         "PAGE LOAD ERROR: page was not idle for 100 milliseconds after 300 milliseconds: 2 requests, "
+                         "1 timers, 0 animations in flight, readyState 'interactive'")
+
+    def test_defaults_come_from_the_options(self):
+        os.environ.update({"PO_QUIESCENCE_IDLE_TIME": "2 seconds", "PO_QUIESCENCE_TIMER_THRESHOLD": "300"})
+        try:
+            self.executor.quiescence = [self._state(1500), self._state(2000)]
+            self.page.wait_for_page_quiescence(timeout=5)
+        finally:
+            for name in ("PO_QUIESCENCE_IDLE_TIME", "PO_QUIESCENCE_TIMER_THRESHOLD"):
+                os.environ.pop(name, None)
+        self.assertEqual(self.executor.count("executeScript"), 2)
+        self.assertEqual(self.executor.commands[0][1]["args"], [300])
+
+
+@unittest.skipUnless(NODE, "node is needed to run the quiescence script")
+class QuiescenceScriptTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        harness = NODE_HARNESS % {"script": json.dumps(QUIESCENCE_SCRIPT)}
+        process = subprocess.Popen([NODE, "-e", harness], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        output = process.communicate()[0]
+        if process.returncode:
+            raise AssertionError(output)
+        cls.results = json.loads(output)
+
+    def _counters(self, name):
+        result = self.results[name]
+        return result["requests"], result["timers"]
+
+    def test_only_timers_up_to_the_threshold_count(self):
+        self.assertEqual(self._counters("installed"), (0, 0))
+        self.assertEqual(self._counters("short_timer_pending"), (0, 1))
+        self.assertEqual(self._counters("short_timer_fired"), (0, 0))
+
+    def test_requests_count_until_they_end(self):
+        self.assertEqual(self._counters("xhr_in_flight"), (1, 0))
+        self.assertEqual(self._counters("xhr_done"), (0, 0))
+        self.assertEqual(self._counters("fetch_in_flight"), (1, 0))
+        self.assertEqual(self._counters("fetch_done"), (0, 0))
+
+    def test_fetch_that_throws_is_not_left_in_flight(self):
+        self.assertEqual(self._counters("fetch_thrown"), (0, 0))
+
+    def test_idle_time_restarts_while_the_page_is_busy(self):
+        self.assertEqual(self.results["busy_page_is_not_idle"]["idle"], 0)
+        self.assertEqual(self.results["fetch_done"]["idle"], 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+import support
+
+
+class RobotTest(unittest.TestCase):
+    """
+    Runs the suites in tests/robot through robot, each in its own process
+    """
+    def assertSuitePasses(self, *suites, **options):
+        rc, output = support.run_robot(*suites, **options)
+        self.assertEqual(rc, 0, output)
+        self.assertNotIn("[ ERROR ]", output, output)
+        return output
+
+    def test_embedded_arguments(self):
+        self.assertSuitePasses("embedded_arguments.robot")
+
+    def test_lazy_page_init(self):
+        self.assertSuitePasses("lazy_page_init.robot")
+
+    def test_resource_import_report(self):
+        self.assertSuitePasses("resource_import_report.robot")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import support
+from Selenium2Library.utils import BrowserCache
+from pageobjects.monkeypatches import do_monkeypatches
+from pageobjects.sessionpool import SessionPool
+
+KEY = SessionPool.make_key("firefox")
+
+
+class SessionPoolTest(unittest.TestCase):
+    def setUp(self):
+        do_monkeypatches()
+        self.pool = SessionPool()
+        self.pool.configure(max_age=1800, max_uses=50, max_idle=4)
+        self.cache = BrowserCache()
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def _open(self):
+        browser = self.pool.acquire(KEY, support.make_driver)
+        self.cache.register(browser)
+        return browser
+
+    def test_reused_session_is_a_new_open_browser(self):
+        browser = self._open()
+        self.cache.close()
+        reused = self._open()
+        self.assertIsNot(reused, browser)
+        self.assertIs(reused.command_executor, browser.command_executor)
+        self.assertEqual(self.cache.get_open_browsers(), [reused])
+        # Close All Browsers releases the reused session again instead of leaking it ##
+        self.cache.close_all()
+        self.assertEqual(self.pool.get_stats(), {"idle": 1, "total": 1})
+        self.assertEqual(browser.command_executor.quit, 0)
+
+    def test_browser_handed_out_before_can_not_quit_the_reused_session(self):
+        browser = self._open()
+        self.cache.close()
+        self._open()
+        browser.quit()
+        self.assertEqual(browser.command_executor.quit, 0)
+        self.assertEqual(self.pool.get_stats(), {"idle": 0, "total": 1})
+
+    def test_session_that_visited_one_origin_is_reset(self):
+        browser = self._open()
+        browser.get("http://localhost/login")
+        browser.get("http://localhost/home")
+        self.cache.close()
+        self.assertEqual(self.pool.get_stats(), {"idle": 1, "total": 1})
+        self.assertEqual(browser.command_executor.count("deleteAllCookies"), 1)
+
+    def test_session_that_visited_several_origins_is_quit(self):
+        browser = self._open()
+        browser.get("http://localhost/login")
+        browser.get("https://accounts.example.com/sso")
+        self.cache.close()
+        self.assertEqual(self.pool.get_stats(), {"idle": 0, "total": 0})
+        self.assertEqual(browser.command_executor.quit, 1)
+
+    def test_shutdown_quits_sessions_in_use(self):
+        self._open()
+        self.cache.close()
+        in_use = self._open()
+        other = self._open()
+        self.pool.shutdown()
+        self.assertEqual(self.pool.get_stats(), {"idle": 0, "total": 0})
+        self.assertEqual(in_use.command_executor.quit, 1)
+        self.assertEqual(other.command_executor.quit, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
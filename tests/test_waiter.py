@@ -0,0 +1,33 @@
+import unittest
+
+import support
+from pageobjects.exceptions import WaitTimeoutError
+from pageobjects.waiter import Waiter, _without_backward_steps
+
+
+class WithoutBackwardStepsTest(unittest.TestCase):
+    def test_step_back_counts_as_no_time_passing(self):
+        times = iter([100.0, 101.0, 50.0, 52.0])
+        now = _without_backward_steps(lambda: next(times))
+        self.assertEqual([now(), now(), now()], [101.0, 101.0, 103.0])
+
+
+class WaiterTest(unittest.TestCase):
+    def test_returns_the_value_of_the_condition_and_records_the_polls(self):
+        results = iter([None, False, "ready"])
+        self.assertEqual(Waiter().wait_until(lambda: next(results), 5, "waiter test", initial_delay=0.001), "ready")
+        record = Waiter().get_last_record()
+        self.assertEqual((record.description, record.polls, record.success), ("waiter test", 3, True))
+        self.assertGreaterEqual(record.elapsed, 0)
+
+    def test_timeout_reports_the_last_error(self):
+        def condition():
+            raise ValueError("not yet")
+        with self.assertRaises(WaitTimeoutError) as raised:
+            Waiter().wait_until(condition, 0.05, "failing test", initial_delay=0.01)
+        self.assertIn("last error: not yet", str(raised.exception))
+        self.assertFalse(Waiter().get_last_record().success)
+
+
+if __name__ == "__main__":
+    unittest.main()
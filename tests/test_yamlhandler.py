@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+import support
+import yaml
+from pageobjects import Page
+from pageobjects.yamlhandler import YAMLHandler
+
+
+class YAMLCacheTestPage(Page):
+    uri = "/yaml-cache"
+
+
+class YAMLCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.handler = YAMLHandler(YAMLCacheTestPage())
+        self.yaml_dir = tempfile.mkdtemp(dir=support.WORK_DIR)
+        self.cache_dir = os.path.join(self.yaml_dir, "cache")
+        self.yaml_path = os.path.join(self.yaml_dir, "page.yaml")
+        self._write("login: id=login\n")
+        os.environ["PO_YAML_CACHE_DIR"] = self.cache_dir
+
+    def tearDown(self):
+        for name in ("PO_YAML_CACHE_DIR", "PO_YAML_CACHE"):
+            os.environ.pop(name, None)
+
+    def _write(self, content):
+        with open(self.yaml_path, "w") as f:
+            f.write(content)
+
+    def _load(self):
+        before = YAMLHandler.get_cache_stats()
+        values = self.handler._load_yaml(self.yaml_path)
+        after = YAMLHandler.get_cache_stats()
+        return values, after["hits"] - before["hits"], after["misses"] - before["misses"]
+
+    def test_unchanged_file_is_loaded_from_the_cache(self):
+        self.assertEqual(self._load(), ({"login": "id=login"}, 0, 1))
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        self.assertEqual(self._load(), ({"login": "id=login"}, 1, 0))
+
+    def test_changed_file_is_parsed_again(self):
+        self._load()
+        self._write("login: css=#login\n")
+        self.assertEqual(self._load(), ({"login": "css=#login"}, 0, 1))
+
+    def test_broken_cache_file_is_parsed_again(self):
+        self._load()
+        for name in os.listdir(self.cache_dir):
+            with open(os.path.join(self.cache_dir, name), "wb") as f:
+                f.write("broken")
+        self.assertEqual(self._load(), ({"login": "id=login"}, 0, 1))
+
+    def test_unwritable_cache_dir_is_skipped(self):
+        with open(self.cache_dir, "w"):
+            pass
+        self.assertEqual(self._load(), ({"login": "id=login"}, 0, 1))
+        self.assertEqual(self._load(), ({"login": "id=login"}, 0, 1))
+
+    def test_cache_can_be_turned_off(self):
+        os.environ["PO_YAML_CACHE"] = "False"
+        self._load()
+        self.assertEqual(self._load(), ({"login": "id=login"}, 0, 1))
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_python_objects_are_not_constructed(self):
+        self._write("login: !!python/object/apply:os.getcwd []\n")
+        with self.assertRaises(yaml.YAMLError):
+            self._load()
+
+
+if __name__ == "__main__":
+    unittest.main()